@@ -11,6 +11,10 @@ from airport_app.models import (
     Ticket,
     Crew,
     AirplaneType,
+    SeatHold,
+    SearchEntry,
+    RouteDailyStats,
+    Task,
 )
 
 admin.site.register(Country)
@@ -23,3 +27,7 @@ admin.site.register(Order)
 admin.site.register(Ticket)
 admin.site.register(Crew)
 admin.site.register(AirplaneType)
+admin.site.register(SeatHold)
+admin.site.register(SearchEntry)
+admin.site.register(RouteDailyStats)
+admin.site.register(Task)
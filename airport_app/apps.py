@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AirportAppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "airport_app"
+
+    def ready(self):
+        from airport_app import signals, tasks  # noqa: F401
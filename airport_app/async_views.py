@@ -0,0 +1,189 @@
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseNotAllowed
+from rest_framework import status
+from rest_framework.exceptions import (
+    APIException,
+    NotAuthenticated,
+    NotFound,
+    Throttled,
+)
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from airport_app.db_router import ais_pinned_to_primary, replica_reads
+from airport_app.models import Flight
+from airport_app.pagination import FlightPagination
+from airport_app.serializers import FlightListCrewNamesSerializer
+from airport_app.views import FlightViewSet
+from user.authentication import CachedJWTAuthentication
+
+
+def _json_response(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(
+        JSONRenderer().render(data),
+        content_type="application/json",
+        status=status_code,
+    )
+
+
+def _exception_response(exc):
+    if isinstance(exc.detail, (list, dict)):
+        response = _json_response(exc.detail, exc.status_code)
+    else:
+        response = _json_response({"detail": exc.detail}, exc.status_code)
+    # Like APIView.handle_exception
+    if getattr(exc, "wait", None):
+        response["Retry-After"] = "%d" % exc.wait
+    return response
+
+
+async def _authenticate(request):
+    """Async CachedJWTAuthentication: the token is checked in-process and
+    the user principal read with the async cache and ORM, so no thread is
+    needed"""
+    authenticator = CachedJWTAuthentication()
+    header = authenticator.get_header(request)
+    raw_token = header and authenticator.get_raw_token(header)
+    if raw_token is None:
+        raise NotAuthenticated()
+
+    return await authenticator.aget_user(
+        authenticator.get_validated_token(raw_token)
+    )
+
+
+def _check_throttles(request):
+    """Run the throttles of the FlightViewSet list, so the async list
+    shares its limits and its `flight_list` scope"""
+    view = SimpleNamespace(action="list", throttle_scopes=FlightViewSet.throttle_scopes)
+    waits = [
+        throttle.wait()
+        for throttle in (
+            throttle_class() for throttle_class in FlightViewSet.throttle_classes
+        )
+        if not throttle.allow_request(request, view)
+    ]
+    if waits:
+        raise Throttled(max((wait for wait in waits if wait is not None), default=None))
+
+
+async def _crew_names(flight_ids) -> dict:
+    """{flight id: crew names}, aiterator() can not prefetch_related()"""
+    crew_names = {}
+    # values(), as values_list().aiterator() runs its query synchronously
+    # on Django 4.2
+    async for crew in (
+        Flight.crew.through.objects.filter(flight_id__in=flight_ids)
+        .order_by("crew_id")
+        .values("flight_id", "crew__first_name", "crew__last_name")
+        .aiterator()
+    ):
+        crew_names.setdefault(crew["flight_id"], []).append(
+            f"{crew['crew__first_name']} {crew['crew__last_name']}"
+        )
+    return crew_names
+
+
+async def _page(request, queryset):
+    """Page of `queryset` and its links, like FlightPagination does"""
+    pagination = FlightPagination()
+    queryset = queryset.order_by(*pagination.ordering)
+    url = request.build_absolute_uri()
+
+    if pagination.cursor_query_param in request.GET:
+        cursor = request.GET[pagination.cursor_query_param]
+        if cursor:
+            queryset = queryset.filter(
+                pagination._after(pagination.decode_cursor(cursor, Flight))
+            )
+        flights = [
+            flight
+            async for flight in queryset[: pagination.page_size + 1].aiterator()
+        ]
+        page = flights[: pagination.page_size]
+        links = {
+            "next": replace_query_param(
+                url, pagination.cursor_query_param, pagination.encode_cursor(page[-1])
+            )
+            if len(flights) > pagination.page_size
+            else None
+        }
+        return page, links
+
+    try:
+        number = int(request.GET.get(pagination.page_query_param, 1))
+        if number < 1:
+            raise ValueError
+    except ValueError:
+        raise NotFound("Invalid page.")
+
+    count = await queryset.acount()
+    offset = (number - 1) * pagination.page_size
+    if offset and offset >= count:
+        raise NotFound("Invalid page.")
+
+    flights = queryset[offset : offset + pagination.page_size]
+    page = [flight async for flight in flights.aiterator()]
+    previous_link = None
+    if number == 2:
+        previous_link = remove_query_param(url, pagination.page_query_param)
+    elif number > 2:
+        previous_link = replace_query_param(
+            url, pagination.page_query_param, number - 1
+        )
+    links = {
+        "count": count,
+        "next": replace_query_param(url, pagination.page_query_param, number + 1)
+        if offset + pagination.page_size < count
+        else None,
+        "previous": previous_link,
+    }
+    return page, links
+
+
+async def flight_list(request):
+    """Async variant of GET /flights/ for slow, I/O-bound searches
+
+    It takes the same filters and pagination parameters and returns the
+    same body as the FlightViewSet list, but the queries run through the
+    async ORM, so an ASGI worker serves concurrent searches in one event
+    loop instead of one thread each.
+    """
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    try:
+        request.user = await _authenticate(request)
+        # The throttles use the sync cache API
+        await sync_to_async(_check_throttles)(request)
+    except APIException as exc:
+        return _exception_response(exc)
+
+    # Like the ReplicaReadMixin of the viewsets
+    with replica_reads(not await ais_pinned_to_primary(request.user)):
+        try:
+            queryset = FlightViewSet.filter_by_params(
+                FlightViewSet.queryset, request.GET
+            ).annotate(
+                airplane_capacity=F("airplane__rows") * F("airplane__seats_in_row")
+            )
+            page, links = await _page(request, queryset)
+        except APIException as exc:
+            return _exception_response(exc)
+        except ValueError:
+            return _json_response(
+                {"detail": "Ids must be comma separated integers."},
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        crew_names = await _crew_names([flight.id for flight in page])
+
+    serializer = FlightListCrewNamesSerializer(
+        page,
+        many=True,
+        context={"request": request, "crew_names": crew_names},
+    )
+    return _json_response({**links, "results": serializer.data})
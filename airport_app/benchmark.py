@@ -0,0 +1,295 @@
+import random
+import time
+from datetime import datetime, timezone
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from airport_app.models import (
+    Country,
+    City,
+    Airport,
+    Route,
+    AirplaneType,
+    Airplane,
+    Crew,
+    Flight,
+    Order,
+    Ticket,
+)
+from airport_app.reporting import rebuild_route_daily_stats
+from airport_app.search import rebuild_index
+from airport_app.urls import router
+
+BENCHMARK_USER_EMAIL = "benchmark@airport.local"
+AIRPLANE_ROWS = 30
+AIRPLANE_SEATS_IN_ROW = 6
+TICKETS_PER_ORDER = 4
+
+
+def _bulk_create(model, objs, batch_size) -> list:
+    """bulk_create an iterable in batches without materializing all of it,
+    only the primary keys of the created rows are kept"""
+    pks = []
+    objs = iter(objs)
+    while batch := list(islice(objs, batch_size)):
+        pks.extend(
+            obj.pk for obj in model.objects.bulk_create(batch, batch_size=batch_size)
+        )
+    return pks
+
+
+@transaction.atomic
+def seed_dataset(
+    airports=500,
+    routes=20000,
+    flights=10000,
+    tickets=1000000,
+    airplanes=50,
+    crew=200,
+    batch_size=5000,
+    seed=19,
+):
+    """Insert a synthetic dataset of the given size using bulk inserts"""
+    capacity = AIRPLANE_ROWS * AIRPLANE_SEATS_IN_ROW
+    if airports < 2:
+        raise ValueError("At least two airports are needed to build routes.")
+    if airplanes < 1:
+        raise ValueError("At least one airplane is needed to build flights.")
+    if tickets > flights * capacity:
+        raise ValueError(
+            f"{tickets} tickets do not fit into {flights} flights "
+            f"of {capacity} seats."
+        )
+
+    rand = random.Random(seed)
+    prefix = f"bench-{seed}-{int(time.time())}"
+
+    country_ids = _bulk_create(
+        Country,
+        (
+            Country(name=f"{prefix} country {index}")
+            for index in range(max(airports // 10, 1))
+        ),
+        batch_size,
+    )
+    city_ids = _bulk_create(
+        City,
+        (
+            City(
+                name=f"{prefix} city {index}",
+                country_id=country_ids[index % len(country_ids)],
+            )
+            for index in range(airports)
+        ),
+        batch_size,
+    )
+    airport_ids = _bulk_create(
+        Airport,
+        (
+            Airport(
+                name=f"{prefix} airport {index}",
+                city_id=city_id,
+                country_id=country_ids[index % len(country_ids)],
+            )
+            for index, city_id in enumerate(city_ids)
+        ),
+        batch_size,
+    )
+
+    def random_route():
+        source_id, destination_id = rand.sample(airport_ids, 2)
+        return Route(
+            source_id=source_id,
+            destination_id=destination_id,
+            distance=rand.randint(200, 12000),
+        )
+
+    route_ids = _bulk_create(
+        Route, (random_route() for _ in range(routes)), batch_size
+    )
+
+    airplane_type = AirplaneType.objects.create(name=f"{prefix} type")
+    airplane_ids = _bulk_create(
+        Airplane,
+        (
+            Airplane(
+                name=f"{prefix} airplane {index}",
+                airplane_type=airplane_type,
+                rows=AIRPLANE_ROWS,
+                seats_in_row=AIRPLANE_SEATS_IN_ROW,
+            )
+            for index in range(airplanes)
+        ),
+        batch_size,
+    )
+    crew_ids = _bulk_create(
+        Crew,
+        (
+            Crew(first_name=f"{prefix} crew", last_name=str(index))
+            for index in range(crew)
+        ),
+        batch_size,
+    )
+
+    # Tickets fill the flights seat by seat, so the sold counters are known
+    tickets_left = tickets
+
+    def next_flight(index):
+        nonlocal tickets_left
+        departure = 1735689600 + index * 3600
+        sold = min(capacity, tickets_left)
+        tickets_left -= sold
+        return Flight(
+            route_id=rand.choice(route_ids),
+            airplane_id=rand.choice(airplane_ids),
+            departure_time=datetime_from_timestamp(departure),
+            arrival_time=datetime_from_timestamp(
+                departure + rand.randint(1, 12) * 3600
+            ),
+            tickets_sold=sold,
+        )
+
+    flight_ids = _bulk_create(
+        Flight, (next_flight(index) for index in range(flights)), batch_size
+    )
+    _bulk_create(
+        Flight.crew.through,
+        (
+            Flight.crew.through(flight_id=flight_id, crew_id=crew_id)
+            for flight_id in flight_ids
+            for crew_id in rand.sample(crew_ids, min(2, len(crew_ids)))
+        ),
+        batch_size,
+    )
+
+    user = get_benchmark_user()
+    order_ids = _bulk_create(
+        Order,
+        (
+            Order(user=user)
+            for _ in range((tickets + TICKETS_PER_ORDER - 1) // TICKETS_PER_ORDER)
+        ),
+        batch_size,
+    )
+
+    def ticket_objs():
+        for index in range(tickets):
+            flight_index, seat_index = divmod(index, capacity)
+            row, seat = divmod(seat_index, AIRPLANE_SEATS_IN_ROW)
+            yield Ticket(
+                flight_id=flight_ids[flight_index],
+                order_id=order_ids[index // TICKETS_PER_ORDER],
+                row=row + 1,
+                seat=seat + 1,
+            )
+
+    _bulk_create(Ticket, ticket_objs(), batch_size)
+
+    # bulk_create() skips the signals filling the search index and stats
+    rebuild_index()
+    rebuild_route_daily_stats()
+
+    return {
+        "airports": len(airport_ids),
+        "routes": len(route_ids),
+        "airplanes": len(airplane_ids),
+        "crew": len(crew_ids),
+        "flights": len(flight_ids),
+        "orders": len(order_ids),
+        "tickets": tickets,
+    }
+
+
+def datetime_from_timestamp(timestamp):
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def get_benchmark_user():
+    user, _ = get_user_model().objects.get_or_create(email=BENCHMARK_USER_EMAIL)
+    return user
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+def _endpoints():
+    """Yield (name, viewset, actions, is_detail) for every GET action"""
+    for _, viewset, basename in router.registry:
+        yield f"{basename}-list", viewset, {"get": "list"}, False
+        yield f"{basename}-detail", viewset, {"get": "retrieve"}, True
+        for extra_action in viewset.get_extra_actions():
+            if "get" in extra_action.mapping:
+                yield (
+                    f"{basename}-{extra_action.url_name}",
+                    viewset,
+                    {"get": extra_action.__name__},
+                    extra_action.detail,
+                )
+
+
+def _benchmark_host():
+    """A host name accepted by ALLOWED_HOSTS for absolute pagination links"""
+    for host in settings.ALLOWED_HOSTS:
+        if host != "*" and not host.startswith("."):
+            return host
+    return "localhost"
+
+
+def _measure(view, request_factory, user, url_kwargs):
+    request = request_factory.get("/", HTTP_HOST=_benchmark_host())
+    force_authenticate(request, user=user)
+    response = view(request, **url_kwargs)
+    response.render()
+    return response
+
+
+def run_benchmark(repeat=20, user=None):
+    """Measure latency, query count and response size of every GET action"""
+    user = user or get_benchmark_user()
+    request_factory = APIRequestFactory()
+    results = {}
+
+    for name, viewset, actions, is_detail in _endpoints():
+        # Throttling would cut the benchmark short and skew the timings
+        view = viewset.as_view(actions, throttle_classes=())
+        url_kwargs = {}
+        if is_detail:
+            model = viewset.queryset.model
+            instances = model.objects.order_by("id")
+            if any(field.name == "user" for field in model._meta.fields):
+                instances = instances.filter(user=user)
+            instance = instances.first()
+            if instance is None:
+                results[name] = {"error": "no rows to retrieve"}
+                continue
+            url_kwargs["pk"] = instance.pk
+
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                response = _measure(view, request_factory, user, url_kwargs)
+
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                _measure(view, request_factory, user, url_kwargs)
+                timings.append((time.perf_counter() - started) * 1000)
+        except Exception as exc:
+            results[name] = {"error": repr(exc)}
+            continue
+
+        results[name] = {
+            "status": response.status_code,
+            "queries": len(queries),
+            "bytes": len(response.content),
+            "p50_ms": round(_percentile(timings, 0.5), 3),
+            "p95_ms": round(_percentile(timings, 0.95), 3),
+        }
+
+    return results
@@ -0,0 +1,86 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+MODEL_VERSION_CACHE_KEY = "airport_app:version:{label}"
+RESPONSE_CACHE_KEY = "airport_app:response:{etag}"
+
+
+def _version_key(model):
+    return MODEL_VERSION_CACHE_KEY.format(label=model._meta.label_lower)
+
+
+def get_model_versions(models) -> list:
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            # A time based start keeps versions unique if the key was evicted
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(model) -> None:
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+class CachedResponseMixin:
+    """Caches list/retrieve response data under a versioned ETag
+
+    The ETag combines the request URL with the versions of `cache_models`,
+    which are bumped on every save/delete of those models, so a changed
+    row never serves stale data and unchanged data is answered with
+    304 Not Modified without touching the database.
+    """
+
+    cache_models = ()
+
+    def get_response_etag(self, request):
+        versions = get_model_versions(self.cache_models)
+        digest = hashlib.sha1(
+            f"{request.build_absolute_uri()}|{versions}".encode()
+        ).hexdigest()
+        return f'W/"{digest}"'
+
+    @staticmethod
+    def _etag_matches(request, etag):
+        if_none_match = request.headers.get("If-None-Match", "")
+        return any(tag.strip() in (etag, "*") for tag in if_none_match.split(","))
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        etag = self.get_response_etag(request)
+
+        if self._etag_matches(request, etag):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+
+        key = RESPONSE_CACHE_KEY.format(etag=etag)
+        data = cache.get(key)
+        if data is not None:
+            response = Response(data)
+        else:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+
+        response["ETag"] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
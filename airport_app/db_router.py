@@ -0,0 +1,97 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+PRIMARY_DATABASE = "default"
+PINNED_USER_CACHE_KEY = "airport_app:db_pinned:{user_id}"
+
+# Whether the reads of the current request may go to a replica
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Route the reads inside the block to the read replicas"""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def pin_to_primary(user) -> None:
+    """Read everything of `user` from the primary for a while, so replicas
+    lagging behind do not hide the user's own writes"""
+    cache.set(
+        PINNED_USER_CACHE_KEY.format(user_id=user.id),
+        True,
+        settings.REPLICA_PIN_SECONDS,
+    )
+
+
+def is_pinned_to_primary(user) -> bool:
+    if not user.is_authenticated:
+        return False
+    return cache.get(PINNED_USER_CACHE_KEY.format(user_id=user.id), False)
+
+
+async def ais_pinned_to_primary(user) -> bool:
+    if not user.is_authenticated:
+        return False
+    return await cache.aget(PINNED_USER_CACHE_KEY.format(user_id=user.id), False)
+
+
+class ReplicaRouter:
+    """Send reads to a random replica of READ_REPLICAS inside
+    `replica_reads()`, everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        if settings.READ_REPLICAS and _replica_reads.get():
+            return random.choice(settings.READ_REPLICAS)
+        return PRIMARY_DATABASE
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_DATABASE
+
+
+class ReplicaReadMixin:
+    """Read from the replicas in safe-method requests of the view
+
+    Authentication and permission checks still read from the primary.
+    Unsafe requests, and for REPLICA_PIN_SECONDS every request of a user
+    after a successful write of theirs, stay on the primary. Views that
+    answer from version keyed caches do not use it, the first read after
+    an invalidation would cache what a lagging replica returns.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        # Reset here, finalize_response() is skipped when the handler raises
+        with replica_reads(False):
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        if request.method in SAFE_METHODS and not is_pinned_to_primary(request.user):
+            _replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            pin_to_primary(request.user)
+
+        return super().finalize_response(request, response, *args, **kwargs)
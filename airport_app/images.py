@@ -0,0 +1,121 @@
+import hashlib
+import io
+import os
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from airport_app.task_queue import enqueue
+
+IMAGE_VARIANTS_DIR = "variants"
+# {variant: bounding box}, images are scaled down to fit, never up
+IMAGE_VARIANT_SIZES = {
+    "thumbnail": (320, 320),
+    "medium": (1024, 1024),
+}
+# {format: (extension, save options)}
+IMAGE_FORMATS = {
+    "webp": ("webp", {"format": "WEBP", "quality": 80, "method": 4}),
+    "jpeg": (
+        "jpg",
+        {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+    ),
+}
+
+
+def _save_variant(image, base_name, variant, image_format) -> str:
+    """Store an encoded variant under a name holding its content hash
+
+    Equal content gets equal names, so a stored file never changes and can
+    be cached by clients forever.
+    """
+    extension, options = IMAGE_FORMATS[image_format]
+    buffer = io.BytesIO()
+    image.save(buffer, **options)
+    content = buffer.getvalue()
+
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    name = f"{IMAGE_VARIANTS_DIR}/{base_name}-{variant}.{digest}.{extension}"
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(content))
+    return name
+
+
+def build_image_variants(name) -> dict:
+    """Resize the stored image `name` into every variant and format
+
+    Returns {variant: {"width", "height", format: file name}}.
+    """
+    base_name = os.path.splitext(os.path.basename(name))[0]
+    with default_storage.open(name) as file, Image.open(file) as original:
+        image = ImageOps.exif_transpose(original).convert("RGB")
+
+    variants = {}
+    for variant, size in IMAGE_VARIANT_SIZES.items():
+        resized = image.copy()
+        resized.thumbnail(size, Image.Resampling.LANCZOS)
+        variants[variant] = {
+            "width": resized.width,
+            "height": resized.height,
+            **{
+                image_format: _save_variant(resized, base_name, variant, image_format)
+                for image_format in IMAGE_FORMATS
+            },
+        }
+    return variants
+
+
+def process_image_field(model_label, pk, field_name, name) -> None:
+    """Store the variants of the `field_name` image of an object
+
+    They are written to the `<field_name>_variants` field only if the
+    image is still `name`, a newer upload has its own processing.
+    """
+    model = apps.get_model(model_label)
+    variants = build_image_variants(name)
+    model.objects.filter(pk=pk, **{field_name: name}).update(
+        **{f"{field_name}_variants": variants}
+    )
+
+
+def schedule_image_processing(instance, field_name) -> None:
+    """Queue building the variants of a saved image
+
+    The original is served until they are stored.
+    """
+    name = getattr(instance, field_name).name
+    if not name:
+        return
+
+    enqueue(
+        "process_image",
+        {
+            "model_label": instance._meta.label,
+            "pk": instance.pk,
+            "field_name": field_name,
+            "name": name,
+        },
+        key=f"process_image:{name}",
+    )
+
+
+def image_variant_urls(variants, request=None) -> dict:
+    """{variant: {"width", "height", format: URL}} of stored variants"""
+
+    def url(name):
+        url = default_storage.url(name)
+        return request.build_absolute_uri(url) if request else url
+
+    return {
+        variant: {
+            "width": files["width"],
+            "height": files["height"],
+            **{
+                image_format: url(files[image_format])
+                for image_format in IMAGE_FORMATS
+            },
+        }
+        for variant, files in variants.items()
+    }
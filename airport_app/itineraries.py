@@ -0,0 +1,188 @@
+import bisect
+import heapq
+import itertools
+from collections import defaultdict, deque
+
+from django.db.models import F
+
+from airport_app.cache import get_model_versions
+from airport_app.db_router import PRIMARY_DATABASE
+from airport_app.models import Airport, Flight, Route
+
+# Per-process route graph, rebuilt when the shared Route version changes.
+# A rebuilt graph replaces the dict as a whole, so concurrent readers never
+# see the version of one graph with the routes of another.
+_route_graph = {"version": None, "adjacency": {}, "reverse": {}, "routes": {}}
+
+
+def get_route_graph() -> dict:
+    """Return the {source: [(destination, route_id)]} adjacency of routes"""
+    global _route_graph
+
+    version = get_model_versions([Route])[0]
+    graph = _route_graph
+
+    if graph["version"] != version:
+        adjacency = defaultdict(list)
+        reverse = defaultdict(list)
+        routes = {}
+        # From the primary, a lagging replica would be cached as the version
+        route_rows = Route.objects.using(PRIMARY_DATABASE).values_list(
+            "id", "source_id", "destination_id", "distance"
+        )
+        for route_id, source_id, destination_id, distance in route_rows:
+            adjacency[source_id].append((destination_id, route_id))
+            reverse[destination_id].append((source_id, route_id))
+            routes[route_id] = (source_id, destination_id, distance or 0)
+
+        graph = {
+            "version": version,
+            "adjacency": dict(adjacency),
+            "reverse": dict(reverse),
+            "routes": routes,
+        }
+        _route_graph = graph
+
+    return graph
+
+
+def _hops(edges, start, max_legs) -> dict:
+    """Breadth-first number of legs from `start` to every airport"""
+    hops = {start: 0}
+    queue = deque([start])
+    while queue:
+        airport = queue.popleft()
+        if hops[airport] == max_legs:
+            continue
+        for next_airport, _ in edges.get(airport, ()):
+            if next_airport not in hops:
+                hops[next_airport] = hops[airport] + 1
+                queue.append(next_airport)
+    return hops
+
+
+def candidate_routes(graph, source, destination, max_legs) -> list:
+    """Routes lying on some path of at most `max_legs` legs"""
+    from_source = _hops(graph["adjacency"], source, max_legs)
+    to_destination = _hops(graph["reverse"], destination, max_legs)
+
+    return [
+        route_id
+        for route_id, (route_source, route_destination, _) in graph["routes"].items()
+        if route_source in from_source
+        and route_destination in to_destination
+        and from_source[route_source] + 1 + to_destination[route_destination]
+        <= max_legs
+    ]
+
+
+def find_itineraries(
+    source,
+    destination,
+    departure_from,
+    departure_until,
+    arrival_until,
+    max_legs,
+    min_connection,
+    limit,
+) -> list:
+    """Earliest-arrival itineraries from `source` to `destination`
+
+    The first leg departs in [departure_from, departure_until), every next
+    leg at least `min_connection` after the previous arrival, and the last
+    one arrives before `arrival_until`. Each airport is expanded at most
+    `limit` times, which is enough to produce the `limit` best itineraries.
+    """
+    graph = get_route_graph()
+    routes = candidate_routes(graph, source, destination, max_legs)
+    if not routes:
+        return []
+
+    departures = defaultdict(list)
+    for flight in (
+        Flight.objects.filter(
+            route_id__in=routes,
+            departure_time__gte=departure_from,
+            arrival_time__lt=arrival_until,
+            tickets_sold__lt=F("airplane__rows") * F("airplane__seats_in_row"),
+        )
+        .order_by("departure_time")
+        .values_list("departure_time", "arrival_time", "id", "route_id")
+    ):
+        departures[graph["routes"][flight[3]][0]].append(flight)
+    departure_times = {
+        airport: [flight[0] for flight in flights]
+        for airport, flights in departures.items()
+    }
+
+    counter = itertools.count()
+    heap = []
+    for flight in departures.get(source, ()):
+        if flight[0] < departure_until:
+            heapq.heappush(heap, (flight[1], next(counter), (flight,)))
+
+    found = []
+    expanded = defaultdict(int)
+    while heap and len(found) < limit:
+        arrival, _, path = heapq.heappop(heap)
+        airport = graph["routes"][path[-1][3]][1]
+
+        if airport == destination:
+            found.append(path)
+            continue
+
+        expanded[airport] += 1
+        if expanded[airport] > limit or len(path) == max_legs:
+            continue
+
+        visited = {source} | {graph["routes"][leg[3]][1] for leg in path}
+        flights = departures.get(airport, [])
+        first = bisect.bisect_left(
+            departure_times.get(airport, []), arrival + min_connection
+        )
+        for flight in flights[first:]:
+            if graph["routes"][flight[3]][1] not in visited:
+                heapq.heappush(heap, (flight[1], next(counter), path + (flight,)))
+
+    return _describe(found, graph["routes"])
+
+
+def _describe(paths, routes) -> list:
+    airport_ids = {
+        airport_id
+        for path in paths
+        for leg in path
+        for airport_id in routes[leg[3]][:2]
+    }
+    airport_names = dict(
+        Airport.objects.filter(id__in=airport_ids).values_list("id", "name")
+    )
+
+    itineraries = []
+    for path in paths:
+        legs = []
+        for departure_time, arrival_time, flight_id, route_id in path:
+            source_id, destination_id, _ = routes[route_id]
+            legs.append(
+                {
+                    "flight": flight_id,
+                    "route": route_id,
+                    "source": airport_names.get(source_id),
+                    "destination": airport_names.get(destination_id),
+                    "departure_time": departure_time,
+                    "arrival_time": arrival_time,
+                }
+            )
+        itineraries.append(
+            {
+                "departure_time": path[0][0],
+                "arrival_time": path[-1][1],
+                "duration_minutes": int(
+                    (path[-1][1] - path[0][0]).total_seconds() // 60
+                ),
+                "distance": sum(routes[leg[3]][2] for leg in path),
+                "legs": legs,
+            }
+        )
+
+    return itineraries
@@ -0,0 +1,68 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from airport_app.benchmark import run_benchmark, seed_dataset
+
+
+class Command(BaseCommand):
+    """Command to benchmark every airport_app GET endpoint"""
+
+    help = (
+        "Optionally seed a synthetic dataset, then measure p50/p95 latency, "
+        "query count and response size of every airport_app GET action"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            action="store_true",
+            help="Insert a synthetic dataset before measuring",
+        )
+        parser.add_argument("--airports", type=int, default=500)
+        parser.add_argument("--routes", type=int, default=20000)
+        parser.add_argument("--flights", type=int, default=10000)
+        parser.add_argument("--tickets", type=int, default=1000000)
+        parser.add_argument("--airplanes", type=int, default=50)
+        parser.add_argument("--crew", type=int, default=200)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Timed requests per endpoint",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the JSON report to this file instead of stdout",
+        )
+
+    def handle(self, *args, **options):
+        report = {"repeat": options["repeat"]}
+
+        if options["seed"]:
+            self.stderr.write("Seeding synthetic dataset...")
+            try:
+                report["dataset"] = seed_dataset(
+                    airports=options["airports"],
+                    routes=options["routes"],
+                    flights=options["flights"],
+                    tickets=options["tickets"],
+                    airplanes=options["airplanes"],
+                    crew=options["crew"],
+                    batch_size=options["batch_size"],
+                )
+            except ValueError as exc:
+                raise CommandError(exc)
+
+        report["endpoints"] = run_benchmark(repeat=options["repeat"])
+        output = json.dumps(report, indent=2, sort_keys=True)
+
+        if options["output"]:
+            with open(options["output"], "w") as report_file:
+                report_file.write(output + "\n")
+            self.stderr.write(
+                self.style.SUCCESS(f"Benchmark report written to {options['output']}")
+            )
+        else:
+            self.stdout.write(output)
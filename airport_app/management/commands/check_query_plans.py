@@ -0,0 +1,88 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from airport_app.models import Flight, Ticket
+from airport_app.views import FlightViewSet
+
+# Full table scans in PostgreSQL and SQLite plans
+SEQUENTIAL_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+    "sqlite": re.compile(r"\bSCAN (\w+)"),
+}
+
+
+class Command(BaseCommand):
+    """Command to EXPLAIN the hot flight queries and flag sequential scans"""
+
+    help = (
+        "EXPLAIN the flight filter and ticket lookup queries and flag "
+        "sequential scans. Run it against a realistically sized database, "
+        "planners prefer sequential scans on small tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fail",
+            action="store_true",
+            help="Exit with an error when a sequential scan is found",
+        )
+        parser.add_argument(
+            "--verbose-plans",
+            action="store_true",
+            help="Print the full plan of every query",
+        )
+
+    @staticmethod
+    def _flight_list_queryset(params):
+        view = FlightViewSet(action="list", format_kwarg=None)
+        view.request = Request(APIRequestFactory().get("/", params))
+        return view.get_queryset()
+
+    def _queries(self, flight):
+        date = flight.departure_time.date().isoformat()
+        return {
+            "flights by date": self._flight_list_queryset({"date": date}),
+            "flights by route and date": self._flight_list_queryset(
+                {"routes": str(flight.route_id), "date": date}
+            ),
+            "flights by airplane and date": self._flight_list_queryset(
+                {"airplanes": str(flight.airplane_id), "date": date}
+            ),
+            "flight seats": Ticket.objects.filter(flight_id=flight.id).values_list(
+                "row", "seat"
+            ),
+        }
+
+    def handle(self, *args, **options):
+        pattern = SEQUENTIAL_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f"Unsupported database vendor: {connection.vendor}")
+
+        flight = Flight.objects.order_by("id").first()
+        if flight is None:
+            raise CommandError("At least one flight is needed to build the queries.")
+
+        flagged = []
+        for name, queryset in self._queries(flight).items():
+            plan = queryset.explain()
+            scanned_tables = pattern.findall(plan)
+
+            if scanned_tables:
+                flagged.append(name)
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"{name}: sequential scan on {', '.join(scanned_tables)}"
+                    )
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{name}: OK"))
+
+            if options["verbose_plans"] or scanned_tables:
+                self.stdout.write(plan)
+
+        if flagged and options["fail"]:
+            raise CommandError(f"Sequential scans found in: {', '.join(flagged)}")
@@ -0,0 +1,80 @@
+import os
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from airport_app.schedule_import import IMPORT_FORMATS, ScheduleImporter, read_rows
+
+MAX_REPORTED_ERRORS = 20
+
+
+class Command(BaseCommand):
+    """Command to bulk import schedule data from CSV or NDJSON files"""
+
+    help = (
+        "Stream airports, routes, airplanes, crew or flights from a CSV or "
+        "NDJSON file into the database in batches. Columns: "
+        "airports: name, city, country; "
+        "routes: source, destination, distance; "
+        "airplanes: name, airplane_type, rows, seats_in_row; "
+        "crew: first_name, last_name; "
+        "flights: source, destination, airplane, departure_time, "
+        "arrival_time, crew (optional, 'First Last' names separated by ';')."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=ScheduleImporter.kinds)
+        parser.add_argument("file", help="Input file path, '-' for stdin")
+        parser.add_argument(
+            "--format",
+            dest="file_format",
+            choices=IMPORT_FORMATS,
+            help="Input format, guessed from the file extension by default",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--update",
+            action="store_true",
+            help="Update rows that already exist instead of skipping them",
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["file_format"]
+        if file_format is None:
+            file_format = os.path.splitext(options["file"])[1].lstrip(".").lower()
+            if file_format not in IMPORT_FORMATS:
+                raise CommandError("Can not guess the input format, pass --format.")
+
+        importer = ScheduleImporter(
+            batch_size=options["batch_size"], update=options["update"]
+        )
+        started = time.perf_counter()
+
+        if options["file"] == "-":
+            importer.run(options["kind"], read_rows(sys.stdin, file_format))
+        else:
+            try:
+                with open(options["file"], newline="", encoding="utf-8") as file:
+                    importer.run(options["kind"], read_rows(file, file_format))
+            except OSError as exc:
+                raise CommandError(exc)
+
+        elapsed = time.perf_counter() - started
+        for error in importer.errors[:MAX_REPORTED_ERRORS]:
+            self.stderr.write(self.style.WARNING(error))
+        if len(importer.errors) > MAX_REPORTED_ERRORS:
+            self.stderr.write(
+                self.style.WARNING(
+                    f"... and {len(importer.errors) - MAX_REPORTED_ERRORS} more errors"
+                )
+            )
+
+        total = importer.created + importer.updated + importer.skipped
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {options['kind']}: {importer.created} created, "
+                f"{importer.updated} updated, {importer.skipped} skipped "
+                f"in {elapsed:.2f}s ({total / max(elapsed, 1e-9):.0f} rows/s)"
+            )
+        )
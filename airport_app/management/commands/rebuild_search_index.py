@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from airport_app.search import rebuild_index
+
+
+class Command(BaseCommand):
+    """Command to recreate the type-ahead search entries of all objects"""
+
+    help = "Rebuild the type-ahead search index from the reference data"
+
+    def handle(self, *args, **options):
+        entries = rebuild_index()
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {entries} search entries"))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from airport_app.models import Flight, RouteStatsChange, Ticket
+
+
+class Command(BaseCommand):
+    """Command to recount the stored number of sold tickets of flights"""
+
+    help = "Recompute Flight.tickets_sold from the ticket table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--flights",
+            type=lambda value: [int(str_id) for str_id in value.split(",")],
+            help="Only reconcile these flight ids (ex. --flights=3,12)",
+        )
+
+    def handle(self, *args, **options):
+        actual_tickets_sold = Coalesce(
+            Subquery(
+                Ticket.objects.filter(flight=OuterRef("pk"))
+                .order_by()
+                .values("flight")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+
+        flights = Flight.objects.all()
+        if options["flights"]:
+            flights = flights.filter(id__in=options["flights"])
+
+        drifted_ids = list(
+            flights.alias(actual=actual_tickets_sold)
+            .exclude(tickets_sold=F("actual"))
+            .values_list("id", flat=True)
+        )
+        Flight.objects.filter(id__in=drifted_ids).update(
+            tickets_sold=actual_tickets_sold
+        )
+        RouteStatsChange.log_flights(Flight.objects.filter(id__in=drifted_ids))
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled tickets_sold of {len(drifted_ids)} flights")
+        )
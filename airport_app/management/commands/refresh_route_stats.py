@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from airport_app.reporting import (
+    rebuild_route_daily_stats,
+    refresh_route_daily_stats,
+)
+
+
+class Command(BaseCommand):
+    """Command to bring the route daily stats up to date"""
+
+    help = "Recompute the route daily stats changed since the last refresh"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute the stats of all routes and days",
+        )
+
+    def handle(self, *args, **options):
+        if options["full"]:
+            refreshed = rebuild_route_daily_stats()
+        else:
+            refreshed = refresh_route_daily_stats()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Refreshed the stats of {refreshed} route days")
+        )
@@ -0,0 +1,99 @@
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from airport_app.seat_holds import schedule_hold_sweep
+from airport_app.task_queue import purge_finished_tasks, run_pending, work
+
+# Seconds between deletions of old finished tasks
+PURGE_INTERVAL = 60 * 60
+
+
+def run_process(threads, poll_interval):
+    """Run `threads` worker threads until SIGTERM or SIGINT"""
+    stop_event = threading.Event()
+    for signal_number in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signal_number, lambda *args: stop_event.set())
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for _ in range(threads):
+            pool.submit(work, stop_event, poll_interval)
+
+        while not stop_event.wait(PURGE_INTERVAL):
+            purge_finished_tasks()
+            connections.close_all()
+
+
+class Command(BaseCommand):
+    """Command to run the queued background tasks"""
+
+    help = "Run queued tasks in a pool of worker processes and threads"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=settings.TASK_WORKER_PROCESSES,
+            help="Worker processes, for CPU bound tasks like image resizing",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=settings.TASK_WORKER_THREADS,
+            help="Worker threads per process, for I/O bound tasks",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds an idle worker waits before looking for tasks again",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the due tasks in this process and exit",
+        )
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            count = run_pending()
+            self.stdout.write(self.style.SUCCESS(f"Ran {count} tasks"))
+            return
+
+        # Every sweep queues the next one, this starts the series
+        schedule_hold_sweep()
+
+        self.stdout.write(
+            f"Running {options['processes']} processes of "
+            f"{options['threads']} worker threads"
+        )
+        if options["processes"] == 1:
+            run_process(options["threads"], options["poll_interval"])
+            return
+
+        # Forked children must not share the connections of the parent
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(
+                target=run_process,
+                args=(options["threads"], options["poll_interval"]),
+            )
+            for _ in range(options["processes"])
+        ]
+        for process in processes:
+            process.start()
+
+        def stop(*args):
+            for process in processes:
+                process.terminate()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        for process in processes:
+            process.join()
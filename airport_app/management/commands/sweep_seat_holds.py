@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from airport_app.seat_holds import sweep_expired_holds
+
+
+class Command(BaseCommand):
+    """Command to delete expired seat holds"""
+
+    help = "Delete expired seat holds, skipping rows locked by checkouts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        deleted = sweep_expired_holds(batch_size=options["batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired seat holds"))
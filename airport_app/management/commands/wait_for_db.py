@@ -1,5 +1,5 @@
 import time
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db import connections
 from django.db.utils import OperationalError
 
@@ -7,14 +7,30 @@ from django.db.utils import OperationalError
 class Command(BaseCommand):
     """Command to wait for database"""
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--timeout",
+            type=int,
+            default=60,
+            help="Seconds to wait before giving up, 0 waits forever",
+        )
+
     def handle(self, *args, **options):
         self.stdout.write("Waiting for database...")
-        db_conn = None
-        while not db_conn:
+        started = time.monotonic()
+        db_conn = connections["default"]
+        while True:
             try:
-                db_conn = connections["default"]
+                db_conn.ensure_connection()
+                break
             except OperationalError:
+                if (
+                    options["timeout"]
+                    and time.monotonic() - started >= options["timeout"]
+                ):
+                    raise CommandError("Database unavailable, giving up.")
                 self.stdout.write("Database unavailable, waiting 1 second...")
                 time.sleep(1)
+        db_conn.close()
 
         self.stdout.write(self.style.SUCCESS("Database available!"))
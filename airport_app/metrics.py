@@ -0,0 +1,196 @@
+import atexit
+import bisect
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+METRICS_CACHE_PREFIX = "airport_app:metrics"
+# Sums are stored as integer millionths, the cache increments integers only
+SUM_SCALE = 1_000_000
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format_labels(labels: dict) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _incr(key, delta) -> None:
+    if not cache.add(key, delta, None):
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            cache.set(key, delta, None)
+
+
+class Histogram:
+    """Prometheus histogram, one series per set of label values
+
+    Observations are buffered in the process and added to counters on the
+    shared cache by `flush()`, so the histogram rendered by any worker
+    process holds the observations of all of them.
+    """
+
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        # {label values: [count per bucket..., +Inf count, sum]}, not flushed
+        self.pending = {}
+        # Label values observed by this process, kept in the series index
+        self.known_series = set()
+        self.lock = threading.Lock()
+
+    @property
+    def index_key(self) -> str:
+        return f"{METRICS_CACHE_PREFIX}:{self.name}:series"
+
+    def series_key(self, label_values) -> str:
+        digest = hashlib.md5(repr(label_values).encode()).hexdigest()
+        return f"{METRICS_CACHE_PREFIX}:{self.name}:{digest}"
+
+    def observe(self, label_values: tuple, value) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.pending.setdefault(
+                label_values, [0] * (len(self.buckets) + 2)
+            )
+            series[index] += 1
+            series[-1] += value
+
+    def flush(self) -> None:
+        """Add the buffered observations to the shared counters"""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.known_series.update(pending)
+            known_series = set(self.known_series)
+
+        for label_values, values in pending.items():
+            key = self.series_key(label_values)
+            for index, count in enumerate(values[:-1]):
+                if count:
+                    _incr(f"{key}:{index}", count)
+            _incr(f"{key}:sum", round(values[-1] * SUM_SCALE))
+
+        # Processes adding series at the same time can overwrite each
+        # other's index, the lost ones are added back by their next flush
+        series_index = set(cache.get(self.index_key, ()))
+        if not known_series <= series_index:
+            cache.set(self.index_key, sorted(series_index | known_series), None)
+
+    def render(self) -> list:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        self.flush()
+        counters = len(self.buckets) + 1
+        series_keys = {
+            tuple(label_values): self.series_key(tuple(label_values))
+            for label_values in cache.get(self.index_key, ())
+        }
+        stored = cache.get_many(
+            [
+                f"{key}:{suffix}"
+                for key in series_keys.values()
+                for suffix in (*range(counters), "sum")
+            ]
+        )
+        series = {
+            label_values: [
+                *(stored.get(f"{key}:{index}", 0) for index in range(counters)),
+                stored.get(f"{key}:sum", 0) / SUM_SCALE,
+            ]
+            for label_values, key in series_keys.items()
+        }
+
+        for label_values, values in sorted(series.items()):
+            labels = dict(zip(self.label_names, label_values))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), values):
+                cumulative += count
+                bucket_labels = _format_labels({**labels, "le": bound})
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {cumulative}")
+            lines.append(f"{self.name}_sum{{{_format_labels(labels)}}} {values[-1]}")
+            lines.append(f"{self.name}_count{{{_format_labels(labels)}}} {cumulative}")
+        return lines
+
+
+LABEL_NAMES = ("viewset", "action")
+
+REQUEST_DURATION = Histogram(
+    "airport_request_duration_seconds",
+    "Wall time of requests.",
+    LABEL_NAMES,
+    DURATION_BUCKETS,
+)
+REQUEST_DB_DURATION = Histogram(
+    "airport_request_db_duration_seconds",
+    "Time of requests spent in SQL queries.",
+    LABEL_NAMES,
+    DURATION_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "airport_request_queries",
+    "Number of SQL queries per request.",
+    LABEL_NAMES,
+    QUERY_BUCKETS,
+)
+REQUEST_DUPLICATE_QUERIES = Histogram(
+    "airport_request_duplicate_queries",
+    "Repeated executions of the same SQL per request, a sign of N+1 queries.",
+    LABEL_NAMES,
+    QUERY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "airport_response_size_bytes",
+    "Size of non-streaming response bodies.",
+    LABEL_NAMES,
+    SIZE_BUCKETS,
+)
+
+REGISTRY = (
+    REQUEST_DURATION,
+    REQUEST_DB_DURATION,
+    REQUEST_QUERIES,
+    REQUEST_DUPLICATE_QUERIES,
+    RESPONSE_SIZE,
+)
+
+
+_last_flush = time.monotonic()
+_flush_lock = threading.Lock()
+
+
+def flush_metrics() -> None:
+    for metric in REGISTRY:
+        metric.flush()
+
+
+def flush_metrics_if_due() -> None:
+    """Flush the metrics at most every METRICS_FLUSH_INTERVAL seconds"""
+    global _last_flush
+
+    with _flush_lock:
+        if time.monotonic() - _last_flush < settings.METRICS_FLUSH_INTERVAL:
+            return
+        _last_flush = time.monotonic()
+    flush_metrics()
+
+
+# Recycled worker processes hand over what they buffered
+atexit.register(flush_metrics)
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
@@ -0,0 +1,153 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connections
+
+from airport_app import metrics
+
+
+class QueryCollector:
+    """Database execute wrapper timing the queries of a request
+
+    Queries are grouped by their SQL with placeholders, so the same
+    statement run again with other parameters, the N+1 pattern, counts as
+    a duplicate.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.signatures = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.signatures[sql] += 1
+
+    @property
+    def duplicates(self) -> int:
+        return sum(count - 1 for count in self.signatures.values())
+
+
+def view_labels(view_func, method) -> tuple:
+    """(viewset, action) of a resolved view, (function name, method) for
+    views outside viewsets"""
+    view_class = getattr(view_func, "cls", None)
+    if view_class is None:
+        return view_func.__name__, method.lower()
+
+    actions = getattr(view_func, "actions", None) or {}
+    return view_class.__name__, actions.get(method.lower(), method.lower())
+
+
+# Collector of the queries of the current request, context variables are
+# copied to the threads sync_to_async runs ORM calls of async views in
+_query_collector = ContextVar("query_collector", default=None)
+
+
+def dispatch_query(execute, sql, params, many, context):
+    """Execute wrapper left on the connections, passing the queries to the
+    collector of the current request"""
+    collector = _query_collector.get()
+    if collector is None:
+        return execute(sql, params, many, context)
+    return collector(execute, sql, params, many, context)
+
+
+def install_query_dispatch():
+    """Add dispatch_query to the connections of the calling thread
+
+    Connections belong to a thread, async views query on the connections
+    of their sync_to_async thread, not the ones of the event loop.
+    """
+    for connection in connections.all():
+        if dispatch_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(dispatch_query)
+
+
+@contextmanager
+def collect_queries(collector):
+    """Pass the queries run in the current context to `collector`"""
+    token = _query_collector.set(collector)
+    try:
+        yield
+    finally:
+        _query_collector.reset(token)
+
+
+class PerformanceMiddleware:
+    """Record wall time, DB time, query counts and response size per view
+
+    The numbers are added to the response as a `Server-Timing` header and
+    to the histograms served by /metrics, which are flushed to the shared
+    cache every METRICS_FLUSH_INTERVAL seconds. Requests that do not
+    resolve to a view are not recorded. Like Django's own middleware, it
+    runs sync or async, whichever the next handler is, so the async views
+    of ASGI requests are not adapted to run in a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        install_query_dispatch()
+        collector = QueryCollector()
+        started = time.perf_counter()
+        with collect_queries(collector):
+            response = self.get_response(request)
+        return self.record(request, response, collector, started)
+
+    async def __acall__(self, request):
+        # The thread sensitive thread of the request runs its ORM calls
+        await sync_to_async(install_query_dispatch, thread_sensitive=True)()
+        collector = QueryCollector()
+        started = time.perf_counter()
+        with collect_queries(collector):
+            response = await self.get_response(request)
+        return await sync_to_async(self.record, thread_sensitive=True)(
+            request, response, collector, started
+        )
+
+    def record(self, request, response, collector, started):
+        duration = time.perf_counter() - started
+        labels = getattr(request, "_performance_labels", None)
+        if labels is None:
+            return response
+
+        metrics.REQUEST_DURATION.observe(labels, duration)
+        metrics.REQUEST_DB_DURATION.observe(labels, collector.duration)
+        metrics.REQUEST_QUERIES.observe(labels, collector.count)
+        metrics.REQUEST_DUPLICATE_QUERIES.observe(labels, collector.duplicates)
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.observe(labels, len(response.content))
+        metrics.flush_metrics_if_due()
+
+        server_timing = [
+            f"total;dur={duration * 1000:.1f}",
+            f'db;dur={collector.duration * 1000:.1f};desc="{collector.count} queries"',
+        ]
+        if collector.duplicates:
+            server_timing.append(
+                f'dup;desc="{collector.duplicates} duplicate queries"'
+            )
+        response["Server-Timing"] = ", ".join(server_timing)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._performance_labels = view_labels(view_func, request.method)
+
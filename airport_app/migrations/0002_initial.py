@@ -0,0 +1,66 @@
+# Generated by Django 4.2.11 on 2026-10-17 02:23
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('airport_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='orders', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='flight',
+            name='airplane',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='airplane_flights', to='airport_app.airplane'),
+        ),
+        migrations.AddField(
+            model_name='flight',
+            name='crew',
+            field=models.ManyToManyField(related_name='flights', to='airport_app.crew'),
+        ),
+        migrations.AddField(
+            model_name='flight',
+            name='route',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='route_flights', to='airport_app.route'),
+        ),
+        migrations.AddField(
+            model_name='city',
+            name='country',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='city_country', to='airport_app.country'),
+        ),
+        migrations.AddField(
+            model_name='airport',
+            name='city',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='airport_city', to='airport_app.city'),
+        ),
+        migrations.AddField(
+            model_name='airport',
+            name='country',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='airport_country', to='airport_app.country'),
+        ),
+        migrations.AddField(
+            model_name='airplane',
+            name='airplane_type',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='airport_app.airplanetype'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='ticket',
+            unique_together={('flight', 'row', 'seat')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='city',
+            unique_together={('country', 'name')},
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.11 on 2026-10-17 02:23
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_tickets_sold(apps, schema_editor):
+    Flight = apps.get_model("airport_app", "Flight")
+    Ticket = apps.get_model("airport_app", "Ticket")
+    sold = (
+        Ticket.objects.filter(flight_id=OuterRef("pk"))
+        .order_by()
+        .values("flight_id")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Flight.objects.update(tickets_sold=Coalesce(Subquery(sold), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport_app', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flight',
+            name='tickets_sold',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            backfill_tickets_sold, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.11 on 2026-10-17 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport_app', '0003_flight_tickets_sold'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['departure_time'], name='airport_app_departu_136de5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['route', 'departure_time'], name='airport_app_route_i_50a32c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['airplane', 'departure_time'], name='airport_app_airplan_32d9db_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-17 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport_app', '0005_seathold'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', 'created_at'], name='airport_app_user_id_989274_idx'),
+        ),
+    ]
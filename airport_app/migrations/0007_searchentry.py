@@ -0,0 +1,28 @@
+# Generated by Django 4.2.11 on 2026-10-17 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport_app', '0006_order_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('airport', 'Airport'), ('city', 'City'), ('country', 'Country'), ('airplane', 'Airplane')], max_length=16)),
+                ('object_id', models.BigIntegerField()),
+                ('label', models.CharField(max_length=512)),
+                ('token', models.CharField(max_length=512)),
+                ('position', models.PositiveSmallIntegerField()),
+            ],
+            options={
+                'verbose_name_plural': 'search entries',
+                'indexes': [models.Index(fields=['token'], name='search_entry_token_prefix', opclasses=['varchar_pattern_ops']), models.Index(fields=['kind', 'object_id'], name='airport_app_kind_43cca6_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.11 on 2026-10-17 02:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport_app', '0007_searchentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RouteStatsChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('route_id', models.BigIntegerField()),
+                ('date', models.DateField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RouteDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('flights', models.PositiveIntegerField()),
+                ('capacity', models.PositiveIntegerField()),
+                ('tickets_sold', models.PositiveIntegerField()),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('route', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='airport_app.route')),
+            ],
+            options={
+                'verbose_name_plural': 'route daily stats',
+                'ordering': ('date', 'route'),
+                'indexes': [models.Index(fields=['date', 'route'], name='airport_app_date_939b9f_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='routedailystats',
+            constraint=models.UniqueConstraint(fields=('route', 'date'), name='unique_route_daily_stats'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-17 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('airport_app', '0008_route_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='airplane',
+            name='airplane_image_variants',
+            field=models.JSONField(default=dict, editable=False),
+        ),
+    ]
@@ -5,6 +5,9 @@ import uuid
 
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q, F, Case, When, Value
+from django.db.models.functions import TruncDate
+from django.utils import timezone
 from django.utils.text import slugify
 from airport_service import settings
 
@@ -115,6 +118,8 @@ class Airplane(models.Model):
         null=True,
         upload_to=airplane_image_file_path,
     )
+    # Resized copies of airplane_image, see airport_app.images
+    airplane_image_variants = models.JSONField(default=dict, editable=False)
 
     @property
     def capacity(self) -> int | str:
@@ -153,6 +158,43 @@ class Flight(models.Model):
     crew = models.ManyToManyField(Crew, related_name="flights")
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
+    tickets_sold = models.IntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["departure_time"]),
+            models.Index(fields=["route", "departure_time"]),
+            models.Index(fields=["airplane", "departure_time"]),
+        ]
+
+    @staticmethod
+    def add_tickets_sold(tickets_per_flight: dict) -> None:
+        """Atomically shift the stored number of sold tickets of flights"""
+        if not tickets_per_flight:
+            return
+
+        Flight.objects.filter(id__in=tickets_per_flight).update(
+            tickets_sold=F("tickets_sold")
+            + Case(
+                *[
+                    When(id=flight_id, then=Value(amount))
+                    for flight_id, amount in tickets_per_flight.items()
+                ],
+                output_field=models.IntegerField(),
+            )
+        )
+
+    @staticmethod
+    def crew_names(flight_ids) -> dict:
+        """Return {flight id: ["First Last", ...]} of the flights crew"""
+        crew_names = {}
+        for flight_id, first_name, last_name in (
+            Flight.crew.through.objects.filter(flight_id__in=flight_ids)
+            .order_by("crew_id")
+            .values_list("flight_id", "crew__first_name", "crew__last_name")
+        ):
+            crew_names.setdefault(flight_id, []).append(f"{first_name} {last_name}")
+        return crew_names
 
     def __str__(self):
         return (
@@ -171,6 +213,9 @@ class Order(models.Model):
 
     class Meta:
         ordering = ("created_at",)
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+        ]
 
     def __str__(self):
         return (
@@ -179,6 +224,22 @@ class Order(models.Model):
         )
 
 
+def seats_lookup(seats) -> Q:
+    """Filter on IN lists of the flights, rows and seats of the
+    (flight_id, row, seat) triples `seats`
+
+    It may match other combinations of them, the exact triples are picked
+    in Python: an OR of one condition per seat grows with the order and
+    runs into the expression depth limit of SQLite.
+    """
+    flight_ids, rows, seat_numbers = zip(*seats)
+    return Q(
+        flight_id__in=set(flight_ids),
+        row__in=set(rows),
+        seat__in=set(seat_numbers),
+    )
+
+
 class Ticket(models.Model):
     row = models.IntegerField()
     seat = models.IntegerField()
@@ -210,6 +271,18 @@ class Ticket(models.Model):
                     }
                 )
 
+    @staticmethod
+    def taken_seats(seats):
+        """Return the (flight_id, row, seat) triples that are already booked"""
+        if not seats:
+            return set()
+
+        return set(
+            Ticket.objects.filter(seats_lookup(seats)).values_list(
+                "flight_id", "row", "seat"
+            )
+        ) & set(seats)
+
     def clean(self):
         Ticket.validate_ticket(
             self.row,
@@ -236,3 +309,197 @@ class Ticket(models.Model):
     class Meta:
         unique_together = ("flight", "row", "seat")
         ordering = ["flight", "row", "seat"]
+
+
+class SeatHold(models.Model):
+    """Short-lived reservation of a seat before it is ordered"""
+
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    flight = models.ForeignKey(
+        Flight,
+        on_delete=models.CASCADE,
+        related_name="flight_seat_holds",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="seat_holds",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    @property
+    def is_active(self) -> bool:
+        return self.expires_at > timezone.now()
+
+    @staticmethod
+    def held_seats(seats, exclude_user=None):
+        """Return the (flight_id, row, seat) triples held by other users"""
+        if not seats:
+            return set()
+
+        holds = SeatHold.objects.filter(
+            seats_lookup(seats), expires_at__gt=timezone.now()
+        )
+        if exclude_user is not None:
+            holds = holds.exclude(user=exclude_user)
+
+        return set(holds.values_list("flight_id", "row", "seat")) & set(seats)
+
+    def __str__(self):
+        return (
+            f"Hold of {str(self.flight)} (row: {self.row}, seat: {self.seat}) "
+            f"until {self.expires_at}"
+        )
+
+    class Meta:
+        unique_together = ("flight", "row", "seat")
+        ordering = ["flight", "row", "seat"]
+
+
+class SearchEntry(models.Model):
+    """Normalized name suffix of a searchable object, for prefix lookups
+
+    Every object gets one entry per word of its name, holding the name
+    from that word on, so a prefix of any word matches.
+    """
+
+    KIND_AIRPORT = "airport"
+    KIND_CITY = "city"
+    KIND_COUNTRY = "country"
+    KIND_AIRPLANE = "airplane"
+    # In the order they rank in on equal matches
+    KIND_CHOICES = (
+        (KIND_AIRPORT, "Airport"),
+        (KIND_CITY, "City"),
+        (KIND_COUNTRY, "Country"),
+        (KIND_AIRPLANE, "Airplane"),
+    )
+
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    label = models.CharField(max_length=512)
+    token = models.CharField(max_length=512)
+    # Word number the token starts at, matches at the start rank first
+    position = models.PositiveSmallIntegerField()
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}: {self.token}"
+
+    class Meta:
+        verbose_name_plural = "search entries"
+        indexes = [
+            # LIKE 'prefix%' can only use a btree index with the pattern
+            # operator class on PostgreSQL, other databases ignore it
+            models.Index(
+                fields=["token"],
+                name="search_entry_token_prefix",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            models.Index(fields=["kind", "object_id"]),
+        ]
+
+
+class RouteDailyStats(models.Model):
+    """Flights, seats and sold tickets of a route on a departure day
+
+    Rows are a materialized summary of Flight, kept current by
+    `airport_app.reporting.refresh_route_daily_stats`.
+    """
+
+    route = models.ForeignKey(
+        Route,
+        on_delete=models.CASCADE,
+        related_name="daily_stats",
+    )
+    date = models.DateField()
+    flights = models.PositiveIntegerField()
+    capacity = models.PositiveIntegerField()
+    tickets_sold = models.PositiveIntegerField()
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.route} on {self.date}: {self.tickets_sold}/{self.capacity}"
+
+    class Meta:
+        verbose_name_plural = "route daily stats"
+        ordering = ("date", "route")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["route", "date"], name="unique_route_daily_stats"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["date", "route"]),
+        ]
+
+
+class RouteStatsChange(models.Model):
+    """(route, day) whose RouteDailyStats row is out of date
+
+    The ids are plain integers, not foreign keys, so changes of flights
+    deleted together with their route can be logged too.
+    """
+
+    route_id = models.BigIntegerField()
+    date = models.DateField()
+
+    @staticmethod
+    def log_flights(flights) -> None:
+        """Log the current (route, day) of the `flights` queryset"""
+        RouteStatsChange.objects.bulk_create(
+            [
+                RouteStatsChange(route_id=route_id, date=date)
+                for route_id, date in flights.annotate(
+                    departure_date=TruncDate("departure_time")
+                )
+                .values_list("route_id", "departure_date")
+                .distinct()
+            ]
+        )
+
+    def __str__(self):
+        return f"Route {self.route_id} on {self.date}"
+
+
+class Task(models.Model):
+    """Unit of background work, run by `manage.py run_workers`"""
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    )
+
+    name = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict)
+    # A task is queued once per key, while its row is kept
+    idempotency_key = models.CharField(max_length=255, null=True, unique=True)
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField()
+    run_at = models.DateTimeField()
+    # A running task is claimed by its worker until then, then it is retried
+    locked_until = models.DateTimeField(null=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True)
+
+    def __str__(self):
+        return f"Task #{self.pk} {self.name} ({self.status})"
+
+    class Meta:
+        ordering = ("run_at",)
+        indexes = [
+            models.Index(fields=["status", "run_at"]),
+            models.Index(fields=["status", "locked_until"]),
+            models.Index(fields=["status", "finished_at"]),
+        ]
@@ -0,0 +1,120 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class DefaultPagination(PageNumberPagination):
+    page_size = 10
+    max_page_size = 100
+
+
+class KeysetPagination(DefaultPagination):
+    """Page number pagination that switches to keyset pagination on ?cursor=
+
+    Keyset pages are filtered with `WHERE (ordering) > (last row values)`
+    instead of `OFFSET`, and no `COUNT(*)` runs, so every page costs the
+    same however deep it is. Start with an empty `?cursor=` and follow
+    `next` until it is null.
+    """
+
+    cursor_query_param = "cursor"
+    # Ascending, unique in combination; the last field should be the pk
+    ordering = ("id",)
+    invalid_cursor_message = "Invalid cursor"
+
+    keyset = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.keyset = False
+            return super().paginate_queryset(queryset, request, view)
+
+        self.keyset = True
+        self.request = request
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = request.query_params[self.cursor_query_param]
+        if cursor:
+            queryset = queryset.filter(
+                self._after(self.decode_cursor(cursor, queryset.model))
+            )
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+
+        return self.page
+
+    def _after(self, values):
+        """Lexicographic `(ordering) > (values)` condition"""
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            after = Q(**{f"{field}__gt": values[index]})
+            for equal_field, equal_value in zip(self.ordering[:index], values):
+                after &= Q(**{equal_field: equal_value})
+            condition |= after
+        return condition
+
+    def encode_cursor(self, instance):
+        if isinstance(instance, dict):
+            values = [instance[field] for field in self.ordering]
+        else:
+            values = [getattr(instance, field) for field in self.ordering]
+        return base64.urlsafe_b64encode(
+            # isoformat() keeps the microseconds DjangoJSONEncoder drops
+            json.dumps(values, default=lambda value: value.isoformat()).encode()
+        ).decode("ascii")
+
+    def decode_cursor(self, cursor, model):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            if len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.page[-1]),
+        )
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Keyset pagination cursor, pass it empty to get "
+                "the first page and then follow the `next` link. Pages have no "
+                "`count` and `previous` in this mode.",
+                "schema": {"type": "string"},
+            }
+        ]
+
+
+class FlightPagination(KeysetPagination):
+    ordering = ("departure_time", "id")
+
+
+class OrderPagination(KeysetPagination):
+    ordering = ("created_at", "id")
@@ -0,0 +1,128 @@
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from airport_app.models import Flight, RouteDailyStats, RouteStatsChange
+
+REFRESH_BATCH_SIZE = 1000
+
+
+def route_day_totals(flights) -> dict:
+    """{(route id, day): (flights, capacity, tickets_sold)} of `flights`"""
+    rows = (
+        flights.annotate(departure_date=TruncDate("departure_time"))
+        .order_by()
+        .values("route_id", "departure_date")
+        .annotate(
+            flights_count=Count("id"),
+            capacity=Sum(F("airplane__rows") * F("airplane__seats_in_row")),
+            tickets=Sum("tickets_sold"),
+        )
+    )
+    return {
+        (row["route_id"], row["departure_date"]): (
+            row["flights_count"],
+            row["capacity"],
+            row["tickets"],
+        )
+        for row in rows
+    }
+
+
+def _day_start(date) -> datetime.datetime:
+    return timezone.make_aware(datetime.datetime.combine(date, datetime.time()))
+
+
+def _write_stats(route_days, totals) -> None:
+    """Upsert the `totals` and drop the stats of `route_days` without
+    flights left"""
+    RouteDailyStats.objects.bulk_create(
+        [
+            RouteDailyStats(
+                route_id=route_id,
+                date=date,
+                flights=flights,
+                capacity=capacity,
+                tickets_sold=tickets_sold,
+            )
+            for (route_id, date), (flights, capacity, tickets_sold) in totals.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["route", "date"],
+        update_fields=["flights", "capacity", "tickets_sold", "refreshed_at"],
+    )
+
+    emptied = {route_day for route_day in route_days if route_day not in totals}
+    if emptied:
+        # IN lookups and a date range, an OR of every (route, day) would
+        # exceed the expression depth limit of SQLite
+        dates = [date for _, date in emptied]
+        candidates = RouteDailyStats.objects.filter(
+            route_id__in={route_id for route_id, _ in emptied},
+            date__gte=min(dates),
+            date__lte=max(dates),
+        ).values_list("id", "route_id", "date")
+        RouteDailyStats.objects.filter(
+            id__in=[
+                stats_id
+                for stats_id, route_id, date in candidates
+                if (route_id, date) in emptied
+            ]
+        ).delete()
+
+
+def refresh_route_daily_stats(batch_size=REFRESH_BATCH_SIZE) -> int:
+    """Recompute the stats of the (route, day)s logged as changed
+
+    The change log is the watermark: every batch recomputes only its
+    route days from Flight, whose tickets_sold counter already holds the
+    ticket totals, so Ticket is never scanned. Only the change rows read
+    are deleted, changes logged meanwhile wait for the next refresh.
+    Returns the number of refreshed (route, day)s.
+    """
+    refreshed = 0
+
+    while True:
+        with transaction.atomic():
+            changes = list(
+                RouteStatsChange.objects.order_by("id").values_list(
+                    "id", "route_id", "date"
+                )[:batch_size]
+            )
+            if not changes:
+                return refreshed
+
+            route_days = {(route_id, date) for _, route_id, date in changes}
+            dates = [date for _, date in route_days]
+            # A bare departure_time range can use the (route, departure_time)
+            # index, days outside route_days are dropped below
+            flights = Flight.objects.filter(
+                route_id__in={route_id for route_id, _ in route_days},
+                departure_time__gte=_day_start(min(dates)),
+                departure_time__lt=_day_start(max(dates) + datetime.timedelta(days=1)),
+            )
+            totals = {
+                route_day: values
+                for route_day, values in route_day_totals(flights).items()
+                if route_day in route_days
+            }
+            _write_stats(route_days, totals)
+            RouteStatsChange.objects.filter(
+                id__in=[change_id for change_id, _, _ in changes]
+            ).delete()
+
+        refreshed += len(route_days)
+
+
+def rebuild_route_daily_stats() -> int:
+    """Recompute all stats from Flight, for a first fill or after bulk
+    writes that logged no changes"""
+    with transaction.atomic():
+        RouteStatsChange.objects.all().delete()
+        RouteDailyStats.objects.all().delete()
+        totals = route_day_totals(Flight.objects.all())
+        _write_stats(set(), totals)
+    return len(totals)
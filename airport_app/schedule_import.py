@@ -0,0 +1,376 @@
+import csv
+import json
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from airport_app.cache import bump_model_version
+from airport_app.models import (
+    Country,
+    City,
+    Airport,
+    Route,
+    AirplaneType,
+    Airplane,
+    Crew,
+    Flight,
+    RouteStatsChange,
+    SearchEntry,
+)
+from airport_app.search import reindex
+from airport_app.seat_map import invalidate_seat_maps
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+def read_rows(file, file_format):
+    """Lazily yield the rows of a CSV or NDJSON file as dicts"""
+    if file_format == "csv":
+        yield from csv.DictReader(file)
+    else:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ImportRowError(Exception):
+    pass
+
+
+class ScheduleImporter:
+    """Batched upsert of schedule data identified by natural keys
+
+    Natural keys are resolved through in-memory maps of the referenced
+    tables, loaded with one query each, and every batch is written with
+    one bulk_create plus one bulk_update. Rows that can not be resolved
+    are skipped and reported in `errors`.
+    """
+
+    kinds = ("airports", "routes", "airplanes", "crew", "flights")
+
+    def __init__(self, batch_size=5000, update=False):
+        self.batch_size = batch_size
+        self.update = update
+        self.created = 0
+        self.updated = 0
+        self.skipped = 0
+        self.errors = []
+
+    def run(self, kind, rows):
+        handler = getattr(self, f"_import_{kind}")
+        rows = iter(rows)
+        line = 0
+        while batch := list(islice(rows, self.batch_size)):
+            resolved = []
+            for row in batch:
+                line += 1
+                try:
+                    resolved.append(self._resolve(kind, row))
+                except (ImportRowError, KeyError, TypeError, ValueError) as exc:
+                    self.skipped += 1
+                    self.errors.append(f"row {line}: {exc!r}")
+            with transaction.atomic():
+                handler(resolved)
+
+    def _unique(self, objs, key):
+        """Keep the last of the objects sharing a natural key in a batch"""
+        unique_objs = {key(obj): obj for obj in objs}
+        self.skipped += len(objs) - len(unique_objs)
+        return list(unique_objs.values())
+
+    @staticmethod
+    def _bump_version(model):
+        transaction.on_commit(lambda: bump_model_version(model))
+
+    def _resolve(self, kind, row):
+        return getattr(self, f"_resolve_{kind}")(row)
+
+    def _upsert(self, model, new_objs, existing_objs, update_fields):
+        model.objects.bulk_create(new_objs, batch_size=self.batch_size)
+        self.created += len(new_objs)
+
+        if self.update and existing_objs:
+            model.objects.bulk_update(
+                existing_objs, update_fields, batch_size=self.batch_size
+            )
+            self.updated += len(existing_objs)
+        else:
+            self.skipped += len(existing_objs)
+
+        return new_objs
+
+    # Lookup maps
+
+    def _map(self, name, queryset, key_fields):
+        """{natural key: id} of `queryset`, loaded once per import"""
+        if not hasattr(self, name):
+            rows = queryset.values_list("id", *key_fields)
+            if len(key_fields) == 1:
+                lookup = {key: pk for pk, key in rows}
+            else:
+                lookup = {tuple(key): pk for pk, *key in rows}
+            setattr(self, name, lookup)
+        return getattr(self, name)
+
+    @property
+    def countries(self):
+        return self._map("_countries", Country.objects.all(), ("name",))
+
+    @property
+    def cities(self):
+        return self._map("_cities", City.objects.all(), ("country_id", "name"))
+
+    @property
+    def airports(self):
+        return self._map("_airports", Airport.objects.all(), ("name",))
+
+    @property
+    def routes(self):
+        return self._map(
+            "_routes", Route.objects.all(), ("source_id", "destination_id")
+        )
+
+    @property
+    def airplane_types(self):
+        return self._map("_airplane_types", AirplaneType.objects.all(), ("name",))
+
+    @property
+    def airplanes(self):
+        return self._map("_airplanes", Airplane.objects.all(), ("name",))
+
+    @property
+    def crew(self):
+        return self._map("_crew", Crew.objects.all(), ("first_name", "last_name"))
+
+    def _get(self, lookup, key, description):
+        try:
+            return lookup[key]
+        except KeyError:
+            raise ImportRowError(f"Unknown {description}: {key}")
+
+    def _get_or_create_country(self, name):
+        if name not in self.countries:
+            self.countries[name] = Country.objects.create(name=name).id
+            self._bump_version(Country)
+        return self.countries[name]
+
+    def _get_or_create_city(self, country_id, name):
+        if (country_id, name) not in self.cities:
+            city = City.objects.create(country_id=country_id, name=name)
+            self.cities[(country_id, name)] = city.id
+            self._bump_version(City)
+        return self.cities[(country_id, name)]
+
+    def _get_or_create_airplane_type(self, name):
+        if not name:
+            return None
+        if name not in self.airplane_types:
+            self.airplane_types[name] = AirplaneType.objects.create(name=name).id
+            self._bump_version(AirplaneType)
+        return self.airplane_types[name]
+
+    @staticmethod
+    def _parse_datetime(value):
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ImportRowError(f"Invalid datetime: {value}")
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    # Airports: name, city, country
+
+    def _resolve_airports(self, row):
+        country_id = self._get_or_create_country(row["country"])
+        return Airport(
+            id=self.airports.get(row["name"]),
+            name=row["name"],
+            country_id=country_id,
+            city_id=self._get_or_create_city(country_id, row["city"]),
+        )
+
+    def _import_airports(self, airports):
+        airports = self._unique(airports, lambda airport: airport.name)
+        new_objs = [airport for airport in airports if airport.id is None]
+        self._upsert(
+            Airport,
+            new_objs,
+            [airport for airport in airports if airport.id is not None],
+            ["country", "city"],
+        )
+        self.airports.update((airport.name, airport.id) for airport in new_objs)
+        self._bump_version(Airport)
+        # bulk writes send no signals, updates can move airports to a city
+        reindex(SearchEntry.KIND_AIRPORT, [airport.id for airport in airports])
+
+    # Routes: source, destination (airport names), distance
+
+    def _resolve_routes(self, row):
+        source_id = self._get(self.airports, row["source"], "airport")
+        destination_id = self._get(self.airports, row["destination"], "airport")
+        if source_id == destination_id:
+            raise ImportRowError("The source and destination airports are equal")
+        return Route(
+            id=self.routes.get((source_id, destination_id)),
+            source_id=source_id,
+            destination_id=destination_id,
+            distance=int(row["distance"]) if row.get("distance") else None,
+        )
+
+    def _import_routes(self, routes):
+        routes = self._unique(
+            routes, lambda route: (route.source_id, route.destination_id)
+        )
+        new_objs = [route for route in routes if route.id is None]
+        self._upsert(
+            Route,
+            new_objs,
+            [route for route in routes if route.id is not None],
+            ["distance"],
+        )
+        self.routes.update(
+            ((route.source_id, route.destination_id), route.id) for route in new_objs
+        )
+        self._bump_version(Route)
+
+    # Airplanes: name, airplane_type, rows, seats_in_row
+
+    def _resolve_airplanes(self, row):
+        return Airplane(
+            id=self.airplanes.get(row["name"]),
+            name=row["name"],
+            airplane_type_id=self._get_or_create_airplane_type(
+                row.get("airplane_type")
+            ),
+            rows=int(row["rows"]),
+            seats_in_row=int(row["seats_in_row"]),
+        )
+
+    def _import_airplanes(self, airplanes):
+        airplanes = self._unique(airplanes, lambda airplane: airplane.name)
+        new_objs = [airplane for airplane in airplanes if airplane.id is None]
+        existing_objs = [airplane for airplane in airplanes if airplane.id is not None]
+        self._upsert(
+            Airplane,
+            new_objs,
+            existing_objs,
+            ["airplane_type", "rows", "seats_in_row"],
+        )
+        self.airplanes.update((airplane.name, airplane.id) for airplane in new_objs)
+        reindex(SearchEntry.KIND_AIRPLANE, [airplane.id for airplane in new_objs])
+
+        if self.update and existing_objs:
+            flight_ids = list(
+                Flight.objects.filter(airplane__in=existing_objs).values_list(
+                    "id", flat=True
+                )
+            )
+            transaction.on_commit(lambda: invalidate_seat_maps(flight_ids))
+            RouteStatsChange.log_flights(Flight.objects.filter(id__in=flight_ids))
+
+    # Crew: first_name, last_name
+
+    def _resolve_crew(self, row):
+        return Crew(first_name=row["first_name"], last_name=row["last_name"])
+
+    def _import_crew(self, crew):
+        new_objs = []
+        for crew_member in crew:
+            key = (crew_member.first_name, crew_member.last_name)
+            if key in self.crew:
+                self.skipped += 1
+            else:
+                # Mark it, so a name repeated inside the batch is created once
+                self.crew[key] = None
+                new_objs.append(crew_member)
+        self._upsert(Crew, new_objs, [], [])
+        self.crew.update(
+            ((crew_member.first_name, crew_member.last_name), crew_member.id)
+            for crew_member in new_objs
+        )
+
+    # Flights: source, destination, airplane, departure_time, arrival_time,
+    # crew ("First Last" names separated by ";")
+
+    def _resolve_flights(self, row):
+        source_id = self._get(self.airports, row["source"], "airport")
+        destination_id = self._get(self.airports, row["destination"], "airport")
+        flight = Flight(
+            route_id=self._get(self.routes, (source_id, destination_id), "route"),
+            airplane_id=self._get(self.airplanes, row["airplane"], "airplane"),
+            departure_time=self._parse_datetime(row["departure_time"]),
+            arrival_time=self._parse_datetime(row["arrival_time"]),
+        )
+
+        crew_ids = None
+        if row.get("crew") is not None:
+            crew_ids = {
+                self._get(self.crew, tuple(name.strip().split(" ", 1)), "crew")
+                for name in row["crew"].split(";")
+                if name.strip()
+            }
+        return flight, crew_ids
+
+    def _import_flights(self, flights):
+        flights = self._unique(
+            flights,
+            lambda flight: (
+                flight[0].route_id,
+                flight[0].airplane_id,
+                flight[0].departure_time,
+            ),
+        )
+        if not flights:
+            return
+
+        # One query finds the flights of the batch that already exist. An OR
+        # of every key would exceed the expression depth limit of SQLite, so
+        # the key columns are matched with IN lookups and a departure range;
+        # rows of other key combinations are simply never looked up below
+        departure_times = [flight.departure_time for flight, _ in flights]
+        existing_ids = {
+            (route_id, airplane_id, departure_time): pk
+            for route_id, airplane_id, departure_time, pk in Flight.objects.filter(
+                route_id__in={flight.route_id for flight, _ in flights},
+                airplane_id__in={flight.airplane_id for flight, _ in flights},
+                departure_time__gte=min(departure_times),
+                departure_time__lte=max(departure_times),
+            ).values_list("route_id", "airplane_id", "departure_time", "id")
+        }
+
+        new_objs, existing_objs = [], []
+        for flight, _ in flights:
+            flight.id = existing_ids.get(
+                (flight.route_id, flight.airplane_id, flight.departure_time)
+            )
+            (new_objs if flight.id is None else existing_objs).append(flight)
+
+        self._upsert(Flight, new_objs, existing_objs, ["arrival_time"])
+        RouteStatsChange.log_flights(
+            Flight.objects.filter(id__in=[flight.id for flight in new_objs])
+        )
+
+        new_ids = {flight.id for flight in new_objs}
+        crew_assignments = {
+            flight.id: crew_ids
+            for flight, crew_ids in flights
+            if crew_ids is not None and (flight.id in new_ids or self.update)
+        }
+        if self.update:
+            Flight.crew.through.objects.filter(
+                flight_id__in=[
+                    flight.id
+                    for flight in existing_objs
+                    if flight.id in crew_assignments
+                ]
+            ).delete()
+        Flight.crew.through.objects.bulk_create(
+            [
+                Flight.crew.through(flight_id=flight_id, crew_id=crew_id)
+                for flight_id, crew_ids in crew_assignments.items()
+                for crew_id in crew_ids
+            ],
+            batch_size=self.batch_size,
+        )
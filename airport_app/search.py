@@ -0,0 +1,275 @@
+import re
+import threading
+import unicodedata
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, IntegerField, Min, Value, When
+from django.db.models.functions import Length
+
+from airport_app.cache import bump_model_version, get_model_versions
+from airport_app.db_router import PRIMARY_DATABASE
+from airport_app.models import Airplane, Airport, City, Country, SearchEntry
+
+SEARCH_MAX_LIMIT = 20
+KIND_RANKS = {
+    kind: rank for rank, (kind, _) in enumerate(SearchEntry.KIND_CHOICES)
+}
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize(text) -> str:
+    """Lowercase words of `text` without accents and punctuation"""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(_NON_WORD.sub(" ", text.casefold()).split())
+
+
+def name_tokens(text) -> list:
+    """(position, suffix) of the normalized `text` from every word on"""
+    words = normalize(text).split()
+    return [
+        (position, " ".join(words[position:])) for position in range(len(words))
+    ]
+
+
+def _entries(kind, object_id, label, text) -> list:
+    return [
+        SearchEntry(
+            kind=kind,
+            object_id=object_id,
+            label=label,
+            token=token,
+            position=position,
+        )
+        for position, token in name_tokens(text)
+    ]
+
+
+def _filter_ids(queryset, object_ids):
+    if object_ids is None:
+        return queryset
+    return queryset.filter(id__in=object_ids)
+
+
+def _airport_entries(object_ids) -> list:
+    # Airports are found by their city too, after the own name words
+    airports = _filter_ids(Airport.objects.all(), object_ids).values_list(
+        "id", "name", "city__name", "country__name"
+    )
+    return [
+        entry
+        for airport_id, name, city, country in airports
+        for entry in _entries(
+            SearchEntry.KIND_AIRPORT,
+            airport_id,
+            f"{name} ({city}, {country})",
+            f"{name} {city}",
+        )
+    ]
+
+
+def _city_entries(object_ids) -> list:
+    cities = _filter_ids(City.objects.all(), object_ids).values_list(
+        "id", "name", "country__name"
+    )
+    return [
+        entry
+        for city_id, name, country in cities
+        for entry in _entries(
+            SearchEntry.KIND_CITY, city_id, f"{name}, {country}", name
+        )
+    ]
+
+
+def _country_entries(object_ids) -> list:
+    countries = _filter_ids(Country.objects.all(), object_ids).values_list(
+        "id", "name"
+    )
+    return [
+        entry
+        for country_id, name in countries
+        for entry in _entries(SearchEntry.KIND_COUNTRY, country_id, name, name)
+    ]
+
+
+def _airplane_entries(object_ids) -> list:
+    airplanes = _filter_ids(Airplane.objects.all(), object_ids).values_list(
+        "id", "name"
+    )
+    return [
+        entry
+        for airplane_id, name in airplanes
+        for entry in _entries(SearchEntry.KIND_AIRPLANE, airplane_id, name, name)
+    ]
+
+
+ENTRY_BUILDERS = {
+    SearchEntry.KIND_AIRPORT: _airport_entries,
+    SearchEntry.KIND_CITY: _city_entries,
+    SearchEntry.KIND_COUNTRY: _country_entries,
+    SearchEntry.KIND_AIRPLANE: _airplane_entries,
+}
+
+
+def reindex(kind, object_ids=None) -> int:
+    """Replace the entries of the `kind` objects, all of them when
+    `object_ids` is None; entries of deleted objects are dropped"""
+    entries = ENTRY_BUILDERS[kind](object_ids)
+
+    with transaction.atomic():
+        stale = SearchEntry.objects.filter(kind=kind)
+        if object_ids is not None:
+            stale = stale.filter(object_id__in=object_ids)
+        stale.delete()
+        SearchEntry.objects.bulk_create(entries, batch_size=5000)
+        transaction.on_commit(lambda: bump_model_version(SearchEntry))
+
+    return len(entries)
+
+
+def rebuild_index() -> int:
+    return sum(reindex(kind) for kind in ENTRY_BUILDERS)
+
+
+def _unique_results(rows, limit) -> list:
+    results = []
+    seen = set()
+    for kind, object_id, label in rows:
+        if (kind, object_id) not in seen:
+            seen.add((kind, object_id))
+            results.append({"kind": kind, "id": object_id, "label": label})
+            if len(results) == limit:
+                break
+    return results
+
+
+def database_search(query, kinds, limit) -> list:
+    """Ranked prefix matches from the indexed SearchEntry table"""
+    entries = SearchEntry.objects.filter(token__startswith=query)
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+
+    kind_rank = Case(
+        *[When(kind=kind, then=Value(rank)) for kind, rank in KIND_RANKS.items()],
+        output_field=IntegerField(),
+    )
+    # An object can match with several of its words, it is ranked by the
+    # first one; all its entries share the label
+    rows = (
+        entries.values("kind", "object_id", "label")
+        .annotate(first_position=Min("position"))
+        .order_by("first_position", kind_rank, Length("label"), "label")
+    )
+    return _unique_results(
+        rows.values_list("kind", "object_id", "label")[:limit], limit
+    )
+
+
+class _TrieNode:
+    __slots__ = ("children", "results")
+
+    def __init__(self):
+        self.children = {}
+        # {kind: [(rank, kind, object_id, label)]}, best first
+        self.results = {}
+
+
+# Per-process trie, rebuilt when the shared SearchEntry version changes. A
+# rebuilt trie replaces the dict as a whole, so readers never see the version
+# of one trie with the nodes of another.
+_trie = {"version": None, "root": None}
+_trie_lock = threading.Lock()
+
+
+def _rank(kind, label, position) -> tuple:
+    return position, KIND_RANKS[kind], len(label), label
+
+
+def _build_trie() -> _TrieNode:
+    entries = sorted(
+        (_rank(kind, label, position), kind, object_id, label, token)
+        for kind, object_id, label, token, position in (
+            # From the primary, a lagging replica would be cached as the
+            # version
+            SearchEntry.objects.using(PRIMARY_DATABASE).values_list(
+                "kind", "object_id", "label", "token", "position"
+            )
+        )
+    )
+    root = _TrieNode()
+    for rank, kind, object_id, label, token in entries:
+        node = root
+        for char in token:
+            node = node.children.setdefault(char, _TrieNode())
+            results = node.results.setdefault(kind, [])
+            if len(results) < SEARCH_MAX_LIMIT and not any(
+                result[2] == object_id for result in results
+            ):
+                results.append((rank, kind, object_id, label))
+    return root
+
+
+def get_trie() -> _TrieNode:
+    """Prefix trie of the entries keeping the best results in every node
+
+    One thread of the process rebuilds an outdated trie, the others keep
+    searching the previous one meanwhile, or wait for the first one.
+    """
+    global _trie
+
+    version = get_model_versions([SearchEntry])[0]
+    trie = _trie
+    if trie["version"] == version:
+        return trie["root"]
+
+    if not _trie_lock.acquire(blocking=trie["root"] is None):
+        return trie["root"]
+    try:
+        trie = _trie
+        if trie["version"] != version:
+            trie = {"version": version, "root": _build_trie()}
+            _trie = trie
+    finally:
+        _trie_lock.release()
+    return trie["root"]
+
+
+def trie_search(query, kinds, limit) -> list:
+    """Ranked prefix matches from the in-memory trie"""
+    node = get_trie()
+    for char in query:
+        node = node.children.get(char)
+        if node is None:
+            return []
+
+    results = sorted(
+        result
+        for kind, kind_results in node.results.items()
+        if not kinds or kind in kinds
+        for result in kind_results
+    )
+    return _unique_results(
+        [(kind, object_id, label) for _, kind, object_id, label in results], limit
+    )
+
+
+def search(query, kinds=None, limit=10) -> list:
+    """Ranked type-ahead matches of `query`, {"kind", "id", "label"} dicts
+
+    The database backend needs the pattern operator class index of
+    PostgreSQL to be fast, the in-memory trie is used on other databases
+    unless SEARCH_BACKEND says otherwise.
+    """
+    query = normalize(query)
+    if not query:
+        return []
+
+    backend = settings.SEARCH_BACKEND
+    if backend is None:
+        backend = "database" if connection.vendor == "postgresql" else "trie"
+
+    if backend == "database":
+        return database_search(query, kinds, limit)
+    return trie_search(query, kinds, limit)
@@ -0,0 +1,101 @@
+from django.db import transaction, IntegrityError
+from django.utils import timezone
+from rest_framework import serializers
+
+from airport_app.models import Flight, Order, RouteStatsChange, SeatHold, Ticket
+from airport_app.seat_map import invalidate_seat_maps
+
+# Attempts to book a block when a concurrent order takes one of its seats
+ALLOCATION_ATTEMPTS = 3
+
+
+def free_runs(free):
+    """Yield (start, length) of the runs of set bits of `free`, lowest first"""
+    while free:
+        start = (free & -free).bit_length() - 1
+        shifted = free >> start
+        length = (~shifted & (shifted + 1)).bit_length() - 1
+        yield start, length
+        free &= ~(((1 << length) - 1) << start)
+
+
+def find_seat_block(rows, seats_in_row, occupied, count) -> tuple | None:
+    """Best-fitting block of `count` adjacent free seats in one row
+
+    `occupied` is an iterable of (row, seat) pairs. Every row is a bitset
+    of its free seats, bit number seat - 1, so its free runs are found in
+    a few integer operations. The shortest run that fits wins, leaving
+    the longer ones for bigger groups, then the front row and the lowest
+    seat. Returns (row, first seat) or None.
+    """
+    full_row = (1 << seats_in_row) - 1
+    taken = {}
+    for row, seat in occupied:
+        if 1 <= row <= rows and 1 <= seat <= seats_in_row:
+            taken[row] = taken.get(row, 0) | 1 << (seat - 1)
+
+    best = None
+    for row in range(1, rows + 1):
+        for start, length in free_runs(full_row & ~taken.get(row, 0)):
+            if length >= count and (best is None or length < best[0]):
+                best = (length, row, start + 1)
+                if length == count:
+                    return best[1:]
+
+    return best[1:] if best else None
+
+
+def allocate_seats(user, flight, count) -> Order:
+    """Book `count` adjacent seats of `flight` for `user` in a new order
+
+    The flight row is locked for the transaction, so concurrent
+    allocations on the same flight queue up instead of picking the same
+    block and retrying. Seats actively held by anybody count as occupied.
+    """
+    seats_in_row = flight.airplane.seats_in_row
+    if count > seats_in_row:
+        raise serializers.ValidationError(
+            {"count": [f"At most {seats_in_row} seats are adjacent in a row."]}
+        )
+
+    for attempt in range(ALLOCATION_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                flight = (
+                    Flight.objects.select_for_update(of=("self",))
+                    .select_related("airplane")
+                    .get(id=flight.id)
+                )
+                occupied = [
+                    *Ticket.objects.filter(flight=flight).values_list("row", "seat"),
+                    *SeatHold.objects.filter(
+                        flight=flight, expires_at__gt=timezone.now()
+                    ).values_list("row", "seat"),
+                ]
+                block = find_seat_block(
+                    flight.airplane.rows,
+                    flight.airplane.seats_in_row,
+                    occupied,
+                    count,
+                )
+                if block is None:
+                    raise serializers.ValidationError(
+                        {"count": [f"There are no {count} adjacent free seats."]}
+                    )
+
+                row, first_seat = block
+                order = Order.objects.create(user=user)
+                Ticket.objects.bulk_create(
+                    Ticket(order=order, flight=flight, row=row, seat=seat)
+                    for seat in range(first_seat, first_seat + count)
+                )
+                Flight.add_tickets_sold({flight.id: count})
+                RouteStatsChange.log_flights(Flight.objects.filter(id=flight.id))
+                transaction.on_commit(lambda: invalidate_seat_maps([flight.id]))
+                return order
+        except IntegrityError:
+            # A regular order took one of the seats after they were read
+            if attempt == ALLOCATION_ATTEMPTS - 1:
+                raise serializers.ValidationError(
+                    {"count": ["The seats have just been taken, try again."]}
+                )
@@ -0,0 +1,165 @@
+import datetime
+
+from django.conf import settings
+from django.db import transaction, IntegrityError
+from django.utils import timezone
+from rest_framework import serializers
+
+from airport_app.models import SeatHold, Ticket, seats_lookup
+from airport_app.task_queue import enqueue
+
+
+def hold_expiry():
+    return timezone.now() + datetime.timedelta(seconds=settings.SEAT_HOLD_TTL)
+
+
+def hold_seats(user, flight, seats) -> list:
+    """Hold all `seats` ((row, seat) pairs) of `flight` for `user` or none
+
+    Existing hold rows of the seats are locked with SKIP LOCKED, so a
+    concurrent checkout of the same seats is skipped instead of waited for;
+    it then shows up as a unique constraint conflict on insert. Expired and
+    own holds are taken over in place, own active holds keep their creation
+    time, so holding them again does not get around SEAT_HOLD_MAX_LIFETIME.
+    A user can hold at most SEAT_HOLD_MAX_PER_USER seats at once.
+    """
+    errors = [{} for _ in seats]
+    for index, (row, seat) in enumerate(seats):
+        try:
+            Ticket.validate_ticket(
+                row, seat, flight.airplane, serializers.ValidationError
+            )
+        except serializers.ValidationError as exc:
+            errors[index] = exc.detail
+        if (row, seat) in seats[:index]:
+            errors[index] = {"seat": ["This seat is requested twice."]}
+
+    taken_seats = Ticket.taken_seats(
+        [(flight.id, row, seat) for row, seat in seats]
+    )
+    for index, (row, seat) in enumerate(seats):
+        if (flight.id, row, seat) in taken_seats:
+            errors[index] = {"seat": ["This seat is already taken."]}
+
+    if any(errors):
+        raise serializers.ValidationError({"seats": errors})
+
+    now = timezone.now()
+    expires_at = hold_expiry()
+    # Only the holds of the requested seats are locked, the IN lookup also
+    # matches other seats of their rows
+    requested = set(seats)
+    hold_ids = [
+        hold_id
+        for hold_id, row, seat in SeatHold.objects.filter(
+            seats_lookup([(flight.id, row, seat) for row, seat in seats])
+        ).values_list("id", "row", "seat")
+        if (row, seat) in requested
+    ]
+
+    try:
+        with transaction.atomic():
+            existing = {
+                (hold.row, hold.seat): hold
+                for hold in SeatHold.objects.select_for_update(
+                    skip_locked=True
+                ).filter(id__in=hold_ids)
+            }
+            for index, (row, seat) in enumerate(seats):
+                hold = existing.get((row, seat))
+                if hold and hold.expires_at > now and hold.user_id != user.id:
+                    errors[index] = {"seat": ["This seat is held by someone else."]}
+            if any(errors):
+                raise serializers.ValidationError({"seats": errors})
+
+            other_holds = (
+                SeatHold.objects.filter(user=user, expires_at__gt=now)
+                .exclude(id__in=[hold.id for hold in existing.values()])
+                .count()
+            )
+            if other_holds + len(seats) > settings.SEAT_HOLD_MAX_PER_USER:
+                raise serializers.ValidationError(
+                    {
+                        "seats": [
+                            "You can not hold more than "
+                            f"{settings.SEAT_HOLD_MAX_PER_USER} seats at once."
+                        ]
+                    }
+                )
+
+            for hold in existing.values():
+                if hold.user_id != user.id or hold.expires_at <= now:
+                    hold.user = user
+                    hold.created_at = now
+                hold.expires_at = min(expires_at, hold_deadline(hold))
+            SeatHold.objects.bulk_update(
+                existing.values(), ["user", "created_at", "expires_at"]
+            )
+            new_holds = SeatHold.objects.bulk_create(
+                SeatHold(
+                    flight=flight,
+                    row=row,
+                    seat=seat,
+                    user=user,
+                    expires_at=expires_at,
+                )
+                for row, seat in seats
+                if (row, seat) not in existing
+            )
+    except IntegrityError:
+        raise serializers.ValidationError(
+            {"seats": ["Some of the seats have just been held by someone else."]}
+        )
+
+    return sorted(
+        [*existing.values(), *new_holds], key=lambda hold: (hold.row, hold.seat)
+    )
+
+
+def hold_deadline(hold):
+    """Time after which `hold` can not be extended any more"""
+    return hold.created_at + datetime.timedelta(
+        seconds=settings.SEAT_HOLD_MAX_LIFETIME
+    )
+
+
+def extend_hold(hold) -> SeatHold:
+    if not hold.is_active:
+        raise serializers.ValidationError("This seat hold has already expired.")
+
+    expires_at = min(hold_expiry(), hold_deadline(hold))
+    if expires_at <= hold.expires_at:
+        raise serializers.ValidationError(
+            "This seat hold can not be extended any further."
+        )
+
+    hold.expires_at = expires_at
+    hold.save(update_fields=["expires_at"])
+    return hold
+
+
+def sweep_expired_holds(batch_size=1000) -> int:
+    """Delete expired holds in batches without waiting on locked rows"""
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            expired_ids = list(
+                SeatHold.objects.select_for_update(skip_locked=True)
+                .filter(expires_at__lte=timezone.now())
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not expired_ids:
+                return deleted
+            deleted += SeatHold.objects.filter(id__in=expired_ids).delete()[0]
+
+
+def schedule_hold_sweep(delay=0) -> None:
+    """Queue a sweep of expired holds for the task workers
+
+    The idempotency key is the SEAT_HOLD_SWEEP_INTERVAL period the sweep
+    runs in, so a sweep is queued once per period however many workers
+    start or sweeps queue their successor.
+    """
+    run_at = timezone.now().timestamp() + delay
+    period = int(run_at // settings.SEAT_HOLD_SWEEP_INTERVAL)
+    enqueue("sweep_seat_holds", key=f"sweep_seat_holds:{period}", delay=delay)
@@ -0,0 +1,56 @@
+import base64
+
+from django.conf import settings
+from django.core.cache import cache
+
+from airport_app.models import Ticket
+
+SEAT_MAP_CACHE_KEY = "airport_app:seat_map:{flight_id}"
+
+
+def build_seat_map(flight) -> dict:
+    """Build the occupancy bitmap of a flight from its booked seats.
+
+    Seat (row, seat) is bit number (row - 1) * seats_in_row + (seat - 1),
+    most significant bit first; a set bit means the seat is taken.
+    """
+    rows = max(flight.airplane.rows, 0)
+    seats_in_row = max(flight.airplane.seats_in_row, 0)
+    bitmap = bytearray((rows * seats_in_row + 7) // 8)
+
+    taken = 0
+    for row, seat in Ticket.objects.filter(flight_id=flight.id).values_list(
+        "row", "seat"
+    ):
+        if not (1 <= row <= rows and 1 <= seat <= seats_in_row):
+            continue
+        index = (row - 1) * seats_in_row + (seat - 1)
+        bitmap[index // 8] |= 0x80 >> (index % 8)
+        taken += 1
+
+    return {
+        "flight": flight.id,
+        "rows": rows,
+        "seats_in_row": seats_in_row,
+        "taken": taken,
+        "available": rows * seats_in_row - taken,
+        "bitmap": base64.b64encode(bytes(bitmap)).decode("ascii"),
+    }
+
+
+def get_cached_seat_map(flight_id) -> dict | None:
+    return cache.get(SEAT_MAP_CACHE_KEY.format(flight_id=flight_id))
+
+
+def cache_seat_map(seat_map: dict) -> None:
+    cache.set(
+        SEAT_MAP_CACHE_KEY.format(flight_id=seat_map["flight"]),
+        seat_map,
+        settings.SEAT_MAP_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_seat_maps(flight_ids) -> None:
+    cache.delete_many(
+        [SEAT_MAP_CACHE_KEY.format(flight_id=flight_id) for flight_id in flight_ids]
+    )
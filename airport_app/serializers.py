@@ -1,6 +1,10 @@
-from django.db import transaction
+from collections import Counter
+
+from django.db import transaction, IntegrityError
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
-from django.core.exceptions import ValidationError
 
 from airport_app.models import (
     Country,
@@ -13,7 +17,13 @@ from airport_app.models import (
     Flight,
     Ticket,
     Order,
+    RouteDailyStats,
+    RouteStatsChange,
+    SeatHold,
+    SearchEntry,
 )
+from airport_app.images import image_variant_urls
+from airport_app.seat_map import invalidate_seat_maps
 
 
 class CountrySerializer(serializers.ModelSerializer):
@@ -129,8 +139,22 @@ class AirplaneTypeSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+@extend_schema_field(OpenApiTypes.OBJECT)
+class ImageVariantsField(serializers.Field):
+    """{variant: {"width", "height", "webp", "jpeg"}} URLs of the resized
+    copies of an image, empty until they are processed"""
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, variants):
+        return image_variant_urls(variants, self.context.get("request"))
+
+
 class AirplaneSerializer(serializers.ModelSerializer):
     airplane_image = serializers.ImageField(read_only=True)
+    airplane_image_variants = ImageVariantsField()
 
     class Meta:
         model = Airplane
@@ -141,6 +165,7 @@ class AirplaneSerializer(serializers.ModelSerializer):
             "rows",
             "seats_in_row",
             "airplane_image",
+            "airplane_image_variants",
         )
 
 
@@ -157,6 +182,7 @@ class AirplaneListSerializer(AirplaneSerializer):
             "airplane_type",
             "capacity",
             "airplane_image",
+            "airplane_image_variants",
         )
 
 
@@ -173,13 +199,16 @@ class AirplaneRetrieveSerializer(AirplaneSerializer):
             "seats_in_row",
             "capacity",
             "airplane_image",
+            "airplane_image_variants",
         )
 
 
 class AirplaneImageSerializer(serializers.ModelSerializer):
+    airplane_image_variants = ImageVariantsField()
+
     class Meta:
         model = Airplane
-        fields = ("id", "airplane_image")
+        fields = ("id", "airplane_image", "airplane_image_variants")
 
 
 class CrewSerializer(serializers.ModelSerializer):
@@ -234,11 +263,27 @@ class FlightListSerializer(FlightSerializer):
         )
 
 
+class FlightListCrewNamesSerializer(FlightListSerializer):
+    """FlightListSerializer reading the crew from context["crew_names"],
+    {flight id: names}, for querysets that can not prefetch the crew
+
+    The capacity is read from an `airplane_capacity` annotation, like the
+    values() rows of the FlightViewSet list, so cargo airplanes get 0.
+    """
+
+    airplane_capacity = serializers.IntegerField(read_only=True)
+
+    def get_crew(self, obj):
+        return ", ".join(self.context["crew_names"].get(obj.id, ()))
+
+
 class FlightRetrieveSerializer(FlightSerializer):
     route = RouteListSerializer()
     airplane = AirplaneListSerializer()
     crew = CrewSerializer(read_only=True, many=True)
-    airplane_image = serializers.ImageField(source="airplane.image", read_only=True)
+    airplane_image = serializers.ImageField(
+        source="airplane.airplane_image", read_only=True
+    )
 
     class Meta:
         model = Flight
@@ -253,25 +298,250 @@ class FlightRetrieveSerializer(FlightSerializer):
         )
 
 
+class PrefetchedFlightField(serializers.PrimaryKeyRelatedField):
+    """Resolves flights from the map prefetched by BulkTicketSerializer"""
+
+    def to_internal_value(self, data):
+        flights = self.context.get("prefetched_flights")
+        if flights is not None:
+            try:
+                return flights[int(data)]
+            except (KeyError, TypeError, ValueError):
+                pass
+        return super().to_internal_value(data)
+
+
+class BulkTicketSerializer(serializers.ListSerializer):
+    """Validates a whole batch of tickets with a fixed number of queries"""
+
+    @staticmethod
+    def _flight_ids(data):
+        flight_ids = set()
+        for item in data:
+            try:
+                flight_ids.add(int(item["flight"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return flight_ids
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.context["prefetched_flights"] = Flight.objects.select_related(
+                "airplane"
+            ).in_bulk(self._flight_ids(data))
+
+        tickets = super().to_internal_value(data)
+
+        seats = [
+            (ticket["flight"].id, ticket["row"], ticket["seat"])
+            for ticket in tickets
+        ]
+        taken_seats = Ticket.taken_seats(seats)
+        request = self.context.get("request")
+        held_seats = SeatHold.held_seats(
+            seats, exclude_user=request.user if request else None
+        )
+        errors = []
+        requested_seats = set()
+        for seat in seats:
+            if seat in taken_seats:
+                errors.append({"seat": ["This seat is already taken."]})
+            elif seat in held_seats:
+                errors.append({"seat": ["This seat is held by someone else."]})
+            elif seat in requested_seats:
+                errors.append({"seat": ["This seat is booked twice in the order."]})
+            else:
+                errors.append({})
+            requested_seats.add(seat)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return tickets
+
+
+class FlightSeatMapSerializer(serializers.Serializer):
+    flight = serializers.IntegerField(read_only=True)
+    rows = serializers.IntegerField(read_only=True)
+    seats_in_row = serializers.IntegerField(read_only=True)
+    taken = serializers.IntegerField(read_only=True)
+    available = serializers.IntegerField(read_only=True)
+    bitmap = serializers.CharField(
+        read_only=True,
+        help_text="Base64 encoded occupancy bitmap, one bit per seat in "
+        "row-major order, most significant bit first, 1 means taken",
+    )
+
+
+class SeatAllocationSerializer(serializers.Serializer):
+    count = serializers.IntegerField(
+        min_value=1, help_text="Number of adjacent seats to book in one row"
+    )
+
+
+class ItinerarySearchSerializer(serializers.Serializer):
+    source = serializers.IntegerField(help_text="Departure airport id")
+    destination = serializers.IntegerField(help_text="Arrival airport id")
+    date = serializers.DateField(help_text="Departure date of the first leg")
+    max_legs = serializers.IntegerField(min_value=1, max_value=4, default=3)
+    min_connection = serializers.IntegerField(
+        min_value=0,
+        default=60,
+        help_text="Minimal connection time in minutes",
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=20, default=5)
+
+    def validate(self, attrs):
+        if attrs["source"] == attrs["destination"]:
+            raise serializers.ValidationError(
+                "The source and destination airports must be different."
+            )
+        return attrs
+
+
+class ItineraryLegSerializer(serializers.Serializer):
+    flight = serializers.IntegerField(read_only=True)
+    route = serializers.IntegerField(read_only=True)
+    source = serializers.CharField(read_only=True)
+    destination = serializers.CharField(read_only=True)
+    departure_time = serializers.DateTimeField(read_only=True)
+    arrival_time = serializers.DateTimeField(read_only=True)
+
+
+class ItinerarySerializer(serializers.Serializer):
+    departure_time = serializers.DateTimeField(read_only=True)
+    arrival_time = serializers.DateTimeField(read_only=True)
+    duration_minutes = serializers.IntegerField(read_only=True)
+    distance = serializers.IntegerField(read_only=True)
+    legs = ItineraryLegSerializer(many=True, read_only=True)
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(help_text="Beginning of a name word (ex. ?q=heat)")
+    kind = serializers.MultipleChoiceField(
+        choices=SearchEntry.KIND_CHOICES,
+        required=False,
+        help_text="Only these kinds, comma separated (ex. ?kind=airport,city)",
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=20, default=10)
+
+    def to_internal_value(self, data):
+        kind = data.get("kind")
+        if kind:
+            data = {**data.dict(), "kind": kind.split(",")}
+        return super().to_internal_value(data)
+
+
+class SearchResultSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=SearchEntry.KIND_CHOICES, read_only=True)
+    id = serializers.IntegerField(read_only=True)
+    label = serializers.CharField(read_only=True)
+
+
+class RouteDailyStatsSerializer(serializers.ModelSerializer):
+    load_factor = serializers.SerializerMethodField()
+    seat_km = serializers.SerializerMethodField()
+    passenger_km = serializers.SerializerMethodField()
+
+    class Meta:
+        model = RouteDailyStats
+        fields = (
+            "id",
+            "route",
+            "date",
+            "flights",
+            "capacity",
+            "tickets_sold",
+            "load_factor",
+            "seat_km",
+            "passenger_km",
+            "refreshed_at",
+        )
+        read_only_fields = fields
+
+    def get_load_factor(self, stats) -> float | None:
+        if not stats.capacity:
+            return None
+        return round(stats.tickets_sold / stats.capacity, 4)
+
+    def get_seat_km(self, stats) -> int | None:
+        """Offered seats times the route distance"""
+        if stats.distance is None:
+            return None
+        return stats.capacity * stats.distance
+
+    def get_passenger_km(self, stats) -> int | None:
+        """Sold tickets times the route distance, the revenue proxy"""
+        if stats.distance is None:
+            return None
+        return stats.tickets_sold * stats.distance
+
+
+class RouteStatsTotalsSerializer(serializers.Serializer):
+    route = serializers.IntegerField(read_only=True)
+    flights = serializers.IntegerField(read_only=True)
+    capacity = serializers.IntegerField(read_only=True)
+    tickets_sold = serializers.IntegerField(read_only=True)
+    load_factor = serializers.FloatField(read_only=True, allow_null=True)
+    passenger_km = serializers.IntegerField(read_only=True, allow_null=True)
+
+
+class SeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    seat = serializers.IntegerField()
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SeatHold
+        fields = ("id", "flight", "row", "seat", "expires_at")
+        read_only_fields = fields
+
+
+class SeatHoldCreateSerializer(serializers.Serializer):
+    flight = serializers.PrimaryKeyRelatedField(
+        queryset=Flight.objects.select_related("airplane")
+    )
+    seats = SeatSerializer(many=True, allow_empty=False)
+
+
 class TicketSerializer(serializers.ModelSerializer):
+    flight = PrefetchedFlightField(queryset=Flight.objects.select_related("airplane"))
+
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs=attrs)
         Ticket.validate_ticket(
-            attrs["row"], attrs["seat"], attrs["flight"].airplane, ValidationError
+            attrs["row"],
+            attrs["seat"],
+            attrs["flight"].airplane,
+            serializers.ValidationError,
         )
         return data
 
     class Meta:
         model = Ticket
         fields = ("id", "row", "seat", "flight")
+        list_serializer_class = BulkTicketSerializer
+        # Seat conflicts are checked for the whole batch in BulkTicketSerializer
+        validators = []
+
+
+class TicketFlightSerializer(FlightSerializer):
+    route = RouteListSerializer(read_only=True)
+    airplane_name = serializers.CharField(source="airplane.name", read_only=True)
+
+    class Meta(FlightSerializer.Meta):
+        fields = (
+            "id",
+            "route",
+            "airplane_name",
+            "departure_time",
+            "arrival_time",
+        )
 
 
 class TicketListSerializer(TicketSerializer):
-    flight = serializers.HyperlinkedRelatedField(
-        many=False,
-        read_only=True,
-        view_name="airport:flight-detail",
-    )
+    flight = TicketFlightSerializer(read_only=True)
 
 
 class TicketSeatsSerializer(TicketSerializer):
@@ -281,23 +551,90 @@ class TicketSeatsSerializer(TicketSerializer):
 
 
 class OrderSerializer(serializers.ModelSerializer):
-    order_tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
+    order_tickets = TicketSerializer(
+        many=True, read_only=False, allow_empty=False, required=False
+    )
+    seat_holds = serializers.ListField(
+        child=serializers.IntegerField(),
+        write_only=True,
+        required=False,
+        allow_empty=False,
+        help_text="Ids of own seat holds to convert into tickets, "
+        "instead of order_tickets",
+    )
 
     class Meta:
         model = Order
-        fields = ("id", "order_tickets", "created_at")
+        fields = ("id", "order_tickets", "seat_holds", "created_at")
+
+    def validate(self, attrs):
+        if ("order_tickets" in attrs) == ("seat_holds" in attrs):
+            raise serializers.ValidationError(
+                "Provide either order_tickets or seat_holds."
+            )
+        return attrs
+
+    @staticmethod
+    def _tickets_from_holds(hold_ids, user):
+        """Lock and consume the holds, their seats were validated on hold"""
+        holds = list(
+            SeatHold.objects.select_for_update().filter(
+                id__in=hold_ids, user=user, expires_at__gt=timezone.now()
+            )
+        )
+        if len(holds) != len(set(hold_ids)):
+            raise serializers.ValidationError(
+                {"seat_holds": ["Some of the seat holds have expired or do not exist."]}
+            )
+
+        SeatHold.objects.filter(id__in=[hold.id for hold in holds]).delete()
+        return [
+            {"flight_id": hold.flight_id, "row": hold.row, "seat": hold.seat}
+            for hold in holds
+        ]
 
     def create(self, validated_data):
-        with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
-            order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
-            return order
+        tickets_data = validated_data.pop("order_tickets", None)
+        hold_ids = validated_data.pop("seat_holds", None)
+        try:
+            with transaction.atomic():
+                if hold_ids is not None:
+                    tickets_data = self._tickets_from_holds(
+                        hold_ids, validated_data["user"]
+                    )
+                else:
+                    tickets_data = [
+                        {
+                            "flight_id": ticket_data["flight"].id,
+                            "row": ticket_data["row"],
+                            "seat": ticket_data["seat"],
+                        }
+                        for ticket_data in tickets_data
+                    ]
+
+                order = Order.objects.create(**validated_data)
+                Ticket.objects.bulk_create(
+                    Ticket(order=order, **ticket_data) for ticket_data in tickets_data
+                )
+                tickets_per_flight = Counter(
+                    ticket_data["flight_id"] for ticket_data in tickets_data
+                )
+                Flight.add_tickets_sold(tickets_per_flight)
+                RouteStatsChange.log_flights(
+                    Flight.objects.filter(id__in=tickets_per_flight)
+                )
+                transaction.on_commit(
+                    lambda: invalidate_seat_maps(tickets_per_flight.keys())
+                )
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {"order_tickets": ["Some of the seats have just been taken."]}
+            )
+        return order
 
 
 class OrderListSerializer(OrderSerializer):
-    tickets = TicketListSerializer(many=True, read_only=True)
+    order_tickets = TicketListSerializer(many=True, read_only=True)
 
     class Meta(OrderSerializer.Meta):
-        fields = ("id", "tickets", "created_at")
+        fields = ("id", "order_tickets", "created_at")
@@ -0,0 +1,112 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+
+from airport_app.cache import bump_model_version
+from airport_app.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Flight,
+    Route,
+    RouteStatsChange,
+    SearchEntry,
+    Ticket,
+)
+from airport_app.search import reindex
+from airport_app.seat_map import invalidate_seat_maps
+
+
+@receiver([post_save, post_delete], sender=Ticket)
+def invalidate_ticket_seat_map(sender, instance, **kwargs):
+    flight_ids = [instance.flight_id]
+    transaction.on_commit(lambda: invalidate_seat_maps(flight_ids))
+
+
+@receiver(post_save, sender=Ticket)
+def count_created_ticket(sender, instance, created, **kwargs):
+    if created:
+        Flight.add_tickets_sold({instance.flight_id: 1})
+        RouteStatsChange.log_flights(Flight.objects.filter(id=instance.flight_id))
+
+
+@receiver(post_delete, sender=Ticket)
+def count_deleted_ticket(sender, instance, **kwargs):
+    Flight.add_tickets_sold({instance.flight_id: -1})
+    RouteStatsChange.log_flights(Flight.objects.filter(id=instance.flight_id))
+
+
+@receiver([post_save, post_delete], sender=Flight)
+def invalidate_flight_seat_map(sender, instance, **kwargs):
+    flight_ids = [instance.id]
+    transaction.on_commit(lambda: invalidate_seat_maps(flight_ids))
+
+
+@receiver(post_save, sender=Airplane)
+def invalidate_airplane_seat_maps(sender, instance, created, **kwargs):
+    if created:
+        return
+    flight_ids = list(instance.airplane_flights.values_list("id", flat=True))
+    transaction.on_commit(lambda: invalidate_seat_maps(flight_ids))
+
+
+@receiver([post_save, post_delete], sender=Country)
+@receiver([post_save, post_delete], sender=City)
+@receiver([post_save, post_delete], sender=Airport)
+@receiver([post_save, post_delete], sender=Route)
+@receiver([post_save, post_delete], sender=AirplaneType)
+def bump_reference_data_version(sender, **kwargs):
+    transaction.on_commit(lambda: bump_model_version(sender))
+
+
+@receiver([post_save, post_delete], sender=Country)
+def reindex_country(sender, instance, **kwargs):
+    reindex(SearchEntry.KIND_COUNTRY, [instance.id])
+    # Labels of cities and airports include the country name
+    reindex(
+        SearchEntry.KIND_CITY,
+        list(City.objects.filter(country=instance).values_list("id", flat=True)),
+    )
+    reindex(
+        SearchEntry.KIND_AIRPORT,
+        list(Airport.objects.filter(country=instance).values_list("id", flat=True)),
+    )
+
+
+@receiver([post_save, post_delete], sender=City)
+def reindex_city(sender, instance, **kwargs):
+    reindex(SearchEntry.KIND_CITY, [instance.id])
+    reindex(
+        SearchEntry.KIND_AIRPORT,
+        list(Airport.objects.filter(city=instance).values_list("id", flat=True)),
+    )
+
+
+@receiver([post_save, post_delete], sender=Airport)
+def reindex_airport(sender, instance, **kwargs):
+    reindex(SearchEntry.KIND_AIRPORT, [instance.id])
+
+
+@receiver([post_save, post_delete], sender=Airplane)
+def reindex_airplane(sender, instance, **kwargs):
+    reindex(SearchEntry.KIND_AIRPLANE, [instance.id])
+
+
+@receiver([pre_save, pre_delete], sender=Flight)
+def log_previous_flight_stats_change(sender, instance, **kwargs):
+    # The route or day the flight is moved away from
+    if instance.pk is not None:
+        RouteStatsChange.log_flights(Flight.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Flight)
+def log_flight_stats_change(sender, instance, **kwargs):
+    RouteStatsChange.log_flights(Flight.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Airplane)
+def log_airplane_stats_change(sender, instance, created, **kwargs):
+    if not created:
+        RouteStatsChange.log_flights(instance.airplane_flights.all())
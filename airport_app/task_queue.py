@@ -0,0 +1,198 @@
+import datetime
+import logging
+import random
+import traceback
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from airport_app.models import Task
+
+logger = logging.getLogger(__name__)
+
+# {task name: function}, filled by the @task decorator
+TASK_REGISTRY = {}
+
+
+def task(name=None, max_attempts=None):
+    """Register a function as a task, its arguments are the task payload
+
+    Tasks can run more than once, when a worker dies or a lease runs out,
+    so they must be idempotent.
+    """
+
+    def decorator(func):
+        func.task_name = name or func.__name__
+        func.max_attempts = max_attempts
+        TASK_REGISTRY[func.task_name] = func
+        return func
+
+    return decorator
+
+
+def enqueue(name, payload=None, key=None, delay=0, max_attempts=None) -> None:
+    """Queue the `name` task with the `payload` keyword arguments
+
+    The row is written in the transaction of the caller, so the task runs
+    only if that commits, and never sees uncommitted data. With an
+    idempotency `key`, a task already queued under it is not queued again.
+    """
+    Task.objects.bulk_create(
+        [
+            Task(
+                name=name,
+                payload=payload or {},
+                idempotency_key=key,
+                max_attempts=max_attempts
+                or getattr(TASK_REGISTRY.get(name), "max_attempts", None)
+                or settings.TASK_MAX_ATTEMPTS,
+                run_at=timezone.now() + datetime.timedelta(seconds=delay),
+            )
+        ],
+        ignore_conflicts=key is not None,
+    )
+
+
+def claim_tasks(limit=1) -> list:
+    """Lease up to `limit` due tasks to the calling worker
+
+    Rows locked by other workers are skipped. Running tasks whose lease
+    expired, as their worker died, are claimed again, or failed when that
+    was their last attempt; a task killing its worker is not run forever.
+    """
+    now = timezone.now()
+    expired_lease = Q(status=Task.STATUS_RUNNING, locked_until__lt=now)
+    with transaction.atomic():
+        exhausted_ids = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(expired_lease, attempts__gte=F("max_attempts"))
+            .values_list("id", flat=True)
+        )
+        if exhausted_ids:
+            Task.objects.filter(id__in=exhausted_ids).update(
+                status=Task.STATUS_FAILED,
+                finished_at=now,
+                locked_until=None,
+                last_error="The lease of the last attempt expired, "
+                "its worker probably died.",
+            )
+
+        tasks = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=Task.STATUS_PENDING, run_at__lte=now)
+                | (expired_lease & Q(attempts__lt=F("max_attempts")))
+            )
+            .order_by("run_at")[:limit]
+        )
+        if not tasks:
+            return []
+
+        locked_until = now + datetime.timedelta(seconds=settings.TASK_LEASE_SECONDS)
+        Task.objects.filter(id__in=[task.id for task in tasks]).update(
+            status=Task.STATUS_RUNNING,
+            attempts=F("attempts") + 1,
+            locked_until=locked_until,
+        )
+
+    for task in tasks:
+        task.status = Task.STATUS_RUNNING
+        task.attempts += 1
+        task.locked_until = locked_until
+    return tasks
+
+
+def retry_delay(attempts) -> float:
+    """Exponential backoff with jitter, in seconds"""
+    delay = min(
+        settings.TASK_RETRY_BACKOFF * 2 ** (attempts - 1),
+        settings.TASK_RETRY_BACKOFF_MAX,
+    )
+    return delay * random.uniform(0.5, 1)
+
+
+def run_task(task) -> bool:
+    """Run a claimed task and store its outcome, True if it succeeded
+
+    Failed attempts are retried later, until `max_attempts` is reached.
+    """
+    now = timezone.now()
+    try:
+        func = TASK_REGISTRY.get(task.name)
+        if func is None:
+            raise LookupError(f"No task is registered as '{task.name}'")
+        func(**task.payload)
+    except Exception:
+        logger.exception("Attempt %s of %s failed", task.attempts, task)
+        update = {"last_error": traceback.format_exc()[-10000:]}
+        if task.attempts >= task.max_attempts:
+            update.update(status=Task.STATUS_FAILED, finished_at=now)
+        else:
+            update.update(
+                status=Task.STATUS_PENDING,
+                run_at=now + datetime.timedelta(seconds=retry_delay(task.attempts)),
+            )
+        succeeded = False
+    else:
+        update = {"status": Task.STATUS_DONE, "finished_at": now}
+        succeeded = True
+
+    # The lease may have run out and the task been claimed by another worker
+    Task.objects.filter(
+        id=task.id, status=Task.STATUS_RUNNING, attempts=task.attempts
+    ).update(locked_until=None, **update)
+    return succeeded
+
+
+def run_pending(limit=None) -> int:
+    """Run due tasks in the calling thread until none is left, or `limit`
+    of them ran; returns the number of tasks run"""
+    count = 0
+    while limit is None or count < limit:
+        tasks = claim_tasks()
+        if not tasks:
+            break
+        run_task(tasks[0])
+        count += 1
+    return count
+
+
+def work(stop_event, poll_interval) -> None:
+    """Worker thread loop, running tasks one by one until `stop_event`"""
+    try:
+        while not stop_event.is_set():
+            close_old_connections()
+            try:
+                tasks = claim_tasks()
+            except Exception:
+                logger.exception("Claiming tasks failed")
+                connections.close_all()
+                tasks = []
+
+            if not tasks:
+                stop_event.wait(poll_interval)
+                continue
+            try:
+                run_task(tasks[0])
+            except Exception:
+                # Storing the outcome failed, the lease expiry retries it
+                logger.exception("Running %s failed", tasks[0])
+                connections.close_all()
+    finally:
+        connections.close_all()
+
+
+def purge_finished_tasks() -> int:
+    """Delete the tasks done more than TASK_RETENTION seconds ago
+
+    Their idempotency keys can be used again afterwards. Failed tasks are
+    kept for inspection.
+    """
+    deleted, _ = Task.objects.filter(
+        status=Task.STATUS_DONE,
+        finished_at__lt=timezone.now()
+        - datetime.timedelta(seconds=settings.TASK_RETENTION),
+    ).delete()
+    return deleted
@@ -0,0 +1,19 @@
+from django.conf import settings
+
+from airport_app.images import process_image_field
+from airport_app.seat_holds import schedule_hold_sweep, sweep_expired_holds
+from airport_app.task_queue import task
+
+
+@task("process_image")
+def process_image(model_label, pk, field_name, name):
+    """Build the resized variants of an uploaded image"""
+    process_image_field(model_label, pk, field_name, name)
+
+
+@task("sweep_seat_holds")
+def sweep_seat_holds():
+    """Delete expired seat holds, queueing the next sweep first so a failing
+    sweep does not end the series"""
+    schedule_hold_sweep(delay=settings.SEAT_HOLD_SWEEP_INTERVAL)
+    sweep_expired_holds()
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.urls import reverse
+
+from airport_app.models import (
+    Airplane,
+    Airport,
+    City,
+    Country,
+    Flight,
+    Route,
+)
+
+AIRPLANE_URL = reverse("airport_app:airplane-list")
+ASYNC_FLIGHT_URL = reverse("airport_app:flight-list-async")
+COUNTRY_URL = reverse("airport_app:country-list")
+FLIGHT_URL = reverse("airport_app:flight-list")
+ORDER_URL = reverse("airport_app:order-list")
+
+
+def allocate_url(flight_id):
+    return reverse("airport_app:flight-allocate", args=[flight_id])
+
+
+def sample_flight(**params):
+    country = Country.objects.create(name=f"Country {Country.objects.count()}")
+    city_1 = City.objects.create(name="City 1", country=country)
+    city_2 = City.objects.create(name="City 2", country=country)
+    route = Route.objects.create(
+        source=Airport.objects.create(
+            name=f"{country.name} Airport 1", city=city_1, country=country
+        ),
+        destination=Airport.objects.create(
+            name=f"{country.name} Airport 2", city=city_2, country=country
+        ),
+    )
+    airplane = Airplane.objects.create(name="Airplane", rows=10, seats_in_row=6)
+
+    defaults = {
+        "route": route,
+        "airplane": airplane,
+        "departure_time": "2024-04-05T11:00:00Z",
+        "arrival_time": "2024-04-05T14:10:00Z",
+    }
+    defaults.update(params)
+
+    return Flight.objects.create(**defaults)
+
+
+def throttle_rates(**rates):
+    """REST_FRAMEWORK settings with the given throttle rates overridden"""
+    return {
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": {
+            **settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"],
+            **rates,
+        },
+    }
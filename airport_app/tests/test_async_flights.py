@@ -0,0 +1,108 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport_app.models import Airplane, Crew
+from airport_app.tests.helpers import (
+    ASYNC_FLIGHT_URL,
+    FLIGHT_URL,
+    sample_flight,
+    throttle_rates,
+)
+
+
+class AsyncFlightListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "pass1999199",
+        )
+        for day in range(1, 13):
+            flight = sample_flight(
+                departure_time=f"2024-04-{day:02}T11:00:00Z",
+                arrival_time=f"2024-04-{day:02}T14:00:00Z",
+            )
+            flight.crew.add(
+                Crew.objects.create(first_name=f"Pilot {day}", last_name="One"),
+                Crew.objects.create(first_name=f"Pilot {day}", last_name="Two"),
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client.defaults["HTTP_AUTHORIZATION"] = (
+            f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        self.api_client = APIClient()
+        self.api_client.force_authenticate(self.user)
+
+    def test_same_body_as_sync_list(self):
+        for params in ({}, {"page": 2}, {"date": "2024-04-03"}):
+            with self.subTest(params=params):
+                res = self.client.get(ASYNC_FLIGHT_URL, params)
+                sync_res = self.api_client.get(FLIGHT_URL, params)
+
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                sync_body = sync_res.json()
+                for link in ("next", "previous"):
+                    if sync_body[link]:
+                        sync_body[link] = sync_body[link].replace(
+                            FLIGHT_URL, ASYNC_FLIGHT_URL
+                        )
+                self.assertEqual(res.json(), sync_body)
+
+    def test_cargo_airplane(self):
+        sample_flight(
+            airplane=Airplane.objects.create(name="Cargo", rows=0, seats_in_row=0),
+            departure_time="2024-05-01T11:00:00Z",
+        )
+        params = {"date": "2024-05-01"}
+
+        res = self.client.get(ASYNC_FLIGHT_URL, params)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["results"][0]["airplane_capacity"], 0)
+        self.assertEqual(res.json(), self.api_client.get(FLIGHT_URL, params).json())
+
+    def test_cursor_pages(self):
+        res = self.client.get(ASYNC_FLIGHT_URL, {"cursor": ""})
+        self.assertEqual(len(res.json()["results"]), 10)
+
+        res = self.client.get(res.json()["next"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.json()["results"]), 2)
+        self.assertIsNone(res.json()["next"])
+
+    def test_invalid_params(self):
+        for params, status_code in (
+            ({"date": "04/05/2024"}, status.HTTP_400_BAD_REQUEST),
+            ({"routes": "one"}, status.HTTP_400_BAD_REQUEST),
+            ({"page": 5}, status.HTTP_404_NOT_FOUND),
+            ({"cursor": "not-a-cursor"}, status.HTTP_404_NOT_FOUND),
+        ):
+            with self.subTest(params=params):
+                res = self.client.get(ASYNC_FLIGHT_URL, params)
+                self.assertEqual(res.status_code, status_code)
+
+    def test_auth_required(self):
+        del self.client.defaults["HTTP_AUTHORIZATION"]
+        self.assertEqual(
+            self.client.get(ASYNC_FLIGHT_URL).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+        res = self.client.get(ASYNC_FLIGHT_URL, HTTP_AUTHORIZATION="Bearer invalid")
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(flight_list="2/min"))
+    def test_shares_flight_list_throttle(self):
+        self.assertEqual(self.api_client.get(FLIGHT_URL).status_code, 200)
+        self.assertEqual(self.client.get(ASYNC_FLIGHT_URL).status_code, 200)
+
+        res = self.client.get(ASYNC_FLIGHT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", res)
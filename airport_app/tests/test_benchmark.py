@@ -0,0 +1,57 @@
+from django.test import TestCase, tag
+
+from airport_app.benchmark import run_benchmark, seed_dataset
+from airport_app.models import Flight, RouteDailyStats, SearchEntry, Ticket
+
+
+@tag("benchmark")
+class BenchmarkTests(TestCase):
+    """Run with `manage.py test --tag benchmark` or skip with `--exclude-tag`"""
+
+    def test_seed_dataset(self):
+        dataset = seed_dataset(
+            airports=10, routes=20, flights=5, tickets=200, batch_size=50
+        )
+
+        self.assertEqual(dataset["tickets"], 200)
+        self.assertEqual(Ticket.objects.count(), 200)
+        self.assertEqual(
+            sum(Flight.objects.values_list("tickets_sold", flat=True)), 200
+        )
+        self.assertEqual(
+            SearchEntry.objects.filter(kind=SearchEntry.KIND_AIRPORT)
+            .values("object_id")
+            .distinct()
+            .count(),
+            10,
+        )
+        self.assertEqual(
+            sum(RouteDailyStats.objects.values_list("tickets_sold", flat=True)), 200
+        )
+
+    def test_seed_dataset_airplanes_and_crew(self):
+        dataset = seed_dataset(
+            airports=10, routes=20, flights=5, tickets=0, airplanes=2, crew=3
+        )
+
+        self.assertEqual(dataset["airplanes"], 2)
+        self.assertEqual(dataset["crew"], 3)
+        self.assertLessEqual(
+            Flight.objects.values("airplane").distinct().count(), 2
+        )
+
+    def test_seed_dataset_too_many_tickets(self):
+        with self.assertRaises(ValueError):
+            seed_dataset(airports=10, routes=20, flights=1, tickets=1000)
+
+    def test_run_benchmark(self):
+        seed_dataset(airports=10, routes=20, flights=5, tickets=200, batch_size=50)
+
+        results = run_benchmark(repeat=2)
+
+        flight_list = results["flight-list"]
+        self.assertEqual(flight_list["status"], 200)
+        self.assertEqual(flight_list["queries"], 3)
+        self.assertGreater(flight_list["bytes"], 0)
+        self.assertLessEqual(flight_list["p50_ms"], flight_list["p95_ms"])
+        self.assertIn("flight-seats", results)
@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_app.models import Country
+from airport_app.tests.helpers import COUNTRY_URL
+
+
+class ReferenceDataCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "pass1999199",
+        )
+        self.client.force_authenticate(self.user)
+        Country.objects.create(name="Ukraine")
+
+    def test_cached_response_runs_no_queries(self):
+        first = self.client.get(COUNTRY_URL)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(COUNTRY_URL)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first["ETag"], second["ETag"])
+
+    def test_not_modified_on_matching_etag(self):
+        etag = self.client.get(COUNTRY_URL)["ETag"]
+
+        res = self.client.get(COUNTRY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+
+    def test_write_invalidates_cached_response(self):
+        etag = self.client.get(COUNTRY_URL)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Country.objects.create(name="Italy")
+        res = self.client.get(COUNTRY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 2)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_anonymous_request_is_not_served_from_cache(self):
+        self.client.get(COUNTRY_URL)
+        self.client.force_authenticate(None)
+
+        res = self.client.get(COUNTRY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
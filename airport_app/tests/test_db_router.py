@@ -0,0 +1,112 @@
+import random
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_app.db_router import ReplicaRouter, _replica_reads, replica_reads
+from airport_app.models import Flight
+from airport_app.tests.helpers import COUNTRY_URL, FLIGHT_URL, ORDER_URL, sample_flight
+from airport_app.views import FlightViewSet
+
+
+@override_settings(READ_REPLICAS=["replica_0", "replica_1"])
+class ReplicaRouterTests(SimpleTestCase):
+    def test_reads_go_to_replicas_inside_replica_reads(self):
+        router = ReplicaRouter()
+
+        self.assertEqual(router.db_for_read(Flight), "default")
+        with replica_reads():
+            self.assertIn(router.db_for_read(Flight), ("replica_0", "replica_1"))
+            self.assertEqual(router.db_for_write(Flight), "default")
+            with replica_reads(False):
+                self.assertEqual(router.db_for_read(Flight), "default")
+        self.assertEqual(router.db_for_read(Flight), "default")
+
+    @override_settings(READ_REPLICAS=[])
+    def test_without_replicas(self):
+        with replica_reads():
+            self.assertEqual(ReplicaRouter().db_for_read(Flight), "default")
+
+
+# The test database stands in for the replica, replica reads are counted
+@override_settings(READ_REPLICAS=["default"])
+class ReplicaReadMixinTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "pass1999199",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+
+        patcher = mock.patch("airport_app.db_router.random.choice", wraps=random.choice)
+        self.replica_choice = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def replica_reads_of(self, method, url, **kwargs):
+        self.replica_choice.reset_mock()
+        response = getattr(self.client, method)(url, **kwargs)
+        self.assertLess(response.status_code, 400)
+        return self.replica_choice.call_count
+
+    def test_reads_after_own_order_stay_on_primary(self):
+        self.assertGreater(self.replica_reads_of("get", FLIGHT_URL), 0)
+
+        order_payload = {
+            "order_tickets": [{"flight": self.flight.id, "row": 1, "seat": 1}]
+        }
+        self.assertEqual(
+            self.replica_reads_of("post", ORDER_URL, data=order_payload, format="json"),
+            0,
+        )
+        self.assertEqual(self.replica_reads_of("get", ORDER_URL), 0)
+        self.assertEqual(self.replica_reads_of("get", FLIGHT_URL), 0)
+
+        # Other users are not pinned
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("other@test.com", "pass1999199")
+        )
+        self.assertGreater(self.replica_reads_of("get", FLIGHT_URL), 0)
+
+    def test_streamed_export_reads_from_replica(self):
+        self.user.is_staff = True
+        self.user.save()
+        replica_flags = []
+
+        def db_for_read(router, model, **hints):
+            if model is Flight:
+                replica_flags.append(_replica_reads.get())
+            return "default"
+
+        with mock.patch.object(
+            ReplicaRouter, "db_for_read", autospec=True, side_effect=db_for_read
+        ):
+            response = self.client.get(reverse("airport_app:flight-export"))
+            content = b"".join(response.streaming_content).decode()
+
+        self.assertEqual(len(content.splitlines()), 2)
+        self.assertTrue(replica_flags)
+        self.assertTrue(all(replica_flags))
+
+    def test_flag_is_reset_when_the_handler_raises(self):
+        with mock.patch.object(FlightViewSet, "list", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.get(FLIGHT_URL)
+
+        self.assertFalse(_replica_reads.get())
+
+    def test_failed_writes_do_not_pin(self):
+        response = self.client.post(ORDER_URL, {"order_tickets": []}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertGreater(self.replica_reads_of("get", FLIGHT_URL), 0)
+
+    def test_cached_reference_data_reads_from_primary(self):
+        self.assertEqual(self.replica_reads_of("get", COUNTRY_URL), 0)
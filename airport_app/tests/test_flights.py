@@ -0,0 +1,258 @@
+import base64
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_app.models import Flight, Order, Ticket
+from airport_app.tests.helpers import FLIGHT_URL, ORDER_URL, sample_flight
+
+
+def seat_map_url(flight_id):
+    return reverse("airport_app:flight-seats", args=[flight_id])
+
+
+class FlightSeatMapApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "pass1999199",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+        self.order = Order.objects.create(user=self.user)
+
+    def test_seat_map_bitmap(self):
+        Ticket.objects.create(flight=self.flight, order=self.order, row=1, seat=1)
+        Ticket.objects.create(flight=self.flight, order=self.order, row=2, seat=5)
+
+        res = self.client.get(seat_map_url(self.flight.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["taken"], 2)
+        self.assertEqual(res.data["available"], 58)
+        bitmap = base64.b64decode(res.data["bitmap"])
+        self.assertEqual(len(bitmap), 8)
+        self.assertEqual(bitmap[0], 0b10000000)
+        self.assertEqual(bitmap[1], 0b00100000)
+
+    def test_seat_map_is_cached(self):
+        self.client.get(seat_map_url(self.flight.id))
+
+        with self.assertNumQueries(0):
+            res = self.client.get(seat_map_url(self.flight.id))
+
+        self.assertEqual(res.data["taken"], 0)
+
+    def test_seat_map_is_invalidated_by_new_order(self):
+        self.client.get(seat_map_url(self.flight.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                ORDER_URL,
+                {"order_tickets": [{"flight": self.flight.id, "row": 1, "seat": 1}]},
+                format="json",
+            )
+        res = self.client.get(seat_map_url(self.flight.id))
+
+        self.assertEqual(res.data["taken"], 1)
+
+    def test_seat_map_of_unknown_flight(self):
+        res = self.client.get(seat_map_url(self.flight.id + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class FlightTicketsSoldTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "pass1999199",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+
+    def test_order_updates_tickets_available(self):
+        self.client.post(
+            ORDER_URL,
+            {
+                "order_tickets": [
+                    {"flight": self.flight.id, "row": 1, "seat": seat}
+                    for seat in (1, 2, 3)
+                ]
+            },
+            format="json",
+        )
+
+        res = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(res.data["results"][0]["tickets_available"], 57)
+
+    def test_deleted_tickets_are_subtracted(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=1)
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=2)
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.tickets_sold, 2)
+
+        order.delete()
+        self.flight.refresh_from_db()
+
+        self.assertEqual(self.flight.tickets_sold, 0)
+
+    def test_reconcile_tickets_sold(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=1)
+        Flight.objects.filter(id=self.flight.id).update(tickets_sold=42)
+
+        stdout = io.StringIO()
+        call_command("reconcile_tickets_sold", stdout=stdout)
+        self.flight.refresh_from_db()
+
+        self.assertEqual(self.flight.tickets_sold, 1)
+        self.assertIn("Reconciled tickets_sold of 1 flights", stdout.getvalue())
+
+
+class FlightKeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "pass1999199",
+        )
+        self.client.force_authenticate(self.user)
+        first = sample_flight(departure_time="2024-04-05T11:00:00Z")
+        self.flights = [first] + [
+            sample_flight(
+                route=first.route,
+                airplane=first.airplane,
+                departure_time=f"2024-04-{day:02d}T11:00:00Z",
+            )
+            for day in (3, 5, 5, 1, 9, 5, 2, 7, 8, 4, 6)
+        ]
+
+    def test_cursor_pages_follow_departure_time(self):
+        ids = []
+        url = f"{FLIGHT_URL}?cursor="
+        while url:
+            with self.assertNumQueries(2):
+                res = self.client.get(url)
+            self.assertNotIn("count", res.data)
+            ids += [flight["id"] for flight in res.data["results"]]
+            url = res.data["next"]
+
+        expected = sorted(Flight.objects.values_list("departure_time", "id"))
+        self.assertEqual(ids, [flight_id for _, flight_id in expected])
+
+    def test_page_number_pagination_is_default(self):
+        res = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(res.data["count"], len(self.flights))
+
+    def test_invalid_cursor(self):
+        res = self.client.get(FLIGHT_URL, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class FlightDateFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "pass1999199",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_filter_by_date_is_half_open(self):
+        midnight = sample_flight(departure_time="2024-04-05T00:00:00Z")
+        late = sample_flight(departure_time="2024-04-05T23:59:59Z")
+        sample_flight(departure_time="2024-04-06T00:00:00Z")
+        sample_flight(departure_time="2024-04-04T23:59:59Z")
+
+        res = self.client.get(FLIGHT_URL, {"date": "2024-04-05"})
+
+        self.assertEqual(
+            sorted(flight["id"] for flight in res.data["results"]),
+            [midnight.id, late.id],
+        )
+
+    def test_filter_by_invalid_date(self):
+        res = self.client.get(FLIGHT_URL, {"date": "05.04.2024"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FlightExportApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@admin.com", "admin_19", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        self.flight = sample_flight()
+        order = Order.objects.create(user=self.admin)
+        Ticket.objects.create(flight=self.flight, order=order, row=2, seat=1)
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=3)
+
+    def read_streaming(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_flights_csv(self):
+        res = self.client.get(reverse("airport_app:flight-export"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "text/csv")
+        lines = self.read_streaming(res).splitlines()
+        self.assertEqual(lines[0].split(",")[:3], ["id", "source", "destination"])
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].endswith(",60,58"))
+
+    def test_export_manifest_ndjson(self):
+        res = self.client.get(
+            reverse("airport_app:flight-manifest", args=[self.flight.id]),
+            {"export_format": "ndjson"},
+        )
+
+        rows = [json.loads(line) for line in self.read_streaming(res).splitlines()]
+        self.assertEqual([(row["row"], row["seat"]) for row in rows], [(1, 3), (2, 1)])
+        self.assertEqual(rows[0]["email"], "admin@admin.com")
+
+    def test_export_manifest_csv_escapes_formulas(self):
+        self.admin.first_name = "=HYPERLINK(1)"
+        self.admin.last_name = "-2+3"
+        self.admin.save()
+
+        res = self.client.get(
+            reverse("airport_app:flight-manifest", args=[self.flight.id])
+        )
+
+        content = self.read_streaming(res)
+        self.assertIn("'=HYPERLINK(1)", content)
+        self.assertIn("'-2+3", content)
+        self.assertNotIn(",=HYPERLINK", content)
+
+    def test_export_unknown_format(self):
+        res = self.client.get(
+            reverse("airport_app:flight-export"), {"export_format": "xml"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_forbidden_for_users(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("test@test.com", "pass1999199")
+        )
+
+        res = self.client.get(reverse("airport_app:flight-export"))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
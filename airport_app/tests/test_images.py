@@ -0,0 +1,119 @@
+import io
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_app.images import process_image_field
+from airport_app.task_queue import run_pending
+from airport_app.tests.helpers import AIRPLANE_URL, sample_flight
+from airport_app.views import media
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_file(size=(2000, 1000), name="airplane.png"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "navy").save(buffer, format="PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class AirplaneImagePipelineTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser("admin@test.com", "pass1999199")
+        )
+        self.flight = sample_flight()
+        self.airplane = self.flight.airplane
+
+    def upload(self, file):
+        response = self.client.post(
+            reverse("airport_app:airplane-upload-image", args=[self.airplane.id]),
+            {"airplane_image": file},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(run_pending(), 1)
+        self.airplane.refresh_from_db()
+        return response
+
+    def test_upload_builds_hashed_variants(self):
+        response = self.upload(image_file())
+
+        # Variants are built after the response, it has none yet
+        self.assertEqual(response.data["airplane_image_variants"], {})
+        variants = self.airplane.airplane_image_variants
+        self.assertEqual(
+            (variants["thumbnail"]["width"], variants["thumbnail"]["height"]),
+            (320, 160),
+        )
+        self.assertEqual(
+            (variants["medium"]["width"], variants["medium"]["height"]),
+            (1024, 512),
+        )
+        for files in variants.values():
+            for image_format, extension in (("webp", ".webp"), ("jpeg", ".jpg")):
+                self.assertTrue(files[image_format].endswith(extension))
+                path = os.path.join(MEDIA_ROOT, files[image_format])
+                with Image.open(path) as image:
+                    self.assertEqual(image.size, (files["width"], files["height"]))
+
+        # Small originals are not scaled up
+        self.upload(image_file(size=(100, 50)))
+        self.assertEqual(self.airplane.airplane_image_variants["medium"]["width"], 100)
+
+    def test_variant_urls_in_lists(self):
+        self.upload(image_file())
+
+        airplanes = self.client.get(AIRPLANE_URL).data["results"]
+        flight = self.client.get(
+            reverse("airport_app:flight-detail", args=[self.flight.id])
+        ).data
+
+        thumbnail = airplanes[0]["airplane_image_variants"]["thumbnail"]
+        self.assertTrue(thumbnail["webp"].startswith("http://testserver/media/"))
+        self.assertEqual(
+            flight["airplane"]["airplane_image_variants"]["thumbnail"], thumbnail
+        )
+        self.assertEqual(flight["airplane_image"], airplanes[0]["airplane_image"])
+
+    def test_replaced_image_keeps_its_own_variants(self):
+        self.upload(image_file())
+        old_name = self.airplane.airplane_image.name
+        self.upload(image_file(size=(640, 640)))
+
+        process_image_field(
+            "airport_app.Airplane", self.airplane.id, "airplane_image", old_name
+        )
+
+        self.airplane.refresh_from_db()
+        variants = self.airplane.airplane_image_variants
+        self.assertEqual(variants["thumbnail"]["height"], 320)
+
+    def test_media_cache_headers(self):
+        self.upload(image_file())
+        variant = self.airplane.airplane_image_variants["thumbnail"]["webp"]
+        request = RequestFactory().get("/")
+
+        self.assertEqual(
+            media(request, variant)["Cache-Control"],
+            "public, max-age=31536000, immutable",
+        )
+        self.assertEqual(
+            media(request, self.airplane.airplane_image.name)["Cache-Control"],
+            "public, max-age=3600",
+        )
@@ -0,0 +1,141 @@
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from airport_app.models import Airplane, Airport, City, Country, Crew, Flight, Route
+
+
+class ImportScheduleCommandTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, filename, content):
+        path = os.path.join(self.tmp_dir.name, filename)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def import_schedule(self, *args):
+        out = io.StringIO()
+        call_command("import_schedule", *args, stdout=out, stderr=io.StringIO())
+        return out.getvalue()
+
+    def import_reference_data(self):
+        self.import_schedule(
+            "airports",
+            self.write(
+                "airports.csv",
+                "name,city,country\n"
+                "Boryspil,Kyiv,Ukraine\n"
+                "Chopin,Warsaw,Poland\n"
+                "Modlin,Warsaw,Poland\n",
+            ),
+        )
+        self.import_schedule(
+            "routes",
+            self.write(
+                "routes.csv",
+                "source,destination,distance\n"
+                "Boryspil,Chopin,690\n"
+                "Chopin,Boryspil,690\n",
+            ),
+        )
+        self.import_schedule(
+            "airplanes",
+            self.write(
+                "airplanes.csv",
+                "name,airplane_type,rows,seats_in_row\nSP-LWA,Embraer,20,4\n",
+            ),
+        )
+        self.import_schedule(
+            "crew",
+            self.write(
+                "crew.csv", "first_name,last_name\nAnna,Kowalska\nIvan,Petrenko\n"
+            ),
+        )
+
+    def flights_file(self, arrival_time):
+        flight = {
+            "source": "Boryspil",
+            "destination": "Chopin",
+            "airplane": "SP-LWA",
+            "departure_time": "2024-05-01T06:00:00Z",
+            "arrival_time": arrival_time,
+            "crew": "Anna Kowalska;Ivan Petrenko",
+        }
+        return self.write("flights.ndjson", json.dumps(flight) + "\n")
+
+    def test_import_reference_data(self):
+        self.import_reference_data()
+
+        self.assertEqual(Country.objects.count(), 2)
+        self.assertEqual(City.objects.count(), 2)
+        self.assertEqual(Airport.objects.count(), 3)
+        self.assertEqual(Route.objects.count(), 2)
+        self.assertEqual(Airplane.objects.get().airplane_type.name, "Embraer")
+        self.assertEqual(Crew.objects.count(), 2)
+
+    def test_import_flights_and_upsert(self):
+        self.import_reference_data()
+
+        output = self.import_schedule(
+            "flights", self.flights_file("2024-05-01T07:30:00Z")
+        )
+        self.assertIn("1 created", output)
+        self.assertEqual(Flight.objects.get().crew.count(), 2)
+
+        output = self.import_schedule(
+            "flights", self.flights_file("2024-05-01T08:00:00Z")
+        )
+        self.assertIn("1 skipped", output)
+
+        output = self.import_schedule(
+            "flights", self.flights_file("2024-05-01T08:00:00Z"), "--update"
+        )
+        self.assertIn("1 updated", output)
+        flight = Flight.objects.get()
+        self.assertEqual(flight.arrival_time.hour, 8)
+        self.assertEqual(flight.crew.count(), 2)
+
+    def test_import_large_flight_batch(self):
+        self.import_reference_data()
+        flights = [
+            {
+                "source": "Boryspil",
+                "destination": "Chopin",
+                "airplane": "SP-LWA",
+                "departure_time": f"2024-05-01T{hour:02d}:{minute:02d}:00Z",
+                "arrival_time": "2024-05-02T07:30:00Z",
+            }
+            for hour in range(24)
+            for minute in range(60)
+        ]
+        path = self.write(
+            "flights.ndjson", "".join(json.dumps(flight) + "\n" for flight in flights)
+        )
+
+        self.assertIn("1440 created", self.import_schedule("flights", path))
+        self.assertIn("1440 skipped", self.import_schedule("flights", path))
+
+    def test_unknown_references_are_skipped(self):
+        self.import_reference_data()
+
+        output = self.import_schedule(
+            "routes",
+            self.write(
+                "routes.csv",
+                "source,destination,distance\n"
+                "Boryspil,Nowhere,1\n"
+                "Modlin,Boryspil,700\n",
+            ),
+        )
+
+        self.assertIn("1 created", output)
+        self.assertIn("1 skipped", output)
@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_app.models import Airplane, Airport, City, Country, Flight, Route
+
+ITINERARY_URL = reverse("airport_app:flight-itineraries")
+
+
+class ItinerarySearchApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "pass1999199",
+        )
+        self.client.force_authenticate(self.user)
+
+        country = Country.objects.create(name="Country")
+        city = City.objects.create(name="City", country=country)
+        self.airports = {
+            code: Airport.objects.create(name=code, city=city, country=country)
+            for code in ("KBP", "WAW", "FRA", "LIS")
+        }
+        self.airplane = Airplane.objects.create(name="A320", rows=2, seats_in_row=2)
+
+    def route(self, source, destination, distance=1000):
+        return Route.objects.create(
+            source=self.airports[source],
+            destination=self.airports[destination],
+            distance=distance,
+        )
+
+    def flight(self, route, departure, arrival):
+        return Flight.objects.create(
+            route=route,
+            airplane=self.airplane,
+            departure_time=f"2024-05-01T{departure}:00Z",
+            arrival_time=f"2024-05-01T{arrival}:00Z",
+        )
+
+    def search(self, source, destination, **params):
+        return self.client.get(
+            ITINERARY_URL,
+            {
+                "source": self.airports[source].id,
+                "destination": self.airports[destination].id,
+                "date": "2024-05-01",
+                **params,
+            },
+        )
+
+    def test_direct_and_connecting_itineraries(self):
+        kbp_waw = self.route("KBP", "WAW")
+        waw_lis = self.route("WAW", "LIS", distance=2500)
+        kbp_lis = self.route("KBP", "LIS", distance=3500)
+        direct = self.flight(kbp_lis, "10:00", "16:00")
+        first_leg = self.flight(kbp_waw, "06:00", "08:00")
+        second_leg = self.flight(waw_lis, "09:30", "12:00")
+        # Too short a connection
+        self.flight(waw_lis, "08:15", "11:00")
+
+        res = self.search("KBP", "LIS")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [[leg["flight"] for leg in itinerary["legs"]] for itinerary in res.data],
+            [[first_leg.id, second_leg.id], [direct.id]],
+        )
+        self.assertEqual(res.data[0]["distance"], 3500)
+        self.assertEqual(res.data[0]["duration_minutes"], 360)
+        self.assertEqual(res.data[0]["legs"][0]["source"], "KBP")
+
+    def test_max_legs_and_limit(self):
+        self.flight(self.route("KBP", "WAW"), "06:00", "07:00")
+        self.flight(self.route("WAW", "FRA"), "08:00", "09:00")
+        self.flight(self.route("FRA", "LIS"), "10:00", "11:00")
+
+        self.assertEqual(len(self.search("KBP", "LIS").data), 1)
+        self.assertEqual(self.search("KBP", "LIS", max_legs=2).data, [])
+
+    def test_sold_out_flights_are_skipped(self):
+        flight = self.flight(self.route("KBP", "LIS"), "06:00", "07:00")
+        Flight.objects.filter(id=flight.id).update(tickets_sold=4)
+
+        self.assertEqual(self.search("KBP", "LIS").data, [])
+
+    def test_invalid_search(self):
+        res = self.search("KBP", "KBP")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
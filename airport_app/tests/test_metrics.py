@@ -0,0 +1,144 @@
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport_app import metrics
+from airport_app.middleware import PerformanceMiddleware, QueryCollector
+from airport_app.models import Country
+from airport_app.tests.helpers import ASYNC_FLIGHT_URL, FLIGHT_URL, sample_flight
+
+METRICS_URL = reverse("metrics")
+
+
+class HistogramTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_render(self):
+        histogram = metrics.Histogram("test", "Test.", ("view",), (1, 10))
+        for value in (0.5, 1, 5, 50):
+            histogram.observe(("a",), value)
+
+        self.assertEqual(
+            histogram.render(),
+            [
+                "# HELP test Test.",
+                "# TYPE test histogram",
+                'test_bucket{view="a",le="1"} 2',
+                'test_bucket{view="a",le="10"} 3',
+                'test_bucket{view="a",le="+Inf"} 4',
+                'test_sum{view="a"} 56.5',
+                'test_count{view="a"} 4',
+            ],
+        )
+
+    def test_render_totals_of_all_processes(self):
+        # Two instances of one metric stand in for two worker processes
+        process_1 = metrics.Histogram("test", "Test.", ("view",), (1,))
+        process_2 = metrics.Histogram("test", "Test.", ("view",), (1,))
+        process_1.observe(("a",), 0.5)
+        process_2.observe(("a",), 2)
+        process_2.observe(("b",), 1)
+        process_2.flush()
+
+        self.assertEqual(
+            process_1.render()[2:],
+            [
+                'test_bucket{view="a",le="1"} 1',
+                'test_bucket{view="a",le="+Inf"} 2',
+                'test_sum{view="a"} 2.5',
+                'test_count{view="a"} 2',
+                'test_bucket{view="b",le="1"} 1',
+                'test_bucket{view="b",le="+Inf"} 1',
+                'test_sum{view="b"} 1.0',
+                'test_count{view="b"} 1',
+            ],
+        )
+
+
+class QueryCollectorTests(TestCase):
+    def test_duplicate_queries(self):
+        collector = QueryCollector()
+        with connection.execute_wrapper(collector):
+            for name in ("A", "B", "C"):
+                Country.objects.filter(name=name).exists()
+            Country.objects.count()
+
+        self.assertEqual(collector.count, 4)
+        self.assertEqual(collector.duplicates, 2)
+
+
+@override_settings(
+    MIDDLEWARE=["airport_app.middleware.PerformanceMiddleware", *settings.MIDDLEWARE]
+)
+class PerformanceMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("test@test.com", "pass1999199")
+        )
+        self.admin = get_user_model().objects.create_user(
+            "admin@admin.com", "admin_19", is_staff=True
+        )
+        sample_flight()
+
+    def test_server_timing_and_metrics(self):
+        res = self.client.get(FLIGHT_URL)
+
+        self.assertRegex(
+            res["Server-Timing"], r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries"'
+        )
+
+        self.client.force_login(self.admin)
+        body = self.client.get(METRICS_URL).content.decode()
+        self.assertIn(
+            'airport_request_queries_count{viewset="FlightViewSet",action="list"}',
+            body,
+        )
+        self.assertIn(
+            'airport_response_size_bytes_bucket{viewset="FlightViewSet",'
+            'action="list",le="+Inf"}',
+            body,
+        )
+
+    async def test_async_request(self):
+        user = await get_user_model().objects.aget(email="test@test.com")
+        res = await self.async_client.get(
+            ASYNC_FLIGHT_URL,
+            headers={"Authorization": f"Bearer {AccessToken.for_user(user)}"},
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertRegex(res["Server-Timing"], r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+    def test_runs_in_the_mode_of_the_next_handler(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        self.assertTrue(iscoroutinefunction(PerformanceMiddleware(get_response)))
+        self.assertFalse(iscoroutinefunction(PerformanceMiddleware(HttpResponse)))
+
+    def test_metrics_for_staff_only_without_token(self):
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 401)
+        self.assertEqual(
+            self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer ").status_code,
+            401,
+        )
+
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 200)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 401)
+
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(res.status_code, 200)
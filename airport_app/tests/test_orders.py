@@ -0,0 +1,150 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_app.models import Order, Ticket
+from airport_app.tests.helpers import ORDER_URL, sample_flight
+
+
+class OrderCreateApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "pass1999199",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+
+    def order_payload(self, seats, flight=None):
+        flight = flight or self.flight
+        return {
+            "order_tickets": [
+                {"flight": flight.id, "row": row, "seat": seat} for row, seat in seats
+            ]
+        }
+
+    def test_create_order(self):
+        res = self.client.post(
+            ORDER_URL, self.order_payload([(1, 1), (1, 2)]), format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get(id=res.data["id"])
+        self.assertEqual(order.user, self.user)
+        self.assertEqual(order.order_tickets.count(), 2)
+
+    def test_create_order_queries_do_not_grow_with_tickets(self):
+        with CaptureQueriesContext(connection) as single:
+            self.client.post(ORDER_URL, self.order_payload([(1, 1)]), format="json")
+
+        other_flight = sample_flight()
+        seats = [(2, seat) for seat in range(1, 7)]
+        payload = self.order_payload(seats)
+        payload["order_tickets"] += self.order_payload(seats, other_flight)[
+            "order_tickets"
+        ]
+        with CaptureQueriesContext(connection) as group:
+            res = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(group), len(single))
+
+    def test_taken_seat_is_reported_per_ticket(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=2)
+
+        res = self.client.post(
+            ORDER_URL, self.order_payload([(1, 1), (1, 2)]), format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["order_tickets"][0], {})
+        self.assertIn("seat", res.data["order_tickets"][1])
+
+    def test_taken_seats_of_a_large_order(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=2)
+        Ticket.objects.create(flight=self.flight, order=order, row=2, seat=1)
+        seats = [
+            (self.flight.id, row, seat)
+            for row in range(1, 51)
+            for seat in range(1, 31)
+        ]
+
+        self.assertEqual(
+            Ticket.taken_seats(seats),
+            {(self.flight.id, 1, 2), (self.flight.id, 2, 1)},
+        )
+        self.assertEqual(Ticket.taken_seats([(self.flight.id, 2, 2)]), set())
+
+    def test_duplicated_seat_in_order(self):
+        res = self.client.post(
+            ORDER_URL, self.order_payload([(1, 1), (1, 1)]), format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seat", res.data["order_tickets"][1])
+
+    def test_seat_out_of_airplane_range(self):
+        res = self.client.post(
+            ORDER_URL, self.order_payload([(11, 1)]), format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("row", res.data["order_tickets"][0])
+        self.assertFalse(Order.objects.exists())
+
+
+class OrderListApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "pass1999199",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_list_own_orders_with_flights(self):
+        flight = sample_flight()
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(flight=flight, order=order, row=1, seat=1)
+        other_user = get_user_model().objects.create_user(
+            "other@test.com",
+            "pass1999199",
+        )
+        Order.objects.create(user=other_user)
+
+        res = self.client.get(ORDER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 1)
+        ticket = res.data["results"][0]["order_tickets"][0]
+        self.assertEqual((ticket["row"], ticket["seat"]), (1, 1))
+        self.assertEqual(ticket["flight"]["id"], flight.id)
+        self.assertEqual(
+            ticket["flight"]["route"]["source"],
+            "City 1, Country 0 - 'Country 0 Airport 1'",
+        )
+        self.assertEqual(ticket["flight"]["airplane_name"], "Airplane")
+
+    def test_list_queries_do_not_grow_with_orders(self):
+        for _ in range(2):
+            flight = sample_flight()
+            order = Order.objects.create(user=self.user)
+            Ticket.objects.create(flight=flight, order=order, row=1, seat=1)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(ORDER_URL)
+
+        for _ in range(5):
+            flight = sample_flight()
+            order = Order.objects.create(user=self.user)
+            for seat in (1, 2, 3):
+                Ticket.objects.create(flight=flight, order=order, row=1, seat=seat)
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(ORDER_URL)
+
+        self.assertEqual(len(many), len(few))
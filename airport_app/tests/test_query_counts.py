@@ -0,0 +1,109 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport_app.models import AirplaneType, Crew, Order, SeatHold, Ticket
+from airport_app.reporting import rebuild_route_daily_stats
+from airport_app.tests.helpers import sample_flight
+from airport_app.urls import router
+
+# Maximal number of SQL queries per (basename, action), it must not depend
+# on the amount of rows, so the fixture below creates several of each.
+QUERY_BUDGETS = {
+    ("country", "list"): 2,
+    ("country", "retrieve"): 2,
+    ("city", "list"): 2,
+    ("city", "retrieve"): 1,
+    ("airport", "list"): 2,
+    ("airport", "retrieve"): 1,
+    ("route", "list"): 2,
+    ("route", "retrieve"): 1,
+    ("airplanetype", "list"): 1,
+    ("airplanetype", "retrieve"): 1,
+    ("airplane", "list"): 3,
+    ("airplane", "retrieve"): 2,
+    ("crew", "list"): 2,
+    ("crew", "retrieve"): 1,
+    ("flight", "list"): 3,
+    ("flight", "retrieve"): 2,
+    ("seathold", "list"): 2,
+    ("seathold", "retrieve"): 1,
+    ("order", "list"): 3,
+    ("order", "retrieve"): 2,
+    ("routedailystats", "list"): 2,
+    ("routedailystats", "retrieve"): 1,
+}
+# Viewsets only staff can read
+STAFF_BASENAMES = {"routedailystats"}
+
+FLIGHTS_COUNT = 5
+
+
+class QueryCountBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "pass1999199",
+        )
+        airplane_type = AirplaneType.objects.create(name="Airplane Type")
+        for index in range(FLIGHTS_COUNT):
+            flight = sample_flight()
+            flight.airplane.airplane_type = airplane_type
+            flight.airplane.save()
+            flight.crew.add(
+                Crew.objects.create(first_name=f"Pilot {index}", last_name="One"),
+                Crew.objects.create(first_name=f"Pilot {index}", last_name="Two"),
+            )
+            SeatHold.objects.create(
+                flight=flight,
+                row=1,
+                seat=1,
+                user=cls.user,
+                expires_at=timezone.now() + datetime.timedelta(hours=1),
+            )
+            order = Order.objects.create(user=cls.user)
+            for seat in (2, 3):
+                Ticket.objects.create(flight=flight, order=order, row=1, seat=seat)
+        rebuild_route_daily_stats()
+        cls.staff_user = get_user_model().objects.create_user(
+            "staff@test.com",
+            "pass1999199",
+            is_staff=True,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_every_list_and_retrieve_action_has_a_budget(self):
+        for _, viewset, basename in router.registry:
+            for action in ("list", "retrieve"):
+                self.assertIn((basename, action), QUERY_BUDGETS)
+
+    def test_query_budgets(self):
+        for (basename, action), budget in QUERY_BUDGETS.items():
+            viewset = next(
+                viewset
+                for _, viewset, registered in router.registry
+                if registered == basename
+            )
+            if action == "list":
+                url = reverse(f"airport_app:{basename}-list")
+            else:
+                instance = viewset.queryset.model.objects.first()
+                url = reverse(f"airport_app:{basename}-detail", args=[instance.id])
+
+            self.client.force_authenticate(
+                self.staff_user if basename in STAFF_BASENAMES else self.user
+            )
+            with self.subTest(basename=basename, action=action):
+                with self.assertNumQueries(budget):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
@@ -0,0 +1,215 @@
+import datetime
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_app.models import (
+    Flight,
+    Order,
+    RouteDailyStats,
+    RouteStatsChange,
+    Task,
+    Ticket,
+)
+from airport_app.reporting import (
+    rebuild_route_daily_stats,
+    refresh_route_daily_stats,
+)
+from airport_app.tests.helpers import ORDER_URL, allocate_url, sample_flight
+
+ROUTE_STATS_URL = reverse("airport_app:routedailystats-list")
+ROUTE_STATS_TOTALS_URL = reverse("airport_app:routedailystats-totals")
+
+DAY = datetime.date(2024, 4, 5)
+
+
+class RouteDailyStatsRefreshTests(TestCase):
+    def setUp(self):
+        self.flight = sample_flight()
+        self.route = self.flight.route
+        self.order = Order.objects.create(
+            user=get_user_model().objects.create_user("test@test.com", "pass1999199")
+        )
+
+    def stats(self):
+        return list(
+            RouteDailyStats.objects.values_list(
+                "route_id", "date", "flights", "capacity", "tickets_sold"
+            )
+        )
+
+    def test_refresh_follows_flight_and_ticket_changes(self):
+        sample_flight(
+            route=self.route,
+            airplane=self.flight.airplane,
+            departure_time="2024-04-05T18:00:00Z",
+            arrival_time="2024-04-05T20:00:00Z",
+        )
+        for seat in (1, 2):
+            Ticket.objects.create(
+                flight=self.flight, order=self.order, row=1, seat=seat
+            )
+
+        self.assertEqual(refresh_route_daily_stats(), 1)
+        self.assertEqual(self.stats(), [(self.route.id, DAY, 2, 120, 2)])
+        self.assertFalse(RouteStatsChange.objects.exists())
+
+        # Moved to the next day, the old day keeps the other flight only
+        self.flight.refresh_from_db()
+        self.flight.departure_time = "2024-04-06T11:00:00Z"
+        self.flight.save()
+        self.assertEqual(refresh_route_daily_stats(), 2)
+        self.assertEqual(
+            self.stats(),
+            [
+                (self.route.id, DAY, 1, 60, 0),
+                (self.route.id, DAY + datetime.timedelta(days=1), 1, 60, 2),
+            ],
+        )
+
+        self.flight.airplane.rows = 5
+        self.flight.airplane.save()
+        self.flight.delete()
+        refresh_route_daily_stats()
+        self.assertEqual(self.stats(), [(self.route.id, DAY, 1, 30, 0)])
+
+    def test_orders_log_their_route_days(self):
+        client = APIClient()
+        client.force_authenticate(self.order.user)
+        RouteStatsChange.objects.all().delete()
+
+        response = client.post(
+            ORDER_URL,
+            {"order_tickets": [{"flight": self.flight.id, "row": 1, "seat": 1}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = client.post(
+            allocate_url(self.flight.id),
+            {"count": 2},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(
+            list(RouteStatsChange.objects.values_list("route_id", "date")),
+            [(self.route.id, DAY)] * 2,
+        )
+        self.assertFalse(Task.objects.exists())
+
+    def test_refresh_in_batches(self):
+        for day in range(6, 9):
+            sample_flight(
+                departure_time=f"2024-04-0{day}T11:00:00Z",
+                arrival_time=f"2024-04-0{day}T14:00:00Z",
+            )
+
+        self.assertEqual(refresh_route_daily_stats(batch_size=1), 4)
+        self.assertEqual(RouteDailyStats.objects.count(), 4)
+
+    def test_refresh_drops_many_emptied_days(self):
+        days = [DAY + datetime.timedelta(days=offset) for offset in range(1, 1501)]
+        RouteDailyStats.objects.bulk_create(
+            RouteDailyStats(
+                route=self.route, date=day, flights=1, capacity=60, tickets_sold=0
+            )
+            for day in days
+        )
+        RouteStatsChange.objects.bulk_create(
+            RouteStatsChange(route_id=self.route.id, date=day) for day in days
+        )
+
+        refresh_route_daily_stats(batch_size=2000)
+
+        self.assertEqual(self.stats(), [(self.route.id, DAY, 1, 60, 0)])
+
+    def test_reconcile_logs_changes(self):
+        Ticket.objects.create(flight=self.flight, order=self.order, row=1, seat=1)
+        drifted = Flight.objects.filter(id=self.flight.id)
+        drifted.update(tickets_sold=7)
+        RouteStatsChange.log_flights(drifted)
+        refresh_route_daily_stats()
+
+        call_command("reconcile_tickets_sold", stdout=io.StringIO())
+        refresh_route_daily_stats()
+
+        self.assertEqual(self.stats(), [(self.route.id, DAY, 1, 60, 1)])
+
+    def test_rebuild_matches_refresh(self):
+        Ticket.objects.create(flight=self.flight, order=self.order, row=1, seat=1)
+        refresh_route_daily_stats()
+        refreshed = self.stats()
+
+        self.assertEqual(rebuild_route_daily_stats(), 1)
+        self.assertEqual(self.stats(), refreshed)
+
+
+class RouteDailyStatsApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "pass1999199", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+
+        flight = sample_flight()
+        flight.route.distance = 1000
+        flight.route.save()
+        order = Order.objects.create(user=self.user)
+        for seat in (1, 2, 3):
+            Ticket.objects.create(flight=flight, order=order, row=1, seat=seat)
+        sample_flight(
+            route=flight.route,
+            departure_time="2024-04-06T11:00:00Z",
+            arrival_time="2024-04-06T14:00:00Z",
+        )
+        refresh_route_daily_stats()
+        self.route = flight.route
+
+    def test_list_with_filters(self):
+        response = self.client.get(
+            ROUTE_STATS_URL, {"routes": self.route.id, "date_to": "2024-04-05"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        stats = response.data["results"][0]
+        self.assertEqual(stats["load_factor"], 0.05)
+        self.assertEqual(stats["seat_km"], 60_000)
+        self.assertEqual(stats["passenger_km"], 3_000)
+
+    def test_totals(self):
+        response = self.client.get(ROUTE_STATS_TOTALS_URL)
+
+        self.assertEqual(
+            response.data["results"],
+            [
+                {
+                    "route": self.route.id,
+                    "flights": 2,
+                    "capacity": 120,
+                    "tickets_sold": 3,
+                    "load_factor": 0.025,
+                    "passenger_km": 3_000,
+                }
+            ],
+        )
+
+    def test_invalid_filters(self):
+        response = self.client.get(ROUTE_STATS_URL, {"date_from": "05.04.2024"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_staff_only(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("test@test.com", "pass1999199")
+        )
+
+        response = self.client.get(ROUTE_STATS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,139 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_app.models import Airplane, Airport, City, Country, SearchEntry
+from airport_app.search import normalize, rebuild_index, search
+from airport_app.tests.helpers import AIRPLANE_URL
+
+SEARCH_URL = reverse("airport_app:search")
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.uk = Country.objects.create(name="United Kingdom")
+            self.london = City.objects.create(name="London", country=self.uk)
+            self.heathrow = Airport.objects.create(
+                name="Heathrow", city=self.london, country=self.uk
+            )
+            self.city_airport = Airport.objects.create(
+                name="London City Airport", city=self.london, country=self.uk
+            )
+            self.sao_paulo = City.objects.create(
+                name="São Paulo", country=Country.objects.create(name="Brazil")
+            )
+            self.airplane = Airplane.objects.create(
+                name="Boeing 737", rows=2, seats_in_row=2
+            )
+
+    def labels(self, query, **kwargs):
+        return [result["label"] for result in search(query, **kwargs)]
+
+    def test_normalize(self):
+        self.assertEqual(normalize("  São-Paulo  Guarulhos "), "sao paulo guarulhos")
+
+    def test_backends_rank_alike(self):
+        expected = [
+            "London City Airport (London, United Kingdom)",
+            "London, United Kingdom",
+            "Heathrow (London, United Kingdom)",
+        ]
+        for backend in ("database", "trie"):
+            with self.subTest(backend=backend), override_settings(
+                SEARCH_BACKEND=backend
+            ):
+                self.assertEqual(self.labels("lon"), expected)
+                self.assertEqual(self.labels("LON", limit=1), expected[:1])
+                self.assertEqual(
+                    self.labels("lon", kinds=["city"]), ["London, United Kingdom"]
+                )
+                self.assertEqual(self.labels("sao p"), ["São Paulo, Brazil"])
+                self.assertEqual(self.labels("737"), ["Boeing 737"])
+                self.assertEqual(self.labels("xyz"), [])
+                self.assertEqual(self.labels(" - "), [])
+
+    def test_objects_matching_with_several_words_count_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Airplane.objects.create(
+                name="X " + " ".join(f"S{index}" for index in range(10)),
+                rows=1,
+                seats_in_row=1,
+            )
+            Airplane.objects.create(
+                name="X X X X X X X X X X X S", rows=1, seats_in_row=1
+            )
+
+        for backend in ("database", "trie"):
+            with self.subTest(backend=backend), override_settings(
+                SEARCH_BACKEND=backend
+            ):
+                self.assertEqual(len(search("s", kinds=["airplane"], limit=2)), 2)
+
+    def test_index_follows_renames_and_deletes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.uk.name = "Great Britain"
+            self.uk.save()
+        self.assertEqual(self.labels("heath"), ["Heathrow (London, Great Britain)"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.heathrow.delete()
+        self.assertEqual(self.labels("heath"), [])
+        self.assertFalse(
+            SearchEntry.objects.filter(
+                kind=SearchEntry.KIND_AIRPORT, object_id=self.heathrow.id
+            ).exists()
+        )
+
+    def test_rebuild_index(self):
+        SearchEntry.objects.all().delete()
+
+        self.assertEqual(rebuild_index(), 14)
+        with override_settings(SEARCH_BACKEND="database"):
+            self.assertEqual(
+                self.labels("heathrow"), ["Heathrow (London, United Kingdom)"]
+            )
+
+
+class SearchApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "pass1999199",
+        )
+        self.client.force_authenticate(self.user)
+        country = Country.objects.create(name="Poland")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.city = City.objects.create(name="Warsaw", country=country)
+
+    def test_search(self):
+        response = self.client.get(SEARCH_URL, {"q": "war", "kind": "city,airport"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            [{"kind": "city", "id": self.city.id, "label": "Warsaw, Poland"}],
+        )
+
+    def test_invalid_params(self):
+        for params in ({}, {"q": "war", "kind": "planet"}, {"q": "war", "limit": 50}):
+            with self.subTest(params=params):
+                response = self.client.get(SEARCH_URL, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_airplane_name_filter(self):
+        Airplane.objects.create(name="Boeing 737", rows=2, seats_in_row=2)
+        Airplane.objects.create(name="Airbus A320", rows=2, seats_in_row=2)
+
+        response = self.client.get(AIRPLANE_URL, {"name": "boeing"})
+
+        self.assertEqual(
+            [airplane["name"] for airplane in response.data["results"]],
+            ["Boeing 737"],
+        )
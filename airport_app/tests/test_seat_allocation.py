@@ -0,0 +1,88 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_app.models import Order, SeatHold, Ticket
+from airport_app.seat_allocation import find_seat_block, free_runs
+from airport_app.tests.helpers import allocate_url, sample_flight
+
+
+class FindSeatBlockTests(TestCase):
+    def test_free_runs(self):
+        self.assertEqual(list(free_runs(0b1110011)), [(0, 2), (4, 3)])
+        self.assertEqual(list(free_runs(0)), [])
+
+    def test_best_fitting_block_is_chosen(self):
+        occupied = [(1, 3), (2, 4)]
+
+        # Row 1 has runs of 2 and 3 free seats, row 2 of 3 and 2
+        self.assertEqual(find_seat_block(2, 6, occupied, 2), (1, 1))
+        self.assertEqual(find_seat_block(2, 6, occupied, 3), (1, 4))
+        self.assertIsNone(find_seat_block(2, 6, occupied, 4))
+
+    def test_empty_plane(self):
+        self.assertEqual(find_seat_block(3, 6, [], 6), (1, 1))
+
+
+class SeatAllocationApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "pass1999199",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+
+    def test_allocate_adjacent_seats(self):
+        other_order = Order.objects.create(user=self.user)
+        for seat in (1, 6):
+            Ticket.objects.create(
+                flight=self.flight, order=other_order, row=1, seat=seat
+            )
+        SeatHold.objects.create(
+            flight=self.flight,
+            row=1,
+            seat=2,
+            user=self.user,
+            expires_at=timezone.now() + datetime.timedelta(minutes=5),
+        )
+
+        res = self.client.post(
+            allocate_url(self.flight.id), {"count": 3}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get(id=res.data["id"])
+        self.assertEqual(
+            list(order.order_tickets.values_list("row", "seat")),
+            [(1, 3), (1, 4), (1, 5)],
+        )
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.tickets_sold, 5)
+
+    def test_no_adjacent_seats(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.bulk_create(
+            Ticket(flight=self.flight, order=order, row=row, seat=3)
+            for row in range(1, 11)
+        )
+
+        res = self.client.post(
+            allocate_url(self.flight.id), {"count": 4}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_count_above_seats_in_row(self):
+        res = self.client.post(
+            allocate_url(self.flight.id), {"count": 7}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("count", res.data)
@@ -0,0 +1,219 @@
+import datetime
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport_app.models import Order, SeatHold, Task, Ticket
+from airport_app.seat_holds import schedule_hold_sweep
+from airport_app.task_queue import run_pending
+from airport_app.tests.helpers import ORDER_URL, sample_flight
+
+SEAT_HOLD_URL = reverse("airport_app:seathold-list")
+
+
+class SeatHoldApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "pass1999199",
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "other@test.com",
+            "pass1999199",
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight()
+
+    def hold(self, seats):
+        return self.client.post(
+            SEAT_HOLD_URL,
+            {
+                "flight": self.flight.id,
+                "seats": [{"row": row, "seat": seat} for row, seat in seats],
+            },
+            format="json",
+        )
+
+    def test_hold_seats(self):
+        res = self.hold([(1, 1), (1, 2)])
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 2)
+        self.assertEqual(SeatHold.objects.filter(user=self.user).count(), 2)
+
+    def test_held_seat_is_unavailable_for_others(self):
+        SeatHold.objects.create(
+            flight=self.flight,
+            row=1,
+            seat=2,
+            user=self.other_user,
+            expires_at=timezone.now() + datetime.timedelta(minutes=5),
+        )
+
+        res = self.hold([(1, 1), (1, 2)])
+        order_res = self.client.post(
+            ORDER_URL,
+            {"order_tickets": [{"flight": self.flight.id, "row": 1, "seat": 2}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["seats"][0], {})
+        self.assertIn("seat", res.data["seats"][1])
+        self.assertFalse(SeatHold.objects.filter(user=self.user).exists())
+        self.assertEqual(order_res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_held_seats_are_matched_exactly(self):
+        SeatHold.objects.create(
+            flight=self.flight,
+            row=1,
+            seat=3,
+            user=self.other_user,
+            expires_at=timezone.now() + datetime.timedelta(minutes=5),
+        )
+        seats = [
+            (self.flight.id, row, seat)
+            for row in range(1, 51)
+            for seat in range(1, 31)
+        ]
+
+        self.assertEqual(SeatHold.held_seats(seats), {(self.flight.id, 1, 3)})
+        res = self.hold([(1, 1), (2, 3)])
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            SeatHold.objects.get(row=1, seat=3).user, self.other_user
+        )
+
+    def test_expired_hold_is_taken_over(self):
+        SeatHold.objects.create(
+            flight=self.flight,
+            row=1,
+            seat=1,
+            user=self.other_user,
+            expires_at=timezone.now() - datetime.timedelta(seconds=1),
+        )
+
+        res = self.hold([(1, 1)])
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SeatHold.objects.get().user, self.user)
+
+    def test_taken_and_out_of_range_seats(self):
+        order = Order.objects.create(user=self.other_user)
+        Ticket.objects.create(flight=self.flight, order=order, row=1, seat=1)
+
+        res = self.hold([(1, 1), (42, 1)])
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seat", res.data["seats"][0])
+        self.assertIn("row", res.data["seats"][1])
+
+    def test_extend_and_release_hold(self):
+        hold_id = self.hold([(1, 1)]).data[0]["id"]
+        SeatHold.objects.filter(id=hold_id).update(
+            expires_at=timezone.now() + datetime.timedelta(seconds=5)
+        )
+
+        res = self.client.post(
+            reverse("airport_app:seathold-extend", args=[hold_id])
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertGreater(
+            SeatHold.objects.get(id=hold_id).expires_at,
+            timezone.now() + datetime.timedelta(minutes=1),
+        )
+
+        res = self.client.delete(reverse("airport_app:seathold-detail", args=[hold_id]))
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_extend_hold_up_to_max_lifetime(self):
+        hold_id = self.hold([(1, 1)]).data[0]["id"]
+        extend_url = reverse("airport_app:seathold-extend", args=[hold_id])
+        SeatHold.objects.filter(id=hold_id).update(
+            created_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+
+        res = self.client.post(extend_url)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(SEAT_HOLD_MAX_LIFETIME=30 * 60)
+    def test_holding_again_keeps_creation_time(self):
+        created_at = timezone.now() - datetime.timedelta(minutes=25)
+        self.hold([(1, 1)])
+        SeatHold.objects.update(
+            created_at=created_at,
+            expires_at=timezone.now() + datetime.timedelta(minutes=1),
+        )
+
+        self.assertEqual(self.hold([(1, 1)]).status_code, 201)
+
+        hold = SeatHold.objects.get()
+        self.assertEqual(hold.created_at, created_at)
+        self.assertEqual(hold.expires_at, created_at + datetime.timedelta(minutes=30))
+
+    @override_settings(SEAT_HOLD_MAX_PER_USER=3)
+    def test_max_holds_per_user(self):
+        self.assertEqual(self.hold([(1, 1), (1, 2)]).status_code, 201)
+
+        res = self.hold([(2, 1), (2, 2)])
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(SeatHold.objects.count(), 2)
+        # Own holds taken over again do not count twice
+        self.assertEqual(self.hold([(1, 1), (1, 2), (2, 1)]).status_code, 201)
+
+    def test_convert_holds_to_order(self):
+        hold_ids = [hold["id"] for hold in self.hold([(3, 1), (3, 2)]).data]
+
+        res = self.client.post(ORDER_URL, {"seat_holds": hold_ids}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get(id=res.data["id"])
+        self.assertEqual(
+            list(order.order_tickets.values_list("row", "seat")), [(3, 1), (3, 2)]
+        )
+        self.assertFalse(SeatHold.objects.exists())
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.tickets_sold, 2)
+
+    def test_convert_expired_hold(self):
+        hold_id = self.hold([(3, 1)]).data[0]["id"]
+        SeatHold.objects.update(expires_at=timezone.now())
+
+        res = self.client.post(ORDER_URL, {"seat_holds": [hold_id]}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Order.objects.exists())
+
+    def test_sweep_expired_holds(self):
+        self.hold([(1, 1), (1, 2)])
+        SeatHold.objects.filter(seat=1).update(expires_at=timezone.now())
+
+        call_command("sweep_seat_holds", stdout=io.StringIO())
+
+        self.assertEqual(list(SeatHold.objects.values_list("seat", flat=True)), [2])
+
+    def test_sweep_task_queues_next_sweep(self):
+        self.hold([(1, 1)])
+        SeatHold.objects.update(expires_at=timezone.now())
+
+        schedule_hold_sweep()
+        schedule_hold_sweep()
+        run_pending()
+
+        self.assertFalse(SeatHold.objects.exists())
+        self.assertEqual(
+            Task.objects.filter(status=Task.STATUS_PENDING).get().name,
+            "sweep_seat_holds",
+        )
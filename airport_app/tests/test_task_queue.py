@@ -0,0 +1,165 @@
+import datetime
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from airport_app.models import Task
+from airport_app.task_queue import (
+    enqueue,
+    purge_finished_tasks,
+    run_pending,
+    task,
+    work,
+)
+
+CALLS = []
+
+
+@task("test_record")
+def record(value):
+    CALLS.append(value)
+
+
+STOP = threading.Event()
+
+
+@task("test_stop")
+def stop():
+    STOP.set()
+
+
+@task("test_fail", max_attempts=2)
+def fail():
+    raise RuntimeError("Unavailable")
+
+
+@override_settings(TASK_RETRY_BACKOFF=10)
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_enqueue_and_run(self):
+        enqueue("test_record", {"value": 1})
+        enqueue("test_record", {"value": 2}, delay=60)
+
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(CALLS, [1])
+        done = Task.objects.get(status=Task.STATUS_DONE)
+        self.assertEqual((done.attempts, done.locked_until), (1, None))
+
+    def test_idempotency_key(self):
+        for value in (1, 2):
+            enqueue("test_record", {"value": value}, key="record")
+
+        run_pending()
+        enqueue("test_record", {"value": 3}, key="record")
+
+        self.assertEqual(run_pending(), 0)
+        self.assertEqual(CALLS, [1])
+
+    def test_retries_with_backoff_until_max_attempts(self):
+        enqueue("test_fail")
+
+        before = timezone.now()
+        with self.assertLogs("airport_app.task_queue", "ERROR"):
+            self.assertEqual(run_pending(), 1)
+        failed = Task.objects.get()
+        self.assertEqual((failed.status, failed.attempts), (Task.STATUS_PENDING, 1))
+        self.assertGreaterEqual(failed.run_at, before + datetime.timedelta(seconds=5))
+        self.assertIn("Unavailable", failed.last_error)
+        self.assertEqual(run_pending(), 0)
+
+        Task.objects.update(run_at=timezone.now())
+        with self.assertLogs("airport_app.task_queue", "ERROR"):
+            run_pending()
+        failed.refresh_from_db()
+        self.assertEqual((failed.status, failed.attempts), (Task.STATUS_FAILED, 2))
+
+    def test_unknown_task_fails(self):
+        enqueue("test_missing", max_attempts=1)
+
+        with self.assertLogs("airport_app.task_queue", "ERROR"):
+            run_pending()
+
+        self.assertIn("test_missing", Task.objects.get(status="failed").last_error)
+
+    def test_expired_lease_is_claimed_again(self):
+        Task.objects.create(
+            name="test_record",
+            payload={"value": 1},
+            status=Task.STATUS_RUNNING,
+            attempts=1,
+            max_attempts=3,
+            run_at=timezone.now(),
+            locked_until=timezone.now() - datetime.timedelta(seconds=1),
+        )
+
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(CALLS, [1])
+        self.assertEqual(Task.objects.get().attempts, 2)
+
+    def test_expired_lease_of_last_attempt_fails(self):
+        Task.objects.create(
+            name="test_record",
+            payload={"value": 1},
+            status=Task.STATUS_RUNNING,
+            attempts=3,
+            max_attempts=3,
+            run_at=timezone.now(),
+            locked_until=timezone.now() - datetime.timedelta(seconds=1),
+        )
+
+        self.assertEqual(run_pending(), 0)
+        self.assertEqual(CALLS, [])
+        failed = Task.objects.get()
+        self.assertEqual((failed.status, failed.attempts), (Task.STATUS_FAILED, 3))
+        self.assertIsNotNone(failed.finished_at)
+
+    @override_settings(TASK_RETENTION=60)
+    def test_purge_finished_tasks(self):
+        enqueue("test_record", {"value": 1}, key="old")
+        enqueue("test_fail", max_attempts=1)
+        with self.assertLogs("airport_app.task_queue", "ERROR"):
+            run_pending()
+        Task.objects.update(finished_at=timezone.now() - datetime.timedelta(hours=1))
+
+        self.assertEqual(purge_finished_tasks(), 1)
+        self.assertEqual(Task.objects.get().status, Task.STATUS_FAILED)
+
+    def test_run_workers_once(self):
+        enqueue("test_record", {"value": 1})
+        out = StringIO()
+
+        call_command("run_workers", "--once", stdout=out)
+
+        self.assertIn("Ran 1 tasks", out.getvalue())
+
+    def test_worker_survives_failed_status_update(self):
+        enqueue("test_stop")
+        STOP.clear()
+        update = QuerySet.update
+
+        def failing_update(queryset, **kwargs):
+            if kwargs.get("status") == Task.STATUS_DONE:
+                raise DatabaseError("Connection lost")
+            return update(queryset, **kwargs)
+
+        with (
+            mock.patch.object(QuerySet, "update", autospec=True) as patched,
+            mock.patch("airport_app.task_queue.close_old_connections"),
+            mock.patch("airport_app.task_queue.connections") as connections,
+            self.assertLogs("airport_app.task_queue", "ERROR") as logs,
+        ):
+            patched.side_effect = failing_update
+            work(STOP, poll_interval=0)
+
+        self.assertIn("Connection lost", logs.output[0])
+        connections.close_all.assert_called()
+        self.assertEqual(Task.objects.get().status, Task.STATUS_RUNNING)
+
@@ -0,0 +1,87 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+
+from airport_app.tests.helpers import (
+    FLIGHT_URL,
+    ORDER_URL,
+    sample_flight,
+    throttle_rates,
+)
+from airport_app.throttling import SlidingWindowAnonRateThrottle
+
+
+class SlidingWindowThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = APIRequestFactory().get("/")
+        self.request.user = AnonymousUser()
+
+    def allow(self, now):
+        throttle = SlidingWindowAnonRateThrottle()
+        with patch.object(throttle, "timer", return_value=now):
+            return throttle.allow_request(self.request, None), throttle
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(anon="4/min"))
+    def test_previous_window_is_weighted(self):
+        for now in (6000, 6010, 6020, 6030):
+            self.assertTrue(self.allow(now)[0])
+        allowed, throttle = self.allow(6040)
+        self.assertFalse(allowed)
+        self.assertEqual(throttle.wait(), 20)
+
+        # A quarter into the next window 3 of the 4 requests still count
+        self.assertTrue(self.allow(6075)[0])
+        self.assertFalse(self.allow(6075)[0])
+
+        # Half way through, the previous window counts for 2 requests
+        self.assertTrue(self.allow(6090)[0])
+        self.assertFalse(self.allow(6090)[0])
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(anon="4/min"))
+    def test_rejected_requests_are_not_counted(self):
+        # Counted by concurrent requests of other processes meanwhile
+        cache.set("throttle:anon:127.0.0.1:100", 3)
+
+        self.assertTrue(self.allow(6000)[0])
+        self.assertFalse(self.allow(6001)[0])
+        self.assertFalse(self.allow(6002)[0])
+
+        self.assertEqual(cache.get("throttle:anon:127.0.0.1:100"), 4)
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(anon="1/min"))
+    def test_stores_counters_not_timestamps(self):
+        self.allow(6000)
+
+        self.assertEqual(cache.get("throttle:anon:127.0.0.1:100"), 1)
+
+
+@override_settings(REST_FRAMEWORK=throttle_rates(booking="1/min"))
+class ScopedThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("test@test.com", "pass1999199")
+        )
+        self.flight = sample_flight()
+
+    def order(self, seat):
+        return self.client.post(
+            ORDER_URL,
+            {"order_tickets": [{"flight": self.flight.id, "row": 1, "seat": seat}]},
+            format="json",
+        )
+
+    def test_booking_scope_is_per_action(self):
+        self.assertEqual(self.order(1).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.order(2).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        # Listing orders and flights is not in the booking scope
+        self.assertEqual(self.client.get(ORDER_URL).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(FLIGHT_URL).status_code, status.HTTP_200_OK)
@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from drf_spectacular.generators import SchemaGenerator
+from rest_framework.test import APIClient
+
+from airport_app.models import Airplane, Crew, Route
+from airport_app.serializers import FlightListSerializer, RouteListSerializer
+from airport_app.tests.helpers import FLIGHT_URL, sample_flight
+from airport_app.views import FlightViewSet
+
+ROUTE_URL = reverse("airport_app:route-list")
+
+
+class ValuesListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("test@test.com", "pass1999199")
+        )
+        for index in range(3):
+            flight = sample_flight()
+            flight.crew.add(
+                Crew.objects.create(first_name=f"Pilot {index}", last_name="One"),
+                Crew.objects.create(first_name=f"Pilot {index}", last_name="Two"),
+            )
+        sample_flight(
+            airplane=Airplane.objects.create(name="Cargo", rows=0, seats_in_row=0)
+        )
+
+    def test_flight_list_matches_serializer(self):
+        flights = (
+            FlightViewSet.queryset.exclude(airplane__name="Cargo")
+            .order_by("id")
+            .prefetch_related("crew")
+        )
+
+        res = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(
+            res.data["results"][:-1], FlightListSerializer(flights, many=True).data
+        )
+
+    def test_cargo_airplane_capacity_is_an_integer(self):
+        res = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(res.data["results"][-1]["airplane_capacity"], 0)
+
+    def test_route_list_matches_serializer(self):
+        routes = Route.objects.order_by("id")
+
+        res = self.client.get(ROUTE_URL)
+
+        self.assertEqual(
+            res.data["results"], RouteListSerializer(routes, many=True).data
+        )
+
+    def test_schema_still_uses_list_serializers(self):
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+
+        for path, component in (
+            ("/api/v1/airport_app/flights/", "PaginatedFlightListList"),
+            ("/api/v1/airport_app/routes/", "PaginatedRouteListList"),
+        ):
+            response = schema["paths"][path]["get"]["responses"]["200"]
+            self.assertEqual(
+                response["content"]["application/json"]["schema"]["$ref"],
+                f"#/components/schemas/{component}",
+            )
@@ -0,0 +1,33 @@
+import io
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.utils import OperationalError
+from django.test import SimpleTestCase
+
+
+@patch("airport_app.management.commands.wait_for_db.time.sleep")
+@patch("django.db.backends.base.base.BaseDatabaseWrapper.ensure_connection")
+class WaitForDbTests(SimpleTestCase):
+    def test_waits_until_database_accepts_connections(
+        self, ensure_connection, sleep
+    ):
+        ensure_connection.side_effect = [OperationalError] * 2 + [None]
+
+        call_command("wait_for_db", stdout=io.StringIO())
+
+        self.assertEqual(ensure_connection.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_gives_up_after_timeout(self, ensure_connection, sleep):
+        ensure_connection.side_effect = OperationalError
+
+        with patch(
+            "airport_app.management.commands.wait_for_db.time.monotonic",
+            side_effect=[0, 0, 2],
+        ):
+            with self.assertRaises(CommandError):
+                call_command("wait_for_db", timeout=1, stdout=io.StringIO())
+
+        self.assertEqual(ensure_connection.call_count, 2)
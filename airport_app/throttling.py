@@ -0,0 +1,120 @@
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    UserRateThrottle,
+)
+
+
+class SlidingWindowThrottleMixin:
+    """Sliding window counter on the shared cache
+
+    Instead of a list of request timestamps per key, requests are counted
+    in fixed windows of the rate duration, and the previous window's count
+    is weighted by how much of it still overlaps the sliding window. Two
+    integers per key are stored. A request increments its window first and
+    is checked with the returned count, so the limit holds for concurrent
+    requests of all worker processes sharing the cache.
+    """
+
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def get_rate(self):
+        # Read at call time, THROTTLE_RATES is bound when DRF is imported
+        if not getattr(self, "scope", None):
+            raise ImproperlyConfigured(
+                f"You must set either `.scope` or `.rate` for "
+                f"'{self.__class__.__name__}' throttle"
+            )
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f"No default throttle rate set for '{self.scope}' scope"
+            )
+
+    def _window_keys(self):
+        window = int(self.now // self.duration)
+        return f"{self.key}:{window - 1}", f"{self.key}:{window}"
+
+    def _estimate(self, previous, current):
+        elapsed = (self.now % self.duration) / self.duration
+        return previous * (1 - elapsed) + current
+
+    def _increment(self, key) -> int:
+        # The window is kept until the next one stops overlapping with it
+        if self.cache.add(key, 1, self.duration * 2):
+            return 1
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 1, self.duration * 2)
+            return 1
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        previous_key, current_key = self._window_keys()
+        current = self._increment(current_key)
+        self.previous = self.cache.get(previous_key, 0)
+        # Requests counted before this one
+        self.current = current - 1
+
+        if self._estimate(self.previous, current) > self.num_requests:
+            # Rejected requests do not use up the limit
+            try:
+                self.cache.decr(current_key)
+            except ValueError:
+                pass
+            return self.throttle_failure()
+        return True
+
+    def wait(self):
+        """Seconds until the estimate drops below the limit"""
+        remaining = self.duration - self.now % self.duration
+        if self.current >= self.num_requests:
+            return remaining
+
+        # previous * (1 - (elapsed + wait) / duration) + current < limit
+        elapsed = self.now % self.duration
+        needed = self.duration * (
+            1 - (self.num_requests - self.current) / self.previous
+        )
+        return max(min(needed - elapsed, remaining), 0)
+
+
+class SlidingWindowAnonRateThrottle(SlidingWindowThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class SlidingWindowUserRateThrottle(SlidingWindowThrottleMixin, UserRateThrottle):
+    pass
+
+
+class SlidingWindowScopedRateThrottle(
+    SlidingWindowThrottleMixin, ScopedRateThrottle
+):
+    """Scoped throttle whose scope can depend on the viewset action
+
+    Views set `throttle_scope`, or `throttle_scopes`, a dict of
+    {action: scope}; actions without a scope are not throttled by it.
+    """
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, "throttle_scopes", {}).get(
+            getattr(view, "action", None), getattr(view, "throttle_scope", None)
+        )
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return SlidingWindowThrottleMixin.allow_request(self, request, view)
+
@@ -1,5 +1,6 @@
 from rest_framework import routers
 from django.urls import path, include
+from airport_app.async_views import flight_list
 from airport_app.views import (
     CountryViewSet,
     CityViewSet,
@@ -10,6 +11,9 @@ from airport_app.views import (
     CrewViewSet,
     FlightViewSet,
     OrderViewSet,
+    SeatHoldViewSet,
+    RouteDailyStatsViewSet,
+    SearchView,
 )
 
 app_name = "airport_app"
@@ -25,7 +29,11 @@ router.register("airplane_types", AirplaneTypeViewSet)
 router.register("crew", CrewViewSet)
 router.register("flights", FlightViewSet)
 router.register("orders", OrderViewSet)
+router.register("seat_holds", SeatHoldViewSet)
+router.register("route_stats", RouteDailyStatsViewSet)
 
 urlpatterns = [
+    path("async/flights/", flight_list, name="flight-list-async"),
+    path("search/", SearchView.as_view(), name="search"),
     path("", include(router.urls)),
 ]
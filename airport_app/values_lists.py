@@ -0,0 +1,26 @@
+from rest_framework.response import Response
+
+
+class ValuesListMixin:
+    """List action rendering flat values() rows instead of model instances
+
+    Viewsets implement `list_values(queryset)`, returning a values()
+    queryset with the related data annotated, and `encode_list_rows(rows)`,
+    returning the same data the list serializer would. The list serializer
+    class still describes the endpoint in the OpenAPI schema.
+    """
+
+    def list_values(self, queryset):
+        raise NotImplementedError
+
+    def encode_list_rows(self, rows) -> list:
+        raise NotImplementedError
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.list_values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.encode_list_rows(page))
+
+        return Response(self.encode_list_rows(list(queryset)))
@@ -1,15 +1,52 @@
-from django.db.models import F, ExpressionWrapper, IntegerField, Count
+import datetime
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.static import serve
+from django.db.models import (
+    CharField,
+    F,
+    ExpressionWrapper,
+    IntegerField,
+    Prefetch,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Concat
+from django.utils import timezone
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
-from rest_framework.pagination import PageNumberPagination
 
+from airport_app.cache import CachedResponseMixin
+from airport_app.db_router import ReplicaReadMixin, replica_reads
+from airport_app.pagination import (
+    DefaultPagination,
+    FlightPagination,
+    OrderPagination,
+)
 from airport_app.permissions import IsAdminOrIfAuthenticatedReadOnly
+from airport_app.values_lists import ValuesListMixin
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.viewsets import ModelViewSet
-from rest_framework import status
-
+from rest_framework.views import APIView
+from rest_framework.viewsets import ModelViewSet, GenericViewSet, ReadOnlyModelViewSet
+from rest_framework import mixins, status
+from rest_framework.exceptions import ValidationError
+
+from airport_app.exports import EXPORT_FORMATS, export_response
+from airport_app.images import IMAGE_VARIANTS_DIR, schedule_image_processing
+from airport_app.itineraries import find_itineraries
+from airport_app.metrics import render_metrics
+from airport_app.search import search
+from airport_app.seat_allocation import allocate_seats
+from airport_app.seat_holds import extend_hold, hold_seats
+from airport_app.seat_map import (
+    build_seat_map,
+    cache_seat_map,
+    get_cached_seat_map,
+)
 from airport_app.models import (
     Country,
     City,
@@ -20,6 +57,9 @@ from airport_app.models import (
     Crew,
     Flight,
     Order,
+    RouteDailyStats,
+    SeatHold,
+    Ticket,
 )
 
 from airport_app.serializers import (
@@ -43,17 +83,52 @@ from airport_app.serializers import (
     FlightListSerializer,
     FlightRetrieveSerializer,
     FlightSerializer,
+    FlightSeatMapSerializer,
+    ItinerarySearchSerializer,
+    ItinerarySerializer,
     OrderListSerializer,
     OrderSerializer,
+    RouteDailyStatsSerializer,
+    RouteStatsTotalsSerializer,
+    SearchQuerySerializer,
+    SearchResultSerializer,
+    SeatHoldCreateSerializer,
+    SeatAllocationSerializer,
+    SeatHoldSerializer,
 )
 
+FLIGHT_EXPORT_FIELDS = (
+    "id",
+    "source",
+    "destination",
+    "departure_time",
+    "arrival_time",
+    "airplane_name",
+    "capacity",
+    "tickets_available",
+)
+MANIFEST_EXPORT_FIELDS = (
+    "row",
+    "seat",
+    "order_id",
+    "ordered_at",
+    "email",
+    "first_name",
+    "last_name",
+)
+EXPORT_FORMAT_PARAMETER = OpenApiParameter(
+    "export_format",
+    type=OpenApiTypes.STR,
+    enum=list(EXPORT_FORMATS),
+    description="Export file format (ex. ?export_format=ndjson), csv by default",
+)
 
-class DefaultPagination(PageNumberPagination):
-    page_size = 10
-    max_page_size = 100
+# Latest arrival of an itinerary, counted from the start of the departure day
+ITINERARY_SEARCH_WINDOW = datetime.timedelta(days=2)
 
 
-class CountryViewSet(ModelViewSet):
+class CountryViewSet(CachedResponseMixin, ModelViewSet):
+    cache_models = (Country, City)
     queryset = Country.objects.all()
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     pagination_class = DefaultPagination
@@ -65,7 +140,8 @@ class CountryViewSet(ModelViewSet):
         return CountrySerializer
 
 
-class CityViewSet(ModelViewSet):
+class CityViewSet(CachedResponseMixin, ModelViewSet):
+    cache_models = (City, Country)
     queryset = City.objects.all().select_related()
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     pagination_class = DefaultPagination
@@ -85,7 +161,8 @@ class CityViewSet(ModelViewSet):
         return queryset
 
 
-class AirportViewSet(ModelViewSet):
+class AirportViewSet(CachedResponseMixin, ModelViewSet):
+    cache_models = (Airport, City, Country)
     queryset = Airport.objects.all()
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     pagination_class = DefaultPagination
@@ -106,7 +183,8 @@ class AirportViewSet(ModelViewSet):
         return queryset
 
 
-class RouteViewSet(ModelViewSet):
+class RouteViewSet(CachedResponseMixin, ValuesListMixin, ModelViewSet):
+    cache_models = (Route, Airport, City, Country)
     queryset = Route.objects.all()
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     pagination_class = DefaultPagination
@@ -122,18 +200,57 @@ class RouteViewSet(ModelViewSet):
     def get_queryset(self):
         queryset = self.queryset
         if self.action in ("list", "retrieve"):
-            return queryset.select_related("source", "destination")
+            return queryset.select_related(
+                "source__city__country",
+                "source__country",
+                "destination__city__country",
+                "destination__country",
+            )
 
         return queryset
 
+    @staticmethod
+    def _airport_label(airport):
+        """SQL label of the `airport` relation: City, Country - 'Airport'"""
+        return Concat(
+            F(f"{airport}__city__name"),
+            Value(", "),
+            F(f"{airport}__country__name"),
+            Value(" - '"),
+            F(f"{airport}__name"),
+            Value("'"),
+            output_field=CharField(),
+        )
+
+    def list_values(self, queryset):
+        return queryset.values(
+            "id",
+            "distance",
+            source_label=self._airport_label("source"),
+            destination_label=self._airport_label("destination"),
+        )
+
+    def encode_list_rows(self, rows) -> list:
+        """RouteListSerializer data of values() rows"""
+        return [
+            {
+                "id": row["id"],
+                "source": row["source_label"],
+                "destination": row["destination_label"],
+                "distance": row["distance"],
+            }
+            for row in rows
+        ]
 
-class AirplaneTypeViewSet(ModelViewSet):
+
+class AirplaneTypeViewSet(CachedResponseMixin, ModelViewSet):
+    cache_models = (AirplaneType,)
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
 
-class AirplaneViewSet(ModelViewSet):
+class AirplaneViewSet(ReplicaReadMixin, ModelViewSet):
     queryset = Airplane.objects.all()
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     pagination_class = DefaultPagination
@@ -161,7 +278,9 @@ class AirplaneViewSet(ModelViewSet):
         serializer = self.get_serializer(airplane, data=request.data)
 
         if serializer.is_valid():
-            serializer.save()
+            # The variants of the previous image are replaced in the background
+            serializer.save(airplane_image_variants={})
+            schedule_image_processing(airplane, "airplane_image")
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -170,6 +289,7 @@ class AirplaneViewSet(ModelViewSet):
         """Detail view for the airplanes with filters"""
         queryset = self.queryset
         airplane_type = self.request.query_params.get("airplane_types")
+        name = self.request.query_params.get("name")
         capacity_gte = self.request.query_params.get("capacity_gte")
         capacity_lte = self.request.query_params.get("capacity_lte")
 
@@ -177,6 +297,9 @@ class AirplaneViewSet(ModelViewSet):
             airplane_types_ids = [int(str_id) for str_id in airplane_type.split(",")]
             queryset = Airplane.objects.filter(airplane_type__id__in=airplane_types_ids)
 
+        if name:
+            queryset = queryset.filter(name__icontains=name)
+
         if capacity_gte:
             queryset = queryset.annotate(
                 computed_capacity=ExpressionWrapper(
@@ -226,53 +349,119 @@ class AirplaneViewSet(ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class CrewViewSet(ModelViewSet):
+class CrewViewSet(ReplicaReadMixin, ModelViewSet):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     pagination_class = DefaultPagination
 
 
-class FlightViewSet(ModelViewSet):
+class FlightViewSet(ReplicaReadMixin, ValuesListMixin, ModelViewSet):
     queryset = (
         Flight.objects.all()
         .select_related(
-            "route__source", "route__destination", "airplane__airplane_type"
+            "route__source__city",
+            "route__source__country",
+            "route__destination__city",
+            "route__destination__country",
+            "airplane__airplane_type",
         )
         .annotate(
             tickets_available=(
-                F("airplane__rows") * F("airplane__seats_in_row")
-                - Count("flight_tickets")
+                F("airplane__rows") * F("airplane__seats_in_row") - F("tickets_sold")
             )
         )
     )
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
-    pagination_class = DefaultPagination
+    pagination_class = FlightPagination
+    throttle_scopes = {
+        "list": "flight_list",
+        "itineraries": "flight_search",
+        "allocate": "booking",
+    }
 
     @staticmethod
     def _params_to_ints(qs):
         """Converts a list of string IDs to a list of integers"""
         return [int(str_id) for str_id in qs.split(",")]
 
-    def get_queryset(self):
-        airplanes = self.request.query_params.get("airplanes")
-        routes = self.request.query_params.get("routes")
-        date = self.request.query_params.get("date")
-
-        queryset = self.queryset
+    @staticmethod
+    def _date_to_range(date_str):
+        """Converts a date to the half-open [start, end) range of that day
+
+        Filtering `departure_time` by a range instead of `__date` keeps the
+        column bare, so the departure_time indexes can be used.
+        """
+        try:
+            date = datetime.date.fromisoformat(date_str)
+        except ValueError:
+            raise ValidationError({"date": "Date must be in YYYY-MM-DD format."})
+
+        start = timezone.make_aware(datetime.datetime.combine(date, datetime.time()))
+        return start, start + datetime.timedelta(days=1)
+
+    @classmethod
+    def filter_by_params(cls, queryset, query_params):
+        """Apply the ?airplanes=, ?routes= and ?date= filters to `queryset`"""
+        airplanes = query_params.get("airplanes")
+        routes = query_params.get("routes")
+        date = query_params.get("date")
 
         if airplanes:
-            airplanes_ids = self._params_to_ints(airplanes)
+            airplanes_ids = cls._params_to_ints(airplanes)
             queryset = queryset.filter(airplane__id__in=airplanes_ids)
 
         if routes:
-            routes_ids = self._params_to_ints(routes)
+            routes_ids = cls._params_to_ints(routes)
             queryset = queryset.filter(route__id__in=routes_ids)
 
         if date:
-            queryset = queryset.filter(departure_time__date=date)
+            start, end = cls._date_to_range(date)
+            queryset = queryset.filter(departure_time__gte=start, departure_time__lt=end)
 
-        return queryset.distinct()
+        return queryset
+
+    def get_queryset(self):
+        if self.action in ("seats", "manifest", "allocate"):
+            return Flight.objects.select_related("airplane")
+
+        queryset = self.filter_by_params(self.queryset, self.request.query_params)
+
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "crew", queryset=Crew.objects.only("first_name", "last_name")
+                )
+            )
+
+        return queryset
+
+    def list_values(self, queryset):
+        return queryset.values(
+            "id",
+            "departure_time",
+            "tickets_available",
+            route_source=F("route__source__name"),
+            route_destination=F("route__destination__name"),
+            airplane_name=F("airplane__name"),
+            airplane_capacity=F("airplane__rows") * F("airplane__seats_in_row"),
+        )
+
+    def encode_list_rows(self, rows) -> list:
+        """FlightListSerializer data of values() rows"""
+        crew_names = Flight.crew_names([row["id"] for row in rows])
+        return [
+            {
+                "id": row["id"],
+                "route_source": row["route_source"],
+                "route_destination": row["route_destination"],
+                "airplane_name": row["airplane_name"],
+                "airplane_capacity": row["airplane_capacity"],
+                "crew": ", ".join(crew_names.get(row["id"], ())),
+                "tickets_available": row["tickets_available"],
+            }
+            for row in rows
+        ]
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -281,8 +470,144 @@ class FlightViewSet(ModelViewSet):
         if self.action == "retrieve":
             return FlightRetrieveSerializer
 
+        if self.action == "seats":
+            return FlightSeatMapSerializer
+
+        if self.action == "itineraries":
+            return ItinerarySerializer
+
+        if self.action == "allocate":
+            return SeatAllocationSerializer
+
         return FlightSerializer
 
+    @action(methods=["GET"], detail=True, url_path="seats")
+    def seats(self, request, pk=None):
+        """Occupancy bitmap of the flight seats"""
+        seat_map = get_cached_seat_map(pk)
+
+        if seat_map is None:
+            # Cached until the next booking, a lagging replica could miss it
+            with replica_reads(False):
+                seat_map = build_seat_map(self.get_object())
+            cache_seat_map(seat_map)
+
+        return Response(self.get_serializer(seat_map).data)
+
+    @extend_schema(responses={201: OrderSerializer})
+    @action(
+        methods=["POST"],
+        detail=True,
+        url_path="allocate",
+        permission_classes=[
+            IsAuthenticated,
+        ],
+    )
+    def allocate(self, request, pk=None):
+        """Book the best available block of adjacent seats in one order"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        order = allocate_seats(
+            request.user, self.get_object(), serializer.validated_data["count"]
+        )
+
+        return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        parameters=[EXPORT_FORMAT_PARAMETER],
+        responses={200: OpenApiTypes.STR},
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="export",
+        permission_classes=[
+            IsAdminUser,
+        ],
+    )
+    def export(self, request):
+        """Stream the filtered flight schedule as CSV or NDJSON"""
+        flights = (
+            self.get_queryset()
+            .order_by("departure_time", "id")
+            .values(
+                "id",
+                "departure_time",
+                "arrival_time",
+                "tickets_available",
+                source=F("route__source__name"),
+                destination=F("route__destination__name"),
+                airplane_name=F("airplane__name"),
+                capacity=F("airplane__rows") * F("airplane__seats_in_row"),
+            )
+        )
+        return export_response(
+            flights,
+            FLIGHT_EXPORT_FIELDS,
+            request.query_params.get("export_format", "csv"),
+            "flights",
+        )
+
+    @extend_schema(
+        parameters=[EXPORT_FORMAT_PARAMETER],
+        responses={200: OpenApiTypes.STR},
+    )
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path="manifest",
+        permission_classes=[
+            IsAdminUser,
+        ],
+    )
+    def manifest(self, request, pk=None):
+        """Stream the passenger manifest of the flight as CSV or NDJSON"""
+        flight = self.get_object()
+        tickets = (
+            Ticket.objects.filter(flight=flight)
+            .order_by("row", "seat")
+            .values(
+                "row",
+                "seat",
+                "order_id",
+                ordered_at=F("order__created_at"),
+                email=F("order__user__email"),
+                first_name=F("order__user__first_name"),
+                last_name=F("order__user__last_name"),
+            )
+        )
+        return export_response(
+            tickets,
+            MANIFEST_EXPORT_FIELDS,
+            request.query_params.get("export_format", "csv"),
+            f"flight-{flight.id}-manifest",
+        )
+
+    @extend_schema(parameters=[ItinerarySearchSerializer])
+    @action(methods=["GET"], detail=False, url_path="itineraries")
+    def itineraries(self, request):
+        """Earliest arriving flight connections between two airports"""
+        search = ItinerarySearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+        params = search.validated_data
+
+        departure_from = timezone.make_aware(
+            datetime.datetime.combine(params["date"], datetime.time())
+        )
+        itineraries = find_itineraries(
+            source=params["source"],
+            destination=params["destination"],
+            departure_from=departure_from,
+            departure_until=departure_from + datetime.timedelta(days=1),
+            arrival_until=departure_from + ITINERARY_SEARCH_WINDOW,
+            max_legs=params["max_legs"],
+            min_connection=datetime.timedelta(minutes=params["min_connection"]),
+            limit=params["limit"],
+        )
+
+        return Response(self.get_serializer(itineraries, many=True).data)
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -306,16 +631,32 @@ class FlightViewSet(ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class OrderViewSet(ModelViewSet):
-    queryset = Order.objects.select_related(
-        "tickets__flight__airplane", "tickets__flight__route"
-    ).prefetch_related("tickets__flight__crew")
+class OrderViewSet(ReplicaReadMixin, ModelViewSet):
+    queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = (IsAuthenticated,)
-    pagination_class = DefaultPagination
+    pagination_class = OrderPagination
+    throttle_scopes = {"create": "booking"}
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        queryset = self.queryset.filter(user=self.request.user)
+
+        if self.action == "list":
+            # One query for the tickets of the whole page with their flights
+            return queryset.prefetch_related(
+                Prefetch(
+                    "order_tickets",
+                    queryset=Ticket.objects.select_related(
+                        "flight__route__source__city",
+                        "flight__route__source__country",
+                        "flight__route__destination__city",
+                        "flight__route__destination__country",
+                        "flight__airplane",
+                    ),
+                ),
+            )
+
+        return queryset.prefetch_related("order_tickets")
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -325,3 +666,210 @@ class OrderViewSet(ModelViewSet):
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+
+class SeatHoldViewSet(
+    ReplicaReadMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    GenericViewSet,
+):
+    queryset = SeatHold.objects.all()
+    permission_classes = (IsAuthenticated,)
+    pagination_class = DefaultPagination
+    throttle_scopes = {"create": "booking"}
+
+    def get_queryset(self):
+        """Active holds of the current user"""
+        return self.queryset.filter(
+            user=self.request.user, expires_at__gt=timezone.now()
+        )
+
+    def get_serializer_class(self):
+        if self.action == "create":
+            return SeatHoldCreateSerializer
+
+        return SeatHoldSerializer
+
+    @extend_schema(responses={201: SeatHoldSerializer(many=True)})
+    def create(self, request, *args, **kwargs):
+        """Hold seats of a flight for SEAT_HOLD_TTL seconds, all or none"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        seats = serializer.validated_data["seats"]
+        holds = hold_seats(
+            request.user,
+            serializer.validated_data["flight"],
+            [(seat["row"], seat["seat"]) for seat in seats],
+        )
+
+        return Response(
+            SeatHoldSerializer(holds, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(request=None)
+    @action(methods=["POST"], detail=True, url_path="extend")
+    def extend(self, request, pk=None):
+        """Extend the hold for another SEAT_HOLD_TTL seconds"""
+        hold = extend_hold(self.get_object())
+
+        return Response(self.get_serializer(hold).data, status=status.HTTP_200_OK)
+
+
+ROUTE_STATS_PARAMETERS = [
+    OpenApiParameter(
+        "routes",
+        type={"type": "list", "items": {"type": "number"}},
+        description="Filter by routes ids (ex. ?routes=4,7)",
+    ),
+    OpenApiParameter(
+        "date_from",
+        type=OpenApiTypes.DATE,
+        description="First departure day (ex. ?date_from=2024-05-01)",
+    ),
+    OpenApiParameter(
+        "date_to",
+        type=OpenApiTypes.DATE,
+        description="Last departure day (ex. ?date_to=2024-05-31)",
+    ),
+]
+
+
+class RouteDailyStatsViewSet(ReplicaReadMixin, ReadOnlyModelViewSet):
+    """Load factor and sold seats per route and departure day
+
+    Served from the RouteDailyStats summary, refreshed by the
+    refresh_route_stats command, so reports never aggregate tickets.
+    """
+
+    queryset = RouteDailyStats.objects.all()
+    serializer_class = RouteDailyStatsSerializer
+    permission_classes = (IsAdminUser,)
+    pagination_class = DefaultPagination
+
+    def filter_queryset(self, queryset):
+        routes = self.request.query_params.get("routes")
+        date_from = self.request.query_params.get("date_from")
+        date_to = self.request.query_params.get("date_to")
+
+        try:
+            if routes:
+                queryset = queryset.filter(
+                    route_id__in=[int(str_id) for str_id in routes.split(",")]
+                )
+            if date_from:
+                queryset = queryset.filter(
+                    date__gte=datetime.date.fromisoformat(date_from)
+                )
+            if date_to:
+                queryset = queryset.filter(
+                    date__lte=datetime.date.fromisoformat(date_to)
+                )
+        except ValueError:
+            raise ValidationError(
+                "Routes must be comma separated ids, dates in YYYY-MM-DD format."
+            )
+
+        return queryset
+
+    def get_queryset(self):
+        if self.action == "totals":
+            return self.queryset
+        return self.queryset.annotate(distance=F("route__distance"))
+
+    def get_serializer_class(self):
+        if self.action == "totals":
+            return RouteStatsTotalsSerializer
+
+        return RouteDailyStatsSerializer
+
+    @extend_schema(parameters=ROUTE_STATS_PARAMETERS)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(parameters=ROUTE_STATS_PARAMETERS)
+    @action(methods=["GET"], detail=False, url_path="totals")
+    def totals(self, request):
+        """Sums per route over the filtered days"""
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .order_by("route")
+            .values("route")
+            .annotate(
+                total_flights=Sum("flights"),
+                total_capacity=Sum("capacity"),
+                total_tickets_sold=Sum("tickets_sold"),
+                total_passenger_km=Sum(F("tickets_sold") * F("route__distance")),
+            )
+        )
+        page = self.paginate_queryset(rows)
+        totals = [
+            {
+                "route": row["route"],
+                "flights": row["total_flights"],
+                "capacity": row["total_capacity"],
+                "tickets_sold": row["total_tickets_sold"],
+                "load_factor": round(
+                    row["total_tickets_sold"] / row["total_capacity"], 4
+                )
+                if row["total_capacity"]
+                else None,
+                "passenger_km": row["total_passenger_km"],
+            }
+            for row in page
+        ]
+        return self.get_paginated_response(self.get_serializer(totals, many=True).data)
+
+
+class SearchView(ReplicaReadMixin, APIView):
+    """Type-ahead search of airports, cities, countries and airplanes
+
+    Every word of a name is matched by its beginning, ignoring case and
+    accents. Matches on the first word rank first, then airports before
+    cities, countries and airplanes, then shorter names.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    throttle_scope = "search"
+
+    @extend_schema(
+        parameters=[SearchQuerySerializer],
+        responses=SearchResultSerializer(many=True),
+    )
+    def get(self, request):
+        query = SearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        results = search(params["q"], params.get("kind"), params["limit"])
+        return Response(SearchResultSerializer(results, many=True).data)
+
+
+def media(request, path):
+    """Uploaded files, the content hashed image variants cached for good"""
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    if path.startswith(f"{IMAGE_VARIANTS_DIR}/"):
+        response["Cache-Control"] = "public, max-age=31536000, immutable"
+    else:
+        response["Cache-Control"] = f"public, max-age={settings.MEDIA_CACHE_TIMEOUT}"
+    return response
+
+
+def metrics(request):
+    """Prometheus metrics recorded by the PerformanceMiddleware
+
+    Served to staff users logged in to the admin, and to requests sending
+    METRICS_TOKEN as a bearer token when it is set.
+    """
+    has_token = bool(settings.METRICS_TOKEN) and constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+    )
+    if not (has_token or request.user.is_staff):
+        return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+
+    return HttpResponse(
+        render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
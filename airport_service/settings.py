@@ -59,6 +59,17 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Per view timings and query counts in Server-Timing headers and /metrics/
+if os.environ.get("PERFORMANCE_METRICS") == "True":
+    MIDDLEWARE.insert(0, "airport_app.middleware.PerformanceMiddleware")
+
+# Bearer token accepted by /metrics/, staff users logged in to the admin
+# can read it too
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+# Seconds the metrics of a process are buffered before they are added to the
+# totals of all processes on the shared cache
+METRICS_FLUSH_INTERVAL = int(os.environ.get("METRICS_FLUSH_INTERVAL", 10))
+
 ROOT_URLCONF = "airport_service.urls"
 
 TEMPLATES = [
@@ -90,9 +101,55 @@ DATABASES = {
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": os.environ["POSTGRES_PORT"],
+        # Seconds a connection is reused between requests, 0 closes it
+        # after every request
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
+        # Transaction pooling PgBouncer can not keep server-side cursors,
+        # which iterator() uses, open between transactions
+        "DISABLE_SERVER_SIDE_CURSORS": os.environ.get("DB_POOLER") == "pgbouncer",
     }
 }
 
+# Read replicas of the primary, comma separated hosts with the same database
+# and credentials; safe-method API requests read from them, see
+# airport_app.db_router
+READ_REPLICAS = []
+for index, host in enumerate(
+    host.strip()
+    for host in os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(",")
+    if host.strip()
+):
+    READ_REPLICAS.append(f"replica_{index}")
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["airport_app.db_router.ReplicaRouter"]
+
+# Seconds a user reads from the primary after a write, longer than the
+# replication lag, so their own orders are never missing
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 10))
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -137,6 +194,10 @@ STATIC_URL = "static/"
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = "/vol/web/media"
+# Serve MEDIA_ROOT from Django, when no web server or CDN in front does
+SERVE_MEDIA = os.environ.get("SERVE_MEDIA", str(DEBUG)) == "True"
+# Seconds clients cache uploaded originals, image variants are cached for good
+MEDIA_CACHE_TIMEOUT = int(os.environ.get("MEDIA_CACHE_TIMEOUT", 60 * 60))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -148,12 +209,22 @@ USE_DJANGO_JQUERY = True
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "airport_app.throttling.SlidingWindowAnonRateThrottle",
+        "airport_app.throttling.SlidingWindowUserRateThrottle",
+        "airport_app.throttling.SlidingWindowScopedRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "1000/day", "user": "10000/day"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": os.environ.get("THROTTLE_RATE_ANON", "1000/day"),
+        "user": os.environ.get("THROTTLE_RATE_USER", "10000/day"),
+        # Per endpoint scopes, see `throttle_scopes` of the viewsets
+        "flight_list": os.environ.get("THROTTLE_RATE_FLIGHT_LIST", "120/min"),
+        "flight_search": os.environ.get("THROTTLE_RATE_FLIGHT_SEARCH", "30/min"),
+        "booking": os.environ.get("THROTTLE_RATE_BOOKING", "20/min"),
+        # Type-ahead, one request per keystroke
+        "search": os.environ.get("THROTTLE_RATE_SEARCH", "600/min"),
+    },
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTAuthentication",
     ),
 }
 
@@ -170,6 +241,43 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# Seconds a reference data response stays cached, it is versioned on writes
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get("RESPONSE_CACHE_TIMEOUT", 60 * 60))
+
+# Seconds a flight seat map stays cached, it is invalidated on ticket writes
+SEAT_MAP_CACHE_TIMEOUT = int(os.environ.get("SEAT_MAP_CACHE_TIMEOUT", 60))
+
+# Seconds the id and permission flags of an authenticated user stay cached,
+# they are invalidated on user saves
+USER_PRINCIPAL_CACHE_TIMEOUT = int(os.environ.get("USER_PRINCIPAL_CACHE_TIMEOUT", 60))
+
+# Seconds a seat stays held for its user before it must be ordered or extended
+SEAT_HOLD_TTL = int(os.environ.get("SEAT_HOLD_TTL", 10 * 60))
+# Seconds a hold can live in total, extensions included
+SEAT_HOLD_MAX_LIFETIME = int(
+    os.environ.get("SEAT_HOLD_MAX_LIFETIME", 3 * SEAT_HOLD_TTL)
+)
+# Active holds a user can have at once, over all flights
+SEAT_HOLD_MAX_PER_USER = int(os.environ.get("SEAT_HOLD_MAX_PER_USER", 10))
+# Seconds between the deletions of expired holds by the task workers
+SEAT_HOLD_SWEEP_INTERVAL = int(os.environ.get("SEAT_HOLD_SWEEP_INTERVAL", 60))
+
+# "database" for prefix queries on the SearchEntry index, "trie" for an
+# in-memory trie per process, unset to use the database on PostgreSQL only
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND") or None
+
+# Background tasks, see airport_app.task_queue and `manage.py run_workers`
+TASK_WORKER_PROCESSES = int(os.environ.get("TASK_WORKER_PROCESSES", 2))
+TASK_WORKER_THREADS = int(os.environ.get("TASK_WORKER_THREADS", 4))
+TASK_MAX_ATTEMPTS = int(os.environ.get("TASK_MAX_ATTEMPTS", 5))
+# Seconds before the first retry, doubled on each further one up to the max
+TASK_RETRY_BACKOFF = int(os.environ.get("TASK_RETRY_BACKOFF", 10))
+TASK_RETRY_BACKOFF_MAX = int(os.environ.get("TASK_RETRY_BACKOFF_MAX", 60 * 60))
+# Seconds a worker owns a running task, it is run again if it takes longer
+TASK_LEASE_SECONDS = int(os.environ.get("TASK_LEASE_SECONDS", 5 * 60))
+# Seconds finished tasks, and their idempotency keys, are kept
+TASK_RETENTION = int(os.environ.get("TASK_RETENTION", 7 * 24 * 60 * 60))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
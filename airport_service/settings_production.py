@@ -0,0 +1,29 @@
+"""
+Production settings for airport_service.
+
+Use them with DJANGO_SETTINGS_MODULE=airport_service.settings_production,
+they are served by gunicorn with the workers configured in gunicorn.conf.py.
+"""
+import os
+
+from airport_service.settings import *  # noqa: F401, F403
+from airport_service.settings import DATABASES
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get("DJANGO_ALLOWED_HOSTS", "").split(",")
+    if host.strip()
+]
+
+# Persistent connections, checked before reuse, outlive the short API calls.
+# Django does not support them under ASGI, where they leak, so the Uvicorn
+# worker gets a new connection per request.
+ASGI_WORKER = "uvicorn" in os.environ.get("GUNICORN_WORKER_CLASS", "").lower()
+for database in DATABASES.values():
+    database["CONN_MAX_AGE"] = (
+        0 if ASGI_WORKER else int(os.environ.get("DB_CONN_MAX_AGE", 600))
+    )
+
+SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
@@ -0,0 +1,24 @@
+"""gunicorn configuration, see README.md for the environment variables"""
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+workers = int(
+    os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1)
+)
+# "gthread" serves WSGI with persistent DB connections per thread,
+# "uvicorn.workers.UvicornWorker" serves the ASGI application, without
+# persistent DB connections (see settings_production)
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Recycle workers now and then, so leaks can not grow without bound
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = max_requests // 10
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
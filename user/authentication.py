@@ -0,0 +1,108 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+PRINCIPAL_CACHE_KEY = "user:principal:{user_id}"
+# Enough to authenticate and to check the permissions of the API
+PRINCIPAL_FIELDS = ("id", "is_active", "is_staff", "is_superuser")
+
+
+def principal_cache_key(user_id) -> str:
+    return PRINCIPAL_CACHE_KEY.format(user_id=user_id)
+
+
+def principal_from_values(values):
+    """User instance with only PRINCIPAL_FIELDS loaded
+
+    The other fields are deferred, so reading them, e.g. `email`, loads
+    them from the database instead of returning empty values.
+    """
+    user_model = get_user_model()
+    values = dict(zip(PRINCIPAL_FIELDS, values))
+    # from_db() takes the values in the order of the model fields
+    field_names = [
+        field.attname
+        for field in user_model._meta.concrete_fields
+        if field.attname in values
+    ]
+    return user_model.from_db(
+        None, field_names, [values[name] for name in field_names]
+    )
+
+
+def invalidate_principal(user_id) -> None:
+    cache.delete(principal_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication caching the user principal instead of loading
+    the user row on every request
+
+    The principal is cached for USER_PRINCIPAL_CACHE_TIMEOUT seconds and
+    dropped when the user is saved or deleted.
+    """
+
+    @staticmethod
+    def _user_id(validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    @staticmethod
+    def _principal(values):
+        if values is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        user = principal_from_values(values)
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+    def _principal_values(self, user_id):
+        return (
+            self.user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+            .values_list(*PRINCIPAL_FIELDS)
+            .first()
+        )
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # The password hash is needed for the check, it is not cached
+            return super().get_user(validated_token)
+
+        user_id = self._user_id(validated_token)
+        key = principal_cache_key(user_id)
+        values = cache.get(key)
+        if values is None:
+            values = self._principal_values(user_id)
+            if values is not None:
+                cache.set(key, values, settings.USER_PRINCIPAL_CACHE_TIMEOUT)
+
+        return self._principal(values)
+
+    async def aget_user(self, validated_token):
+        """get_user() for async views, through the async cache and ORM"""
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return await sync_to_async(super().get_user)(validated_token)
+
+        user_id = self._user_id(validated_token)
+        key = principal_cache_key(user_id)
+        values = await cache.aget(key)
+        if values is None:
+            values = await (
+                self.user_model.objects.filter(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+                .values_list(*PRINCIPAL_FIELDS)
+                .afirst()
+            )
+            if values is not None:
+                await cache.aset(key, values, settings.USER_PRINCIPAL_CACHE_TIMEOUT)
+
+        return self._principal(values)
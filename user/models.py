@@ -60,5 +60,7 @@ class User(AbstractUser):
     user_image = models.ImageField(
         _("user image"), upload_to=user_image_file_path, null=True, blank=True
     )
+    # Resized copies of user_image, see airport_app.images
+    user_image_variants = models.JSONField(default=dict, editable=False)
 
     objects = UserManager()
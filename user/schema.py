@@ -0,0 +1,8 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """OpenAPI bearer scheme of CachedJWTAuthentication, the same as the
+    one drf-spectacular provides for JWTAuthentication"""
+
+    target_class = "user.authentication.CachedJWTAuthentication"
@@ -1,11 +1,23 @@
 from django.contrib.auth import get_user_model, authenticate
 from rest_framework import serializers, generics
 
+from airport_app.serializers import ImageVariantsField
+
 
 class UserSerializer(serializers.ModelSerializer):
+    user_image_variants = ImageVariantsField()
+
     class Meta:
         model = get_user_model()
-        fields = ("id", "username", "email", "password", "is_staff", "user_image")
+        fields = (
+            "id",
+            "username",
+            "email",
+            "password",
+            "is_staff",
+            "user_image",
+            "user_image_variants",
+        )
         read_only_fields = ("id", "is_staff")
         extra_kwargs = {"password": {"write_only": True, "min_length": 5}}
 
@@ -49,6 +61,8 @@ class AuthTokenSerializer(serializers.Serializer):
 
 
 class UserImageSerializer(serializers.ModelSerializer):
+    user_image_variants = ImageVariantsField()
+
     class Meta:
         model = get_user_model()
-        fields = ("id", "user_image")
+        fields = ("id", "user_image", "user_image_variants")
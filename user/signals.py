@@ -0,0 +1,12 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from user.authentication import invalidate_principal
+
+
+@receiver([post_save, post_delete], sender=get_user_model())
+def invalidate_user_principal(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_principal(user_id))
@@ -1,3 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from drf_spectacular.generators import SchemaGenerator
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from user.authentication import CachedJWTAuthentication
+
+COUNTRY_URL = reverse("airport_app:country-list")
+AIRPLANE_TYPE_URL = reverse("airport_app:airplanetype-list")
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "pass1999199",
+        )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def user_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            query["sql"] for query in queries if "user_user" in query["sql"]
+        ]
+
+    def test_principal_is_cached(self):
+        self.assertEqual(len(self.user_queries(COUNTRY_URL)), 1)
+        self.assertEqual(self.user_queries(COUNTRY_URL), [])
+
+    def test_principal_is_invalidated_on_save(self):
+        self.client.get(COUNTRY_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        response = self.client.get(COUNTRY_URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_staff_flag_is_kept(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_staff = True
+            self.user.save()
+
+        response = self.client.post(
+            AIRPLANE_TYPE_URL, {"name": "Airbus"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_other_fields_are_loaded_on_access(self):
+        self.client.get(COUNTRY_URL)
+        user = CachedJWTAuthentication().get_user(AccessToken.for_user(self.user))
+
+        self.assertIn("email", user.get_deferred_fields())
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "test@test.com")
+
+    def test_schema_security(self):
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+
+        self.assertIn("jwtAuth", schema["components"]["securitySchemes"])
+        self.assertIn(
+            {"jwtAuth": []},
+            schema["paths"][COUNTRY_URL]["get"]["security"],
+        )
@@ -6,6 +6,7 @@ from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from airport_app.images import schedule_image_processing
 from user.serializers import UserSerializer, UserImageSerializer
 
 
@@ -40,7 +41,8 @@ class ManageUserView(
         serializer = self.get_serializer(item, data=request.data)
 
         if serializer.is_valid():
-            serializer.save()
+            serializer.save(user_image_variants={})
+            schedule_image_processing(item, "user_image")
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)